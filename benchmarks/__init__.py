@@ -0,0 +1,6 @@
+"""
+Benchmarks package for the currency bot.
+
+This package contains standalone benchmark scripts. They are run as modules
+from the project root, e.g. ``python -m benchmarks.bench_extraction``.
+"""
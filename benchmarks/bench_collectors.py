@@ -0,0 +1,345 @@
+"""
+Offline benchmark of the rate collectors.
+
+This script replays recorded collector sources (see benchmarks.record_fixtures)
+from a local HTTP server and measures, for each collector, the parse time and
+peak memory allocated while parsing, and the end-to-end collection time of
+collect_api_data and collect_exchange_data over plain HTTP and, unless
+--no-browser is given, in the headless browser loading the local page.
+
+Every replay is also checked to parse into a complete rate table, so a change
+that breaks parsing fails the run. With --baseline, the figures are compared
+with a file saved earlier by --save-baseline, and the run fails when any of
+them is worse by more than --threshold. Baselines depend on the machine, so
+they should be saved and compared on the same one.
+
+Usage:
+    python -m benchmarks.bench_collectors [--fixtures benchmarks/fixtures] [--synthetic]
+        [--repeat 20] [--no-browser] [--save-baseline FILE] [--baseline FILE]
+        [--threshold 0.25]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import tempfile
+import time
+import tracemalloc
+from aiohttp import web
+
+# Paths of the replayed sources on the local server
+API_PATH = "/v6/latest/USD"
+PAGE_PATH = "/services/currency-exchange"
+PAGE_NO_CHARSET_PATH = "/services/currency-exchange-no-charset"
+
+
+def build_synthetic_fixtures(seed=1):
+    """
+    Builds stand-ins for the recorded sources when no recording is available.
+
+    Args:
+        seed (int): Seed of the generated rates.
+
+    Returns:
+        tuple: (API payload JSON, page HTML).
+    """
+    from utils.currency_index import CURRENCY_NAMES
+
+    rng = random.Random(seed)
+    codes = sorted(set(CURRENCY_NAMES) | {"USD", "EUR", "AED"})
+    rates = {code: round(rng.uniform(0.1, 500), 6) for code in codes}
+    rates["USD"] = 1.0
+    payload = {
+        "result": "success",
+        "base_code": "USD",
+        "time_next_update_unix": 0,
+        "rates": rates,
+    }
+
+    rows = "".join(
+        f"<li><div class='currency_info'><div class='currency_name'>{code} - "
+        f"{CURRENCY_NAMES.get(code, code)}</div></div>"
+        f"<div class='fc_buy'>{rates['AED'] / rates[code] * 0.99:.4f}</div>"
+        f"<div class='fc_cell'>{rates['AED'] / rates[code] * 1.01:.4f}</div></li>"
+        for code in codes
+        if code != "AED"
+    )
+    page = (
+        "<html><head><title>Currency exchange</title></head><body>"
+        "<nav><ul><li><a href='/'>Home</a></li><li><a href='/x'>Rates</a></li></ul></nav>"
+        f"<ul><li>Currency</li>{rows}</ul></body></html>"
+    )
+    return json.dumps(payload), page
+
+
+def load_fixtures(directory, synthetic):
+    """
+    Loads the recorded sources.
+
+    Args:
+        directory (str): The fixtures directory, or None for the default one.
+        synthetic (bool): Whether to use generated sources instead.
+
+    Returns:
+        tuple: (API payload JSON, page HTML).
+    """
+    from benchmarks.record_fixtures import API_FIXTURE, FIXTURES_DIR, SCRAPPER_FIXTURE
+
+    if synthetic:
+        return build_synthetic_fixtures()
+    directory = directory or FIXTURES_DIR
+    contents = []
+    for name in (API_FIXTURE, SCRAPPER_FIXTURE):
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            raise SystemExit(
+                f"{path} not found: run python -m benchmarks.record_fixtures, "
+                "or pass --synthetic"
+            )
+        with open(path, encoding="utf-8") as fixture:
+            contents.append(fixture.read())
+    return tuple(contents)
+
+
+async def serve_fixtures(api_body, page, sock):
+    """
+    Serves the sources from a local HTTP server.
+
+    The API payload is served with its next update time cleared, so that
+    every collection goes through the network instead of the stored copy.
+    The page is also served without a charset in its Content-Type, the way
+    some servers send it.
+
+    Args:
+        api_body (str): The API payload JSON.
+        page (str): The page HTML.
+        sock (socket.socket): The bound socket to listen on.
+
+    Returns:
+        web.AppRunner: The running server; call cleanup() to stop it.
+    """
+    payload = json.loads(api_body)
+    payload["time_next_update_unix"] = 0
+    api_body = json.dumps(payload)
+
+    async def handle_api(request):
+        return web.Response(text=api_body, content_type="application/json")
+
+    async def handle_page(request):
+        return web.Response(text=page, content_type="text/html", charset="utf-8")
+
+    async def handle_page_no_charset(request):
+        return web.Response(
+            body=page.encode("utf-8"), headers={"Content-Type": "text/html"}
+        )
+
+    app = web.Application()
+    app.router.add_get(API_PATH, handle_api)
+    app.router.add_get(PAGE_PATH, handle_page)
+    app.router.add_get(PAGE_NO_CHARSET_PATH, handle_page_no_charset)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.SockSite(runner, sock).start()
+    return runner
+
+
+def measure_parse(function, argument, repeat):
+    """
+    Measures a parser: median duration and peak memory allocated in one call.
+
+    The allocations are traced in a separate call so that tracing does not
+    slow down the timed ones.
+
+    Args:
+        function (callable): The parser.
+        argument: The parser input.
+        repeat (int): Number of timed calls.
+
+    Returns:
+        tuple: (median milliseconds, peak KiB, result of the last call).
+    """
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(argument)
+        durations.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        function(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(durations), peak / 1024, result
+
+
+async def measure_collection(collect, repeat):
+    """
+    Measures the median end-to-end duration of a collector.
+
+    One untimed call runs first, so connection setup and browser launch are
+    not counted.
+
+    Args:
+        collect (callable): The collector coroutine function.
+        repeat (int): Number of timed calls.
+
+    Returns:
+        tuple: (median milliseconds, result of the last call).
+    """
+    result = await collect()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await collect()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), result
+
+
+def check_rates(name, count, expected):
+    """
+    Fails the run if a collector did not return the whole table.
+
+    Args:
+        name (str): The measured collector.
+        count (int): Number of currencies it returned, or None on failure.
+        expected (int): Number of currencies in the fixture.
+    """
+    if not count or count != expected:
+        raise SystemExit(f"{name}: expected {expected} currencies, got {count}")
+
+
+async def run(args, sock):
+    """
+    Runs every measurement.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+        sock (socket.socket): The bound socket the sources are served on.
+
+    Returns:
+        dict: Metric name -> value; durations in ms, allocations in KiB.
+    """
+    from collectors.api_collector import build_api_batch, collect_api_data
+    from collectors.browser_manager import browser_manager
+    from collectors.http_scrapper_collector import fetch_exchange_rates_http
+    from collectors.scrapper_collector import collect_exchange_data
+    from collectors.sharaf_parser import is_valid_rate_table, parse_exchange_html
+    from database.models import create_tables
+    from database.pool import db_pool
+    from utils.config import Config
+
+    api_body, page = load_fixtures(args.fixtures, args.synthetic)
+    runner = await serve_fixtures(api_body, page, sock)
+    results = {}
+
+    try:
+        await create_tables()
+
+        ms, kib, batch = measure_parse(
+            lambda body: build_api_batch(json.loads(body)), api_body, args.repeat
+        )
+        results["api_parse_ms"], results["api_parse_kib"] = ms, kib
+        api_count = len(batch)
+
+        ms, kib, rates = measure_parse(parse_exchange_html, page, args.repeat)
+        results["scrapper_parse_ms"], results["scrapper_parse_kib"] = ms, kib
+        if not is_valid_rate_table(rates):
+            raise SystemExit(f"The page parsed into {len(rates)} currencies")
+        page_count = len(rates)
+
+        # The fetch state is never stored, so every call downloads the rates
+        ms, collected = await measure_collection(collect_api_data, args.repeat)
+        results["api_collect_ms"] = ms
+        check_rates("collect_api_data", collected and len(collected[0]), api_count)
+
+        no_charset = await fetch_exchange_rates_http(
+            Config.SCRAPPER_URL.replace(PAGE_PATH, PAGE_NO_CHARSET_PATH)
+        )
+        check_rates(
+            "page without a charset", no_charset and len(no_charset), page_count
+        )
+
+        modes = ["http"] if args.no_browser else ["http", "browser"]
+        for mode in modes:
+            Config.SCRAPPER_MODE = mode
+            ms, rows = await measure_collection(collect_exchange_data, args.repeat)
+            results[f"scrapper_{mode}_collect_ms"] = ms
+            check_rates(
+                f"collect_exchange_data ({mode})", rows and len(rows), page_count
+            )
+    finally:
+        await browser_manager.close()
+        await db_pool.close()
+        await runner.cleanup()
+
+    print(f"API payload: {api_count} currencies, page: {page_count} currencies")
+    for name, value in results.items():
+        unit = "KiB" if name.endswith("_kib") else "ms"
+        print(f"{name:>28}: {value:10.2f} {unit}")
+    return results
+
+
+def compare_with_baseline(results, path, threshold):
+    """
+    Fails the run when a figure is worse than its baseline beyond the threshold.
+
+    Args:
+        results (dict): The measured figures.
+        path (str): The baseline file.
+        threshold (float): Allowed relative regression, e.g. 0.25 for 25%.
+    """
+    with open(path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = value / reference - 1
+        print(f"{name:>28}: {change:+8.1%} against the baseline")
+        if change > threshold:
+            regressions.append(f"{name} {value:.2f} vs {reference:.2f} ({change:+.1%})")
+
+    if regressions:
+        raise SystemExit("Regressions beyond the threshold: " + "; ".join(regressions))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", default=None)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-browser", action="store_true")
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--baseline", metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # The collectors read their URLs and the database path on import, so the
+    # local server's socket is bound and the environment set before any
+    # project module is imported; logs go to the console only
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(
+            {
+                "API_USD_URL": base_url + API_PATH,
+                "SCRAPPER_URL": base_url + PAGE_PATH,
+                "DB_PATH": os.path.join(directory, "bench.sqlite"),
+                "LOG_FILE": "",
+            }
+        )
+        results = asyncio.run(run(args, sock))
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Saved the baseline to {args.save_baseline}")
+    if args.baseline:
+        compare_with_baseline(results, args.baseline, args.threshold)
@@ -0,0 +1,135 @@
+"""
+Benchmark of the scraper's DOM extraction strategies.
+
+This script renders a synthetic Sharaf-like rate table in a headless browser
+and compares the legacy per-element extraction (several awaited protocol calls
+per row) with the single in-page evaluation used by the scraper.
+
+Usage:
+    python -m benchmarks.bench_extraction [--rows 60] [--repeat 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from playwright.async_api import async_playwright
+from collectors.sharaf_parser import EXTRACT_ROWS_JS, parse_exchange_rows
+
+
+def build_page(rows):
+    """
+    Builds a synthetic rate table page.
+
+    Args:
+        rows (int): Number of currency rows.
+
+    Returns:
+        str: The page HTML.
+    """
+    items = "".join(
+        f"<li><div class='currency_name'>C{index:02d} - Currency {index}</div>"
+        f"<div class='fc_buy'>{1 + index / 100:.4f}</div>"
+        f"<div class='fc_cell'>{1 + index / 90:.4f}</div></li>"
+        for index in range(rows)
+    )
+    return f"<html><body><ul><li>Header</li>{items}</ul></body></html>"
+
+
+async def extract_per_element(page):
+    """
+    Extracts the table the way the scraper did before: one call per element.
+
+    Args:
+        page: The Playwright page.
+
+    Returns:
+        list: (currency text, buy text, sell text) for every row.
+    """
+    rows = []
+    for element in await page.query_selector_all("ul > li"):
+        currency_div = await element.query_selector("div[class*='currency']")
+        buy_element = await element.query_selector("div[class*='fc_buy']")
+        sell_element = await element.query_selector("div[class*='fc_cell']")
+        rows.append(
+            (
+                await currency_div.text_content() if currency_div else None,
+                await buy_element.text_content() if buy_element else None,
+                await sell_element.text_content() if sell_element else None,
+            )
+        )
+    return rows
+
+
+async def extract_single_evaluation(page):
+    """
+    Extracts the table with a single in-page evaluation.
+
+    Args:
+        page: The Playwright page.
+
+    Returns:
+        list: (currency text, buy text, sell text) for every row.
+    """
+    return await page.eval_on_selector_all("ul > li", EXTRACT_ROWS_JS)
+
+
+async def measure(page, extract, repeat):
+    """
+    Measures an extraction strategy, including parsing.
+
+    Args:
+        page: The Playwright page.
+        extract (callable): The extraction coroutine function.
+        repeat (int): Number of measured runs.
+
+    Returns:
+        tuple: (list of durations in milliseconds, parsed rates).
+    """
+    durations = []
+    rates = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rates = parse_exchange_rows(await extract(page))
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations, rates
+
+
+async def main(rows, repeat):
+    """
+    Runs both strategies on the same page and prints their timings.
+
+    Args:
+        rows (int): Number of currency rows in the synthetic table.
+        repeat (int): Number of measured runs per strategy.
+    """
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            await page.set_content(build_page(rows))
+
+            results = {}
+            for name, extract in (
+                ("per-element", extract_per_element),
+                ("single evaluation", extract_single_evaluation),
+            ):
+                durations, rates = await measure(page, extract, repeat)
+                results[name] = rates
+                print(
+                    f"{name:>18}: median {statistics.median(durations):8.2f} ms, "
+                    f"min {min(durations):8.2f} ms, {len(rates)} currencies"
+                )
+
+            if results["per-element"] != results["single evaluation"]:
+                raise SystemExit("Extraction strategies returned different rates")
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
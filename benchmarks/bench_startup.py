@@ -0,0 +1,255 @@
+"""
+Benchmark of the bot's cold start.
+
+This script measures two figures in fresh interpreter processes:
+
+- the import time of main, as reported by python -X importtime, together with
+  the slowest modules it imports and a check that modules which should only
+  load on first use (Playwright, NumPy, the aiohttp server) were not imported;
+- the time from spawning the process until the first update is handled: the
+  child process imports main, runs the same start-up steps as main.start_bot
+  against an empty temporary database, and handles a /start update whose
+  replies go to a local stub of the Bot API (see benchmarks.load_test).
+
+The run fails when a median exceeds its budget: DEFAULT_MAX_IMPORT_MS and
+DEFAULT_MAX_FIRST_UPDATE_MS, or the values of --max-import-ms and
+--max-first-update-ms. A budget of 0 disables its check.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--top 10]
+        [--max-import-ms 500] [--max-first-update-ms 1500]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules that must not be imported by main; they load on first use
+DEFERRED_MODULES = ("playwright", "numpy", "aiohttp.web")
+
+# Start-up budgets in milliseconds; a development machine measures about
+# 270 ms and 340 ms, so these leave room for slower hosts
+DEFAULT_MAX_IMPORT_MS = 500
+DEFAULT_MAX_FIRST_UPDATE_MS = 1500
+
+# Fake credentials of the stub API
+STUB_TOKEN = "123456:STARTUP"
+
+# Directory the child processes run in, so that main is importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output):
+    """
+    Parses the output of python -X importtime.
+
+    Args:
+        output (str): The stderr of the process.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds) in import order.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_imports(env):
+    """
+    Imports main in a fresh interpreter and reports what it costs.
+
+    Args:
+        env (dict): The environment of the child process.
+
+    Returns:
+        tuple: (importtime entries, names of the deferred modules that were imported).
+    """
+    code = (
+        "import sys, main; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return parse_importtime(result.stderr), loaded
+
+
+def measure_first_update(env):
+    """
+    Starts a child process and waits until it has handled its first update.
+
+    Args:
+        env (dict): The environment of the child process.
+
+    Returns:
+        dict: Milliseconds from spawn to the first handled update ("total") and
+        the child's own breakdown ("import", "init", "update").
+    """
+    spawned = time.time()
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        env=env,
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    # The stub API is part of the harness, not of the bot's start-up
+    report["total"] = (report.pop("handled_at") - spawned) * 1000 - report.pop("stub")
+    return report
+
+
+async def handle_first_update():
+    """
+    Runs in the child: starts the bot like main.start_bot and handles one update.
+
+    Prints a JSON line with the wall clock time the update was handled and
+    the durations of each step in milliseconds.
+    """
+    started = time.perf_counter()
+    import main  # noqa: F401  (the entry point imports every handler)
+
+    imported = time.perf_counter()
+
+    # The stub server is not part of the measured start-up
+    from telebot import asyncio_helper, types
+    from benchmarks.load_test import StubBotApi, build_update
+
+    stub = StubBotApi(latency=0)
+    runner, port = await stub.start()
+    asyncio_helper.API_URL = f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+    stub_ready = time.perf_counter()
+
+    from bot.handlers.commands import bot
+    from bot.sender import sender
+    from database.cache import rates_cache
+    from database.models import create_tables
+    from database.pool import db_pool
+    from jobs.alerts import alert_engine
+
+    await create_tables()
+    await rates_cache.reload()
+    await alert_engine.load()
+    initialized = time.perf_counter()
+
+    update = types.Update.de_json(build_update(1, 1, "start", [], None))
+    await bot.process_new_updates([update])
+    handled = time.perf_counter()
+    handled_at = time.time()
+
+    await sender.close()
+    await db_pool.close()
+    await asyncio_helper.session_manager.session.close()
+    await runner.cleanup()
+
+    print(
+        json.dumps(
+            {
+                "handled_at": handled_at,
+                "stub": (stub_ready - imported) * 1000,
+                "import": (imported - started) * 1000,
+                "init": (initialized - stub_ready) * 1000,
+                "update": (handled - initialized) * 1000,
+            }
+        )
+    )
+
+
+def main(args):
+    """
+    Runs both measurements and prints the medians.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            TELEGRAM_TOKEN_TEST=STUB_TOKEN,
+            DB_PATH=os.path.join(directory, "startup.sqlite"),
+            METRICS_PORT="0",
+            SCHEDULER_ENABLED="false",
+            LOG_FILE="",
+        )
+
+        import_totals = []
+        self_times = {}
+        for _ in range(args.repeat):
+            entries, loaded = measure_imports(env)
+            if loaded:
+                raise SystemExit(f"main imports modules meant to load lazily: {loaded}")
+            import_totals.append(
+                next(total for name, _, total in entries if name == "main") / 1000
+            )
+            for name, self_us, _ in entries:
+                self_times.setdefault(name, []).append(self_us / 1000)
+
+        first_updates = []
+        for _ in range(args.repeat):
+            # Every run starts from an empty database, like a fresh container
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(env["DB_PATH"] + suffix):
+                    os.remove(env["DB_PATH"] + suffix)
+            first_updates.append(measure_first_update(env))
+
+    import_ms = statistics.median(import_totals)
+    print(
+        f"import main:   median {import_ms:8.1f} ms, min {min(import_totals):8.1f} ms"
+    )
+    print("slowest modules (median self time):")
+    slowest = sorted(
+        self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for name, times in slowest[: args.top]:
+        print(f"{statistics.median(times):10.1f} ms  {name}")
+
+    first_update_ms = statistics.median(report["total"] for report in first_updates)
+    breakdown = ", ".join(
+        f"{step} {statistics.median(report[step] for report in first_updates):.1f} ms"
+        for step in ("import", "init", "update")
+    )
+    print(f"first update:  median {first_update_ms:8.1f} ms from spawn ({breakdown})")
+
+    failures = []
+    if args.max_import_ms and import_ms > args.max_import_ms:
+        failures.append(f"import {import_ms:.1f} ms > {args.max_import_ms:g} ms")
+    if args.max_first_update_ms and first_update_ms > args.max_first_update_ms:
+        failures.append(
+            f"first update {first_update_ms:.1f} ms > {args.max_first_update_ms:g} ms"
+        )
+    if failures:
+        raise SystemExit("Start-up over budget: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=DEFAULT_MAX_IMPORT_MS)
+    parser.add_argument(
+        "--max-first-update-ms", type=float, default=DEFAULT_MAX_FIRST_UPDATE_MS
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(handle_first_update())
+    else:
+        main(args)
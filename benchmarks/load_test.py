@@ -0,0 +1,395 @@
+"""
+Offline load test of the bot's message handling.
+
+This script starts a local stub of the Telegram Bot API (aiohttp), points
+AsyncTeleBot at it, seeds a temporary SQLite database and feeds the
+dispatcher a synthetic stream of updates: /check, /check_rates,
+/check_exchange, keyboard button presses and /start, mixed by weight and
+injected at a fixed rate. Every update is timed from injection until its
+handler has finished, including the reply sent to the stub API, and the
+event loop lag is sampled throughout.
+
+Nothing leaves the machine, so the script can run in CI to catch latency
+regressions in the handlers and the database layer.
+
+Usage:
+    python -m benchmarks.load_test [--rate 200] [--duration 10] [--chats 1000]
+        [--api-latency-ms 20] [--mix check=35,check_rates=20,...] [--max-p99-ms 250]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from aiohttp import web
+
+# Fake credentials of the stub API
+STUB_TOKEN = "123456:LOAD-TEST"
+
+# Default weights of the synthetic update kinds
+DEFAULT_MIX = {
+    "check": 35,
+    "check_rates": 20,
+    "check_exchange": 15,
+    "button": 20,
+    "start": 10,
+}
+
+# Currencies seeded into the database: (code, units per USD)
+SEED_CURRENCIES = {
+    "USD": 1.0,
+    "AED": 3.6725,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "RUB": 92.5,
+    "THB": 36.1,
+    "INR": 83.2,
+    "CNY": 7.24,
+    "JPY": 151.3,
+    "TRY": 32.2,
+    "KZT": 447.0,
+    "GEL": 2.68,
+    "AMD": 388.0,
+    "CHF": 0.9,
+    "CAD": 1.36,
+    "AUD": 1.52,
+    "SAR": 3.75,
+    "EGP": 47.4,
+    "PKR": 278.0,
+    "PHP": 56.2,
+    "IDR": 15800.0,
+}
+
+# Interval of the event loop lag probe, in seconds
+LAG_PROBE_INTERVAL = 0.01
+
+
+def parse_mix(text):
+    """
+    Parses update kind weights, e.g. "check=35,start=10".
+
+    Args:
+        text (str): Comma-separated kind=weight pairs.
+
+    Returns:
+        dict: Update kind -> weight.
+    """
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown update kind: {kind}")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def percentile(values, percent):
+    """
+    Returns a percentile of a list of values.
+
+    Args:
+        values (list): The values.
+        percent (int): The percentile, 1-99.
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list.
+    """
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class StubBotApi:
+    """
+    Local stand-in for the Telegram Bot API that answers every method.
+    """
+
+    def __init__(self, latency):
+        """
+        Args:
+            latency (float): Seconds each API call takes.
+        """
+        self.latency = latency
+        self.calls = Counter()
+        self._message_id = 0
+
+    async def handle(self, request):
+        """
+        Answers a Bot API call with a minimal successful result.
+
+        Args:
+            request (web.Request): The API request.
+
+        Returns:
+            web.Response: A JSON response in the Bot API format.
+        """
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params = await request.post()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method in ("sendMessage", "editMessageText"):
+            self._message_id += 1
+            chat_id = int(params.get("chat_id", 0))
+            result = {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": params.get("text", ""),
+            }
+        elif method == "getMe":
+            result = {"id": 123456, "is_bot": True, "first_name": "LoadTest"}
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self):
+        """
+        Starts the stub server on a free local port.
+
+        Returns:
+            tuple: (web.AppRunner, port).
+        """
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, port
+
+
+def build_update(update_id, chat_id, kind, button_labels, rng):
+    """
+    Builds a synthetic text message update.
+
+    Args:
+        update_id (int): The update id.
+        chat_id (int): The sending chat.
+        kind (str): The update kind from DEFAULT_MIX.
+        button_labels (list): Keyboard labels used for button presses.
+        rng (random.Random): The random generator.
+
+    Returns:
+        dict: The update in the Bot API JSON format.
+    """
+    codes = list(SEED_CURRENCIES)
+    if kind == "check":
+        text = "/check " + " ".join(rng.sample(codes, rng.choice((1, 1, 1, 2, 3))))
+    elif kind == "button":
+        text = rng.choice(button_labels)
+    else:
+        text = f"/{kind}"
+
+    message = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": f"User{chat_id}"},
+        "text": text,
+    }
+    if text.startswith("/"):
+        command_length = len(text.split(maxsplit=1)[0])
+        message["entities"] = [
+            {"type": "bot_command", "offset": 0, "length": command_length}
+        ]
+    return {"update_id": update_id, "message": message}
+
+
+async def seed_database():
+    """
+    Creates the tables and fills them with deterministic rates.
+    """
+    from database.cache import rates_cache
+    from database.db_utils import update_api_rates, update_scrapper_rates
+    from database.models import create_tables
+
+    now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    aed = SEED_CURRENCIES["AED"]
+    eur = SEED_CURRENCIES["EUR"]
+    await create_tables()
+    await update_api_rates(
+        [(code, rate, rate / eur, now) for code, rate in SEED_CURRENCIES.items()]
+    )
+    await update_scrapper_rates(
+        [
+            (code, aed / rate * 0.99, aed / rate * 1.01, now)
+            for code, rate in SEED_CURRENCIES.items()
+            if code != "AED"
+        ]
+    )
+    await rates_cache.reload()
+
+
+async def probe_loop_lag(lags, stop):
+    """
+    Samples how late the event loop wakes up a sleeping task.
+
+    Args:
+        lags (list): Receives the lag samples in seconds.
+        stop (asyncio.Event): Set to end the probe.
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - started - LAG_PROBE_INTERVAL))
+
+
+async def run_load(args):
+    """
+    Runs the load test and prints its report.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        dict: The measured figures.
+    """
+    stub = StubBotApi(args.api_latency_ms / 1000)
+    runner, port = await stub.start()
+
+    # The bot modules read their configuration on import, so they are
+    # imported only once the environment points at the stub and the temp database
+    from telebot import asyncio_helper, types
+    from bot.config import BUTTON_LABELS
+    from bot.handlers.commands import bot
+    from bot.sender import sender
+    from database.pool import db_pool
+
+    asyncio_helper.API_URL = f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+    await seed_database()
+
+    rng = random.Random(args.seed)
+    mix = args.mix or DEFAULT_MIX
+    kinds, weights = list(mix), list(mix.values())
+    button_labels = [
+        label
+        for key in ("api_rates", "scrapper_rates", "help")
+        for label in BUTTON_LABELS[key]
+    ]
+
+    latencies = []
+    errors = 0
+    lags = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(probe_loop_lag(lags, stop))
+    pending = set()
+
+    async def handle(update):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            await bot.process_new_updates([update])
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            errors += 1
+
+    total = int(args.rate * args.duration)
+    interval = 1 / args.rate
+    started = time.perf_counter()
+    for update_id in range(1, total + 1):
+        # Keep to the schedule rather than sleeping a fixed interval, so slow
+        # handling shows up as latency instead of a lower injection rate
+        delay = started + update_id * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind = rng.choices(kinds, weights)[0]
+        chat_id = rng.randrange(1, args.chats + 1)
+        update = types.Update.de_json(
+            build_update(update_id, chat_id, kind, button_labels, rng)
+        )
+        task = asyncio.create_task(handle(update))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await lag_task
+
+    await sender.close()
+    await db_pool.close()
+    await asyncio_helper.session_manager.session.close()
+    await runner.cleanup()
+
+    report = {
+        "updates": total,
+        "completed": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=0.0),
+        "lag_p50": percentile(lags, 50),
+        "lag_p99": percentile(lags, 99),
+        "lag_max": max(lags, default=0.0),
+        "api_calls": dict(stub.calls),
+    }
+
+    print(f"updates:     {report['updates']} injected at {args.rate:g}/s")
+    print(f"completed:   {report['completed']} ({report['errors']} errors)")
+    print(f"throughput:  {report['throughput']:.1f} updates/s")
+    print(
+        f"latency:     p50 {report['p50'] * 1000:.1f} ms, p95 {report['p95'] * 1000:.1f} ms, "
+        f"p99 {report['p99'] * 1000:.1f} ms, max {report['max'] * 1000:.1f} ms"
+    )
+    print(
+        f"loop lag:    p50 {report['lag_p50'] * 1000:.2f} ms, "
+        f"p99 {report['lag_p99'] * 1000:.2f} ms, max {report['lag_max'] * 1000:.2f} ms"
+    )
+    print(f"API calls:   {report['api_calls']}")
+    return report
+
+
+def main():
+    """
+    Parses the arguments, prepares an isolated environment and runs the test.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rate", type=float, default=200, help="updates per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--chats", type=int, default=1000, help="distinct chats")
+    parser.add_argument("--api-latency-ms", type=float, default=20)
+    parser.add_argument("--mix", type=parse_mix, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--send-rate",
+        type=float,
+        default=1000,
+        help="global send rate limit; Telegram's real limit is 30/s",
+    )
+    parser.add_argument(
+        "--max-p99-ms", type=float, default=None, help="fail if p99 exceeds this"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(
+            {
+                "TELEGRAM_TOKEN_TEST": STUB_TOKEN,
+                "DB_PATH": os.path.join(directory, "load_test.sqlite"),
+                "SEND_GLOBAL_RATE": str(args.send_rate),
+                "METRICS_PORT": "0",
+                "SCHEDULER_ENABLED": "false",
+                "LOG_FILE": "",
+            }
+        )
+        report = asyncio.run(run_load(args))
+
+    if args.max_p99_ms is not None and report["p99"] * 1000 > args.max_p99_ms:
+        raise SystemExit(
+            f"p99 latency {report['p99'] * 1000:.1f} ms exceeds {args.max_p99_ms:g} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Records the collector sources as fixtures for offline benchmarks.
+
+This script saves the open.er-api USD payload and the Sharaf Exchange rate
+page, so that benchmarks.bench_collectors can replay them without network
+access. The page is downloaded over plain HTTP like the scraper's fast path;
+with --browser it is saved as rendered by the headless browser instead, for
+when the table is built by scripts. Both recordings are parsed before they are
+saved, so a page without a usable rate table is not recorded.
+
+Usage:
+    python -m benchmarks.record_fixtures [--output benchmarks/fixtures] [--browser]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import aiohttp
+from collectors.sharaf_parser import is_valid_rate_table, parse_exchange_html
+from utils.config import Config
+
+# Default directory of the recorded fixtures
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# File names of the recordings inside the fixtures directory
+API_FIXTURE = "er_api_usd.json"
+SCRAPPER_FIXTURE = "sharaf_exchange.html"
+
+
+async def record_api(session, url):
+    """
+    Downloads the USD-based API payload.
+
+    Args:
+        session (aiohttp.ClientSession): The HTTP session.
+        url (str): The API endpoint URL.
+
+    Returns:
+        str: The response body.
+    """
+    async with session.get(url) as response:
+        response.raise_for_status()
+        body = await response.text()
+    rates = json.loads(body).get("rates") or {}
+    if "EUR" not in rates:
+        raise SystemExit(f"{url} returned no EUR rate, not recorded")
+    print(f"{url}: {len(body)} bytes, {len(rates)} rates")
+    return body
+
+
+async def record_page_http(session, url):
+    """
+    Downloads the exchange rate page over plain HTTP.
+
+    Args:
+        session (aiohttp.ClientSession): The HTTP session.
+        url (str): The page URL.
+
+    Returns:
+        str: The page HTML.
+    """
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.text(errors="replace")
+
+
+async def record_page_browser(url):
+    """
+    Renders the exchange rate page in a headless browser.
+
+    Args:
+        url (str): The page URL.
+
+    Returns:
+        str: The HTML of the rendered page.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page(user_agent=Config.SCRAPPER_USER_AGENT)
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector('ul:has(> li:has(div[class*="fc_buy"]))')
+            return await page.content()
+        finally:
+            await browser.close()
+
+
+async def main(output, browser):
+    """
+    Records both fixtures into a directory.
+
+    Args:
+        output (str): The fixtures directory.
+        browser (bool): Whether to record the page as rendered by the browser.
+    """
+    headers = {"User-Agent": Config.SCRAPPER_USER_AGENT}
+    timeout = aiohttp.ClientTimeout(total=Config.SCRAPPER_HTTP_TIMEOUT)
+    async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+        api_body = await record_api(session, Config.API_USD_URL)
+        if browser:
+            page = await record_page_browser(Config.SCRAPPER_URL)
+        else:
+            page = await record_page_http(session, Config.SCRAPPER_URL)
+
+    rates = parse_exchange_html(page)
+    print(f"{Config.SCRAPPER_URL}: {len(page)} characters, {len(rates)} currencies")
+    if not is_valid_rate_table(rates):
+        hint = "" if browser else "; try --browser"
+        raise SystemExit(f"The page has no complete rate table, not recorded{hint}")
+
+    os.makedirs(output, exist_ok=True)
+    for name, content in ((API_FIXTURE, api_body), (SCRAPPER_FIXTURE, page)):
+        path = os.path.join(output, name)
+        with open(path, "w", encoding="utf-8") as fixture:
+            fixture.write(content)
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default=FIXTURES_DIR)
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.output, args.browser))
@@ -3,11 +3,30 @@ Telegram Currency Bot package.
 
 This package contains the main components of the Telegram bot including
 configuration, command handlers and asynchronous functions.
+
+The bot instance and the keyboard helpers are imported from bot.config on
+first access, so importing a submodule such as bot.router does not create
+the bot or require a token. The package logger is likewise created on first
+access.
 """
 
-from utils.logger import get_logger
-from .config import bot, create_markup
+import importlib
+
+# Names re-exported from bot.config
+_CONFIG_EXPORTS = ("bot", "create_markup", "BUTTON_LABELS")
+
+__all__ = ["bot", "create_markup", "BUTTON_LABELS"]
+
 
-logger = get_logger(__name__)
+def __getattr__(name):
+    if name == "logger":
+        # Kept for code importing the package logger; created on first access
+        from utils.logger import get_logger
 
-__all__ = ["bot", "create_markup"]
+        value = get_logger(__name__)
+    elif name in _CONFIG_EXPORTS:
+        value = getattr(importlib.import_module(".config", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -5,6 +5,7 @@ This module sets up the bot instance and provides utility functions like creatin
 
 Attributes:
     bot (AsyncTeleBot): The bot instance initialized with the Telegram token.
+    BUTTON_LABELS (dict): Keyboard button labels per action in every supported language.
 
 Functions:
     create_markup: Creates a keyboard markup for the bot's interface.
@@ -32,6 +33,16 @@ except Exception as e:
     raise
 
 
+# Keyboard button labels per action: the label shown on the keyboard first,
+# followed by the labels accepted in the other supported languages
+BUTTON_LABELS = {
+    "api_rates": ("Check official currency rates", "Проверить оф. курсы валют"),
+    "scrapper_rates": ("Check exchange rates", "Проверить курс обменника"),
+    "update_rates": ("Update currency rates", "Обновить курсы валют"),
+    "help": ("Help", "Помощь"),
+}
+
+
 def create_markup():
     """
     Creates a keyboard markup for the bot's interface.
@@ -42,10 +53,11 @@ def create_markup():
     # Create a keyboard markup with buttons for various bot commands
     markup = types.ReplyKeyboardMarkup(resize_keyboard=True)
     markup.add(
-        types.KeyboardButton("Check official currency rates"),
-        types.KeyboardButton("Check exchange rates"),
+        types.KeyboardButton(BUTTON_LABELS["api_rates"][0]),
+        types.KeyboardButton(BUTTON_LABELS["scrapper_rates"][0]),
     )
     markup.add(
-        types.KeyboardButton("Update currency rates"), types.KeyboardButton("Help")
+        types.KeyboardButton(BUTTON_LABELS["update_rates"][0]),
+        types.KeyboardButton(BUTTON_LABELS["help"][0]),
     )
     return markup
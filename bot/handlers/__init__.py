@@ -4,7 +4,6 @@ Telegram bot handlers module.
 This package contains command handlers and async functions for the Telegram bot.
 """
 
-from utils.logger import get_logger
 from .commands import *
 from .async_functions import (
     send_welcome,
@@ -13,6 +12,12 @@ from .async_functions import (
     update_rates,
     send_help,
     check_currency,
+    get_rate_history,
+    convert_currency,
+    answer_inline_query,
+    set_alert,
+    list_alerts,
+    remove_alert,
+    subscribe,
+    unsubscribe,
 )
-
-logger = get_logger(__name__)
@@ -7,21 +7,64 @@ Functions:
     send_welcome: Sends a welcome message to the user.
     get_api_rates: Fetches and sends official currency rates.
     get_scrapper_rates: Fetches and sends exchange rates from scrappers.
-    update_rates: Updates currency rates and notifies the user.
+    update_rates: Starts a background rate refresh and reports its progress.
     send_help: Sends a help message with available commands.
-    check_currency: Checks and sends currency conversion rates.
+    check_currency: Checks and sends currency conversion rates for one or more currencies.
+    get_rate_history: Sends min/avg/max rates of a currency over a period.
+    convert_currency: Converts an amount between two currencies.
+    answer_inline_query: Answers an inline query with matching currencies.
+    set_alert: Creates a rate threshold alert.
+    list_alerts: Sends the alerts of the chat.
+    remove_alert: Deletes an alert of the chat.
+    subscribe: Subscribes the chat to the daily digest.
+    unsubscribe: Unsubscribes the chat from the daily digest.
+
+Unexpected errors are left to the router's error middleware, which replies
+with the message set by error_reply where a handler has one. Replies go
+through the rate-limited sender. Rendered responses are cached
+per rates snapshot version and re-rendered eagerly whenever a new snapshot is
+loaded.
 """
 
+import asyncio
+import math
+import re
+from telebot import types
+from telebot.asyncio_helper import ApiTelegramException
 from ..config import bot
-from .. import logger
-from database.db_utils import fetch_api_rates, fetch_scrapper_rates
-from jobs.daily_job import daily_job
+from ..middleware import error_reply
+from ..sender import sender
+from database.cache import rates_cache
+from database.db_utils import (
+    fetch_api_rates,
+    fetch_cross_rates,
+    fetch_currency_rates_many,
+    fetch_scrapper_rates_many,
+)
+from database.alerts import fetch_chat_alerts
+from database.history import fetch_history_summary
+from database.subscriptions import add_subscriber, delete_subscribers
+from jobs.alerts import DIRECTION_ABOVE, DIRECTION_BELOW, alert_engine
+from jobs.refresh import refresh_coordinator
+from utils.response_cache import response_cache
 from utils.formatters import (
     format_api_currency_response,
     format_scrapper_currency_response,
     format_help_message,
-    format_check_currency_response,
+    format_check_currencies_response,
+    format_history_response,
+    format_refresh_status,
+    format_convert_response,
+    format_inline_result,
+    format_alert_created,
+    format_alerts_list,
 )
+from utils.config import Config
+from utils.currency_index import CURRENCY_NAMES
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
 
 # Placeholder for keyboard markup, if needed
 markup = None
@@ -38,6 +81,70 @@ ERROR_UPDATE_DAILY_RATES = (
 )
 ERROR_INVALID_CURRENCY = "❌ Неверный код валюты. Валюта отсутствует в базе данных."
 
+ERROR_HISTORY_USAGE = (
+    "❌ Пожалуйста, укажите код валюты и период. Пример: /history RUB 30d\n"
+    "Период: d - дни, w - недели, m - месяцы, y - годы."
+)
+ERROR_CONVERT_USAGE = (
+    "❌ Пожалуйста, укажите сумму и коды валют. Пример: /convert 250 RUB THB"
+)
+ERROR_NO_HISTORY = "❌ Нет истории курсов для этой валюты за указанный период."
+ERROR_ALERT_USAGE = (
+    "❌ Пожалуйста, укажите валюту, курс, условие и значение. Пример: /alert USD sell < 3.66\n"
+    "Курс: buy/sell - покупка/продажа в обменнике, usd/eur - оф. курс к USD/EUR."
+)
+ERROR_ALERT_LIMIT = (
+    "❌ Достигнуто максимальное количество уведомлений. Удалите лишние: /alerts"
+)
+ERROR_ALERT_FAILED = (
+    "❌ Не удалось сохранить уведомление. Пожалуйста, попробуйте позже."
+)
+ERROR_UNALERT_USAGE = "❌ Пожалуйста, укажите номер уведомления. Пример: /unalert 12"
+ERROR_ALERT_NOT_FOUND = "❌ Уведомление не найдено."
+
+# The help text does not depend on the rates, so it is rendered once
+HELP_MESSAGE = format_help_message()
+
+# Background refresh trackers, referenced until they finish
+_refresh_tasks = set()
+
+# Maximum number of currency codes accepted by a single /check command
+MAX_CHECK_CURRENCIES = 10
+
+# Period format for the /history command and the length of each unit in days
+HISTORY_PERIOD_PATTERN = re.compile(r"^(\d+)([dwmy]?)$")
+HISTORY_UNIT_DAYS = {"": 1, "d": 1, "w": 7, "m": 30, "y": 365}
+DEFAULT_HISTORY_PERIOD = "30d"
+
+# Currencies whose /check responses are rendered as soon as new rates arrive
+WARM_CHECK_CURRENCIES = ["USD", "EUR", "RUB", "THB", "GBP"]
+
+# Rate names accepted by /alert and the rate columns they watch
+ALERT_METRICS = {
+    "buy": "buy_aed",
+    "покупка": "buy_aed",
+    "sell": "sell_aed",
+    "продажа": "sell_aed",
+    "usd": "usd_to_currency",
+    "eur": "euro_to_currency",
+}
+
+# Conditions accepted by /alert
+ALERT_DIRECTIONS = {
+    "<": DIRECTION_BELOW,
+    "below": DIRECTION_BELOW,
+    "ниже": DIRECTION_BELOW,
+    ">": DIRECTION_ABOVE,
+    "above": DIRECTION_ABOVE,
+    "выше": DIRECTION_ABOVE,
+}
+
+# Maximum number of results returned for one inline query
+MAX_INLINE_RESULTS = 10
+
+# Seconds Telegram may cache an inline query answer on its side
+INLINE_CACHE_TIME = 60
+
 
 async def send_welcome(message):
     """
@@ -46,16 +153,20 @@ async def send_welcome(message):
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
+    logger.info("Executing function: %s", message.text)
     user_name = message.from_user.first_name
-    await bot.send_message(
-        message.chat.id,
-        f"Привет, {user_name}!",
-        reply_markup=markup,
+    # Both messages are queued together so the sender can merge them into one
+    await asyncio.gather(
+        sender.send_message(
+            message.chat.id,
+            f"Привет, {user_name}!",
+            reply_markup=markup,
+        ),
+        sender.send_message(message.chat.id, HELP_MESSAGE),
     )
-    await bot.send_message(chat_id=message.chat.id, text=format_help_message())
 
 
+@error_reply(ERROR_FETCHING_RATES)
 async def get_api_rates(message):
     """
     Fetches and sends official currency rates to the user.
@@ -63,18 +174,17 @@ async def get_api_rates(message):
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
-    try:
-        rates = await fetch_api_rates("AED")
-        response = (
-            format_api_currency_response(rates) if rates else ERROR_FETCHING_RATES
-        )
-        if not rates:
+    logger.info("Executing function: %s", message.text)
+    version = await _snapshot_version()
+    response = response_cache.get("check_rates", "AED", version)
+    if response is None:
+        response = _render_api_rates(await fetch_api_rates("AED"))
+        if response:
+            response_cache.put("check_rates", "AED", version, response)
+        else:
             logger.warning("Failed to fetch API rates")
-        await bot.send_message(chat_id=message.chat.id, text=response)
-    except Exception as e:
-        logger.error(f"Error in get_api_rates: {e}", exc_info=True)
-        await bot.send_message(chat_id=message.chat.id, text=ERROR_FETCHING_RATES)
+            response = ERROR_FETCHING_RATES
+    await sender.send_message(message.chat.id, response)
 
 
 async def get_scrapper_rates(message):
@@ -84,43 +194,100 @@ async def get_scrapper_rates(message):
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
-    usd_rate = await fetch_scrapper_rates("USD")
-    eur_rate = await fetch_scrapper_rates("EUR")
-
-    if not usd_rate or not eur_rate:
-        logger.warning("Failed to fetch scrapper rates")
-
-    usd_rate_tuple = (usd_rate[0], usd_rate[1], usd_rate[2]) if usd_rate else None
-    eur_rate_tuple = (eur_rate[0], eur_rate[1], eur_rate[2]) if eur_rate else None
-
-    response = (
-        format_scrapper_currency_response(usd_rate_tuple, eur_rate_tuple)
-        if usd_rate and eur_rate
-        else ERROR_FETCHING_SCRAPPER_RATES
-    )
-    await bot.send_message(chat_id=message.chat.id, text=response)
+    logger.info("Executing function: %s", message.text)
+    version = await _snapshot_version()
+    response = response_cache.get("check_exchange", None, version)
+    if response is None:
+        response = _render_scrapper_rates(
+            await fetch_scrapper_rates_many(["USD", "EUR"])
+        )
+        if response:
+            response_cache.put("check_exchange", None, version, response)
+        else:
+            logger.warning("Failed to fetch scrapper rates")
+            response = ERROR_FETCHING_SCRAPPER_RATES
+    await sender.send_message(message.chat.id, response)
 
 
 async def update_rates(message):
     """
-    Updates currency rates and notifies the user.
+    Starts a background rate refresh and reports its progress.
+
+    The reply is sent at once and then edited in place as the refresh stages
+    finish. Concurrent requests share the refresh that is already running.
 
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
-    await bot.send_message(
+    logger.info("Executing function: %s", message.text)
+
+    # A refresh that has just completed is reused without touching the network
+    fresh = (
+        None if refresh_coordinator.in_progress else refresh_coordinator.fresh_result()
+    )
+    if fresh is not None:
+        result, age = fresh
+        await sender.send_message(
+            message.chat.id,
+            format_refresh_status(result, finished=True, age=age),
+            reply_markup=markup,
+        )
+        return
+
+    # The status message is edited later, so it must not be merged with others
+    status_message = await sender.send_message(
         message.chat.id,
-        "⏳ Обновляю данные, подождите минуточку...",
+        format_refresh_status({}, finished=False),
+        coalesce=False,
         reply_markup=markup,
     )
-    await daily_job()
-    response = "✅ Данные успешно обновлены!"
-    logger.info("Daily rates updated successfully")
+    task = asyncio.create_task(
+        _track_refresh(status_message.chat.id, status_message.message_id)
+    )
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _track_refresh(chat_id, message_id):
+    """
+    Waits for the shared refresh and edits the status message as it progresses.
 
-    await bot.send_message(chat_id=message.chat.id, text=response)
-    return response
+    Args:
+        chat_id (int): The chat of the status message.
+        message_id (int): The status message to edit.
+    """
+    stages = {}
+
+    async def on_progress(stage, success):
+        stages[stage] = success
+        await _edit_status(
+            chat_id, message_id, format_refresh_status(stages, finished=False)
+        )
+
+    try:
+        result = await refresh_coordinator.refresh(on_progress)
+        text = format_refresh_status(result, finished=True)
+        logger.info("Daily rates refresh finished: %s", result)
+    except Exception as e:
+        logger.error(f"Error in update_rates: {e}", exc_info=True)
+        text = ERROR_UPDATE_DAILY_RATES
+
+    await _edit_status(chat_id, message_id, text)
+
+
+async def _edit_status(chat_id, message_id, text):
+    """
+    Edits a status message, ignoring edits that Telegram rejects.
+
+    Args:
+        chat_id (int): The chat of the status message.
+        message_id (int): The status message to edit.
+        text (str): The new message text.
+    """
+    try:
+        await sender.edit_message_text(text, chat_id=chat_id, message_id=message_id)
+    except ApiTelegramException as e:
+        logger.debug("Could not edit status message %s: %s", message_id, e)
 
 
 async def send_help(message):
@@ -130,54 +297,363 @@ async def send_help(message):
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
-    await bot.send_message(chat_id=message.chat.id, text=format_help_message())
+    logger.info("Executing function: %s", message.text)
+    await sender.send_message(message.chat.id, HELP_MESSAGE)
 
 
 async def check_currency(message):
     """
-    Checks and sends currency conversion rates to the user.
+    Checks and sends currency conversion rates for one or more currencies.
+
+    All requested codes (e.g. "/check RUB USD THB") are looked up in a single round trip.
 
     Args:
         message: The message object from the user.
     """
-    logger.info(f"Executing function: {message.text}")
+    logger.info("Executing function: %s", message.text)
 
-    # Extract currency code or prompt user if not provided
+    # Extract currency codes or prompt user if none were provided
+    currency_codes = list(
+        dict.fromkeys(
+            code.upper() for code in message.text.replace(",", " ").split()[1:]
+        )
+    )
+    if not currency_codes:
+        await sender.send_message(
+            message.chat.id,
+            "❌ Пожалуйста, укажите код валюты после команды. Пример: /check USD",
+        )
+        return
+    currency_codes = currency_codes[:MAX_CHECK_CURRENCIES]
+
+    # Unknown codes are answered from the in-memory index without any lookup
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None and not any(
+        code in snapshot.currency_index for code in currency_codes
+    ):
+        logger.warning("Currencies not found in any database: %s", currency_codes)
+        await sender.send_message(message.chat.id, ERROR_INVALID_CURRENCY)
+        return
+
+    cache_key = " ".join(currency_codes)
+    version = snapshot.version if snapshot is not None else None
+    response = response_cache.get("check", cache_key, version)
+    if response is None:
+        # Fetch rates from API and scrapper for all codes at once
+        response = _render_check(await fetch_currency_rates_many(currency_codes))
+
+        # Handle cases where no currency is found in either source
+        if not response:
+            logger.warning("Currencies not found in any database: %s", currency_codes)
+            await sender.send_message(message.chat.id, ERROR_INVALID_CURRENCY)
+            return
+        response_cache.put("check", cache_key, version, response)
+
+    await sender.send_message(message.chat.id, response)
+
+
+async def get_rate_history(message):
+    """
+    Sends min/avg/max rates of a currency over a period (e.g. "/history RUB 30d").
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+
+    args = message.text.split()[1:]
+    period = args[1].lower() if len(args) > 1 else DEFAULT_HISTORY_PERIOD
+    match = HISTORY_PERIOD_PATTERN.match(period)
+    if not args or not match or int(match.group(1)) == 0:
+        await sender.send_message(message.chat.id, ERROR_HISTORY_USAGE)
+        return
+
+    currency_code = args[0].upper()
+    days = int(match.group(1)) * HISTORY_UNIT_DAYS[match.group(2)]
+
+    summary = await fetch_history_summary(currency_code, days)
+    response = (
+        format_history_response(currency_code, period, summary)
+        if summary
+        else ERROR_NO_HISTORY
+    )
+    await sender.send_message(message.chat.id, response)
+
+
+@error_reply(ERROR_FETCHING_RATES)
+async def convert_currency(message):
+    """
+    Converts an amount between two currencies (e.g. "/convert 250 RUB THB").
+
+    The rate is taken from the in-memory cross-rate matrix of the official rates.
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+
+    args = message.text.split()[1:]
     try:
-        currency_code = message.text.split()[1].upper()
-    except IndexError:
-        await bot.send_message(
-            chat_id=message.chat.id,
-            text="❌ Пожалуйста, укажите код валюты после команды. Пример: /check USD",
+        amount = float(args[0].replace(",", "."))
+        from_code, to_code = args[1].upper(), args[2].upper()
+        if not math.isfinite(amount) or amount <= 0:
+            raise ValueError(f"Invalid amount: {amount}")
+    except (IndexError, ValueError):
+        await sender.send_message(message.chat.id, ERROR_CONVERT_USAGE)
+        return
+
+    cross_rates = await fetch_cross_rates()
+    if from_code not in cross_rates or to_code not in cross_rates:
+        logger.warning(
+            "Currency not found for conversion: %s -> %s", from_code, to_code
         )
+        await sender.send_message(message.chat.id, ERROR_INVALID_CURRENCY)
         return
 
-    # Fetch rates from API and scrapper
-    api_rate = await fetch_api_rates(currency_code)
-    scrapper_rate = await fetch_scrapper_rates(currency_code)
+    rate = cross_rates.rate(from_code, to_code)
+    response = format_convert_response(amount, from_code, to_code, amount * rate, rate)
+    await sender.send_message(message.chat.id, response)
+
+
+async def answer_inline_query(inline_query):
+    """
+    Answers an inline query (e.g. "@bot rub") with matching currencies.
+
+    Matches come from the prefix index of the current rates snapshot and carry
+    the rendered /check response, so no database lookup is made per keystroke.
 
-    # Handle cases where currency is not found in either source
-    if not api_rate and not scrapper_rate:
-        logger.warning("Currency not found in any database: %s", currency_code)
-        await bot.send_message(chat_id=message.chat.id, text=ERROR_INVALID_CURRENCY)
+    Args:
+        inline_query: The inline query object from the user.
+    """
+    snapshot = rates_cache.snapshot
+    if snapshot is None:
+        snapshot = await rates_cache.get_snapshot()
+    if snapshot is None:
+        await bot.answer_inline_query(inline_query.id, [], cache_time=0)
+        return
+
+    query = inline_query.query
+    currency_codes = (
+        snapshot.currency_index.search(query, MAX_INLINE_RESULTS)
+        if query.strip()
+        else [code for code in WARM_CHECK_CURRENCIES if code in snapshot.currency_index]
+    )
+
+    results = []
+    for code in currency_codes:
+        api_rate = snapshot.api_rates.get(code)
+        scrapper_rate = snapshot.scrapper_rates.get(code)
+        response = response_cache.get("check", code, snapshot.version)
+        if response is None:
+            response = _render_check({code: (api_rate, scrapper_rate)})
+            response_cache.put("check", code, snapshot.version, response)
+        title, description = format_inline_result(
+            code,
+            CURRENCY_NAMES.get(code),
+            api_rate[1:3] if api_rate else None,
+            scrapper_rate[1:3] if scrapper_rate else None,
+        )
+        results.append(
+            types.InlineQueryResultArticle(
+                id=code,
+                title=title,
+                description=description,
+                input_message_content=types.InputTextMessageContent(response),
+            )
+        )
+
+    await bot.answer_inline_query(
+        inline_query.id, results, cache_time=INLINE_CACHE_TIME
+    )
+
+
+@error_reply(ERROR_ALERT_FAILED)
+async def set_alert(message):
+    """
+    Creates a rate threshold alert (e.g. "/alert USD sell < 3.66").
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+
+    args = message.text.split()[1:]
+    try:
+        currency_code = args[0].upper()
+        metric = ALERT_METRICS[args[1].lower()]
+        direction = ALERT_DIRECTIONS[args[2].lower()]
+        threshold = float(args[3].replace(",", "."))
+        if len(args) != 4 or not math.isfinite(threshold) or threshold <= 0:
+            raise ValueError(f"Invalid alert: {args}")
+    except (IndexError, KeyError, ValueError):
+        await sender.send_message(message.chat.id, ERROR_ALERT_USAGE)
+        return
+
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None and currency_code not in snapshot.currency_index:
+        await sender.send_message(message.chat.id, ERROR_INVALID_CURRENCY)
+        return
+
+    if len(await fetch_chat_alerts(message.chat.id)) >= Config.MAX_ALERTS_PER_CHAT:
+        await sender.send_message(message.chat.id, ERROR_ALERT_LIMIT)
         return
+    alert = await alert_engine.add(
+        message.chat.id, currency_code, metric, direction, threshold
+    )
+    await sender.send_message(message.chat.id, format_alert_created(alert))
+
+
+async def list_alerts(message):
+    """
+    Sends the alerts of the chat.
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+    alerts = await fetch_chat_alerts(message.chat.id)
+    await sender.send_message(message.chat.id, format_alerts_list(alerts))
+
+
+async def remove_alert(message):
+    """
+    Deletes an alert of the chat (e.g. "/unalert 12").
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+
+    args = message.text.split()[1:]
+    try:
+        alert_id = int(args[0].lstrip("#"))
+    except (IndexError, ValueError):
+        await sender.send_message(message.chat.id, ERROR_UNALERT_USAGE)
+        return
+
+    if await alert_engine.remove(message.chat.id, alert_id):
+        await sender.send_message(
+            message.chat.id, f"🔕 Уведомление #{alert_id} удалено."
+        )
+    else:
+        await sender.send_message(message.chat.id, ERROR_ALERT_NOT_FOUND)
+
 
-    # Format response based on available data
-    if api_rate:
-        usd_to_currency, eur_to_currency = api_rate[1:3]
+async def subscribe(message):
+    """
+    Subscribes the chat to the daily digest.
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+    if await add_subscriber(message.chat.id):
+        response = "📬 Вы подписались на ежедневную сводку курсов."
     else:
-        usd_to_currency = eur_to_currency = None
+        response = "📬 Вы уже подписаны на ежедневную сводку курсов."
+    await sender.send_message(message.chat.id, response)
+
 
-    if scrapper_rate:
-        scrapper_buy, scrapper_sell = scrapper_rate[1:3]
+async def unsubscribe(message):
+    """
+    Unsubscribes the chat from the daily digest.
+
+    Args:
+        message: The message object from the user.
+    """
+    logger.info("Executing function: %s", message.text)
+    if await delete_subscribers([message.chat.id]):
+        response = "🔕 Вы отписались от ежедневной сводки курсов."
     else:
-        scrapper_buy = scrapper_sell = None
+        response = "🔕 Вы не подписаны на ежедневную сводку курсов."
+    await sender.send_message(message.chat.id, response)
+
+
+async def _snapshot_version():
+    """
+    Returns the version of the current rates snapshot.
+
+    Returns:
+        int: The snapshot version, or None if no snapshot could be loaded.
+    """
+    snapshot = await rates_cache.get_snapshot()
+    return snapshot.version if snapshot is not None else None
+
+
+def _render_api_rates(rates):
+    """
+    Renders the /check_rates response.
+
+    Args:
+        rates (tuple): The AED row of the API rates, or None.
+
+    Returns:
+        str: The rendered response, or None if there are no rates.
+    """
+    return format_api_currency_response(rates) if rates else None
 
-    response = format_check_currency_response(
-        currency_code,
-        (usd_to_currency, eur_to_currency) if api_rate else None,
-        (scrapper_buy, scrapper_sell) if scrapper_rate else None,
+
+def _render_scrapper_rates(rates):
+    """
+    Renders the /check_exchange response.
+
+    Args:
+        rates (dict): Currency code -> scrapper rates row.
+
+    Returns:
+        str: The rendered response, or None if the USD or EUR rate is missing.
+    """
+    usd_rate = rates.get("USD")
+    eur_rate = rates.get("EUR")
+    if not usd_rate or not eur_rate:
+        return None
+    return format_scrapper_currency_response(tuple(usd_rate[:3]), tuple(eur_rate[:3]))
+
+
+def _render_check(rates):
+    """
+    Renders the /check response.
+
+    Args:
+        rates (dict): Currency code -> (API rates row or None, scrapper rates row or None).
+
+    Returns:
+        str: The rendered response, or None if no currency was found in either source.
+    """
+    if not any(api_rate or scrapper_rate for api_rate, scrapper_rate in rates.values()):
+        return None
+    return format_check_currencies_response(
+        {
+            code: (
+                api_rate[1:3] if api_rate else None,
+                scrapper_rate[1:3] if scrapper_rate else None,
+            )
+            for code, (api_rate, scrapper_rate) in rates.items()
+        }
     )
 
-    await bot.send_message(chat_id=message.chat.id, text=response)
+
+def _warm_response_cache(snapshot):
+    """
+    Renders the most frequent responses for a freshly loaded snapshot.
+
+    Args:
+        snapshot (RatesSnapshot): The new rates snapshot.
+    """
+    response_cache.reset(snapshot.version)
+    # Build the inline prefix index now rather than on the first keystroke
+    snapshot.currency_index
+    responses = {
+        ("check_rates", "AED"): _render_api_rates(snapshot.api_rates.get("AED")),
+        ("check_exchange", None): _render_scrapper_rates(snapshot.scrapper_rates),
+    }
+    for code in WARM_CHECK_CURRENCIES:
+        responses[("check", code)] = _render_check(
+            {code: (snapshot.api_rates.get(code), snapshot.scrapper_rates.get(code))}
+        )
+    for (command, currency_code), response in responses.items():
+        if response:
+            response_cache.put(command, currency_code, snapshot.version, response)
+
+
+rates_cache.add_listener(_warm_response_cache)
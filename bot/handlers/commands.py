@@ -1,22 +1,22 @@
 """
 Command handlers for the Telegram bot.
 
-This module defines the commands and their respective handlers for interacting with the bot.
+This module defines the routing table that maps commands, keyboard button
+labels and aliases to their handlers. Every text message is resolved with one
+dictionary lookup and runs through the router middleware (error handling,
+timing and per-chat rate limits).
 
 Functions:
-    handle_send_welcome: Handles the '/start' and '/help' commands.
-    handle_get_api_rates: Handles the command to check official currency rates.
-    handle_get_scrapper_rates: Handles the command to check exchange rates from scrappers.
-    handle_update_rates: Handles the command to update currency rates.
-    handle_send_help: Handles the 'help' command.
-    handle_check_rates_command: Handles the '/check_rates' command.
-    handle_check_exchange_command: Handles the '/check_exchange' command.
-    handle_update_rates_command: Handles the '/update_rates' command.
-    handle_check_command: Handles the '/check' command for currency conversion.
+    handle_message: Routes a text message to its handler.
+    handle_inline_query: Handles inline queries with currency lookups.
+
+Attributes:
+    router (Router): The routing table of the bot.
 """
 
-from bot.config import bot, create_markup
-from bot import logger
+from bot.config import BUTTON_LABELS, bot
+from bot.middleware import ThrottleMiddleware, error_middleware, timing_middleware
+from bot.router import Router
 from bot.handlers.async_functions import (
     send_welcome,
     get_api_rates,
@@ -24,114 +24,68 @@ from bot.handlers.async_functions import (
     update_rates,
     send_help,
     check_currency,
+    get_rate_history,
+    convert_currency,
+    answer_inline_query,
+    set_alert,
+    list_alerts,
+    remove_alert,
+    subscribe,
+    unsubscribe,
 )
+from utils.config import Config
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Routing table: commands and button labels in every supported language
+router = Router()
+router.add(send_welcome, commands=["start", "help"])
+router.add(send_help, texts=BUTTON_LABELS["help"])
+router.add(get_api_rates, commands=["check_rates"], texts=BUTTON_LABELS["api_rates"])
+router.add(
+    get_scrapper_rates,
+    commands=["check_exchange"],
+    texts=BUTTON_LABELS["scrapper_rates"],
+)
+router.add(update_rates, commands=["update_rates"], texts=BUTTON_LABELS["update_rates"])
+router.add(check_currency, commands=["check"])
+router.add(get_rate_history, commands=["history"])
+router.add(convert_currency, commands=["convert"])
+router.add(set_alert, commands=["alert"])
+router.add(list_alerts, commands=["alerts"])
+router.add(remove_alert, commands=["unalert"])
+router.add(subscribe, commands=["subscribe"])
+router.add(unsubscribe, commands=["unsubscribe"])
 
-# Create a keyboard markup for the bot's interface
-markup = create_markup()
-
-
-@bot.message_handler(commands=["start", "help"])
-async def handle_send_welcome(message):
-    """
-    Handles the '/start' and '/help' commands by sending a welcome message.
-
-    Args:
-        message: The message object from the user.
-    """
-    try:
-        logger.info("Handling 'start' or 'help' command.")
-        await send_welcome(message)
-    except Exception as e:
-        logger.error(f"Error in handle_send_welcome: {e}", exc_info=True)
-
-
-@bot.message_handler(func=lambda message: message.text == "Проверить оф. курсы валют")
-async def handle_get_api_rates(message):
-    """
-    Handles the command to check official currency rates.
-
-    Args:
-        message: The message object from the user.
-    """
-    logger.info("Handling 'check official rates' command.")
-    await get_api_rates(message)
-
-
-@bot.message_handler(func=lambda message: message.text == "Проверить курс обменника")
-async def handle_get_scrapper_rates(message):
-    """
-    Handles the command to check exchange rates from scrappers.
-
-    Args:
-        message: The message object from the user.
-    """
-    logger.info("Handling 'check exchange rates' command.")
-    await get_scrapper_rates(message)
-
-
-@bot.message_handler(func=lambda message: message.text == "Обновить курсы валют")
-async def handle_update_rates(message):
-    """
-    Handles the command to update currency rates.
-
-    Args:
-        message: The message object from the user.
-    """
-    logger.info("Handling 'update rates' command.")
-    await update_rates(message)
-
-
-@bot.message_handler(func=lambda message: message.text == "Помощь")
-async def handle_send_help(message):
-    """
-    Handles the 'help' command by sending a help message.
-
-    Args:
-        message: The message object from the user.
-    """
-    logger.info("Handling 'help' command.")
-    await send_help(message)
-
-
-@bot.message_handler(commands=["check_rates"])
-async def handle_check_rates_command(message):
-    """
-    Handles the '/check_rates' command by fetching and sending official rates.
-
-    Args:
-        message: The message object from the user.
-    """
-    await get_api_rates(message)
-
-
-@bot.message_handler(commands=["check_exchange"])
-async def handle_check_exchange_command(message):
-    """
-    Handles the '/check_exchange' command by fetching and sending exchange rates.
-
-    Args:
-        message: The message object from the user.
-    """
-    await get_scrapper_rates(message)
+# Middleware shared by every routed handler, outermost first
+router.use(error_middleware)
+router.use(ThrottleMiddleware(Config.COMMAND_RATE_LIMIT, Config.COMMAND_BURST))
+router.use(timing_middleware)
 
 
-@bot.message_handler(commands=["update_rates"])
-async def handle_update_rates_command(message):
+@bot.message_handler(content_types=["text"])
+async def handle_message(message):
     """
-    Handles the '/update_rates' command by updating currency rates.
+    Routes a text message to its handler through the routing table.
 
     Args:
         message: The message object from the user.
     """
-    await update_rates(message)
+    if not await router.dispatch(message):
+        logger.debug("No route for message: %r", message.text)
 
 
-@bot.message_handler(commands=["check"])
-async def handle_check_command(message):
+@bot.inline_handler(func=lambda inline_query: True)
+async def handle_inline_query(inline_query):
     """
-    Handles the '/check' command for currency conversion.
+    Handles inline queries (e.g. "@bot rub") by answering with matching currencies.
 
     Args:
-        message: The message object from the user.
+        inline_query: The inline query object from the user.
     """
-    await check_currency(message)
+    try:
+        await timing_middleware(answer_inline_query, inline_query)
+    except Exception as e:
+        logger.error(f"Error in handle_inline_query: {e}", exc_info=True)
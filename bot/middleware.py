@@ -0,0 +1,184 @@
+"""
+Middleware for routed message handlers.
+
+Each middleware is a coroutine function called as middleware(handler, message)
+that awaits handler(message), so cross-cutting concerns are written once and
+attached to the router instead of being repeated in every handler.
+
+Handlers do not catch unexpected errors themselves: error_middleware logs
+them and replies, with the handler's own message if it is decorated with
+error_reply.
+
+Classes:
+    HandlerError: Raised by error_reply handlers, carrying their error reply.
+    ThrottleMiddleware: Drops commands from chats that send them too fast.
+
+Functions:
+    error_reply: Decorator setting the reply sent when a handler fails.
+    error_middleware: Logs handler errors and replies with an error message.
+    timing_middleware: Records the duration and errors of every handler.
+
+Attributes:
+    ERROR_UNEXPECTED (str): Reply sent when a handler fails.
+    ERROR_THROTTLED (str): Reply sent when a chat's commands are dropped.
+"""
+
+import functools
+import time
+from bot.sender import TokenBucket, sender
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+ERROR_UNEXPECTED = "❌ Произошла ошибка. Пожалуйста, попробуйте позже."
+ERROR_THROTTLED = "⏳ Слишком много запросов. Пожалуйста, подождите немного."
+
+# Number of per-chat buckets kept before the idle ones are dropped
+MAX_THROTTLE_BUCKETS = 10000
+
+# Handler metrics, labelled by handler name
+HANDLER_LATENCY = metrics.histogram(
+    "bot_handler_seconds", "Duration of bot command handlers.", "handler"
+)
+HANDLER_ERRORS = metrics.counter(
+    "bot_handler_errors_total", "Bot command handlers that raised.", "handler"
+)
+THROTTLED = metrics.counter(
+    "bot_throttled_total", "Commands dropped by the per-chat rate limit."
+)
+
+
+class HandlerError(Exception):
+    """
+    Raised by a handler decorated with error_reply when it fails.
+
+    The original error is chained as the cause.
+
+    Attributes:
+        reply (str): The message sent to the user.
+    """
+
+    def __init__(self, reply):
+        super().__init__(reply)
+        self.reply = reply
+
+
+def error_reply(reply):
+    """
+    Decorator setting the reply sent by error_middleware when a handler fails.
+
+    Args:
+        reply (str): The message sent to the user instead of ERROR_UNEXPECTED.
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(message):
+            try:
+                await handler(message)
+            except Exception as e:
+                raise HandlerError(reply) from e
+
+        return wrapper
+
+    return decorator
+
+
+async def error_middleware(handler, message):
+    """
+    Logs handler errors and replies with an error message.
+
+    Args:
+        handler (callable): The wrapped handler.
+        message: The message object from the user.
+    """
+    try:
+        await handler(message)
+    except Exception as e:
+        cause = e.__cause__ if isinstance(e, HandlerError) else e
+        logger.error(
+            f"Error handling {message.text!r} in chat {message.chat.id}: {cause}",
+            exc_info=True,
+        )
+        reply = e.reply if isinstance(e, HandlerError) else ERROR_UNEXPECTED
+        try:
+            await sender.send_message(message.chat.id, reply)
+        except Exception as send_error:
+            logger.warning(f"Could not report the error to the user: {send_error}")
+
+
+async def timing_middleware(handler, message):
+    """
+    Records the duration and errors of every handler.
+
+    Registered innermost, so that it wraps the handler function itself and
+    can label the metrics with its name.
+
+    Args:
+        handler (callable): The wrapped handler.
+        message: The message object from the user.
+    """
+    name = getattr(handler, "__name__", "unknown")
+    started = time.perf_counter()
+    try:
+        await handler(message)
+    except Exception:
+        HANDLER_ERRORS.labels(name).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        HANDLER_LATENCY.labels(name).observe(elapsed)
+        logger.debug(
+            "Handled %r in %.1f ms", getattr(message, "text", name), elapsed * 1000
+        )
+
+
+class ThrottleMiddleware:
+    """
+    Drops commands from chats that send them faster than the allowed rate.
+
+    The first dropped command of a chat is answered with ERROR_THROTTLED; the
+    next ones are dropped silently until the chat may send again.
+    """
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate (float): Commands per second allowed per chat.
+            burst (int): Commands a chat may send back to back.
+        """
+        self._rate = rate
+        self._burst = burst
+        self._buckets = {}
+        self._notified = set()
+
+    async def __call__(self, handler, message):
+        now = time.monotonic()
+        bucket = self._buckets.get(message.chat.id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_THROTTLE_BUCKETS:
+                self._buckets = {
+                    chat_id: bucket
+                    for chat_id, bucket in self._buckets.items()
+                    if not bucket.is_idle(now)
+                }
+                self._notified.intersection_update(self._buckets)
+            bucket = self._buckets[message.chat.id] = TokenBucket(
+                self._rate, self._burst, now
+            )
+
+        if bucket.delay(now) > 0:
+            logger.info("Throttled %r in chat %s", message.text, message.chat.id)
+            THROTTLED.inc()
+            if message.chat.id not in self._notified:
+                self._notified.add(message.chat.id)
+                await sender.send_message(message.chat.id, ERROR_THROTTLED)
+            return
+        bucket.consume(now)
+        self._notified.discard(message.chat.id)
+        await handler(message)
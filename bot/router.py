@@ -0,0 +1,113 @@
+"""
+Table-driven routing of incoming messages.
+
+This module maps commands, keyboard button labels and their aliases to
+handlers through one dictionary lookup per message, instead of evaluating a
+predicate per registered handler. Middleware (error handling, timing, rate
+limits) is attached once to the router and wraps every handler.
+
+Classes:
+    Router: Routing table of commands and button labels with middleware.
+
+Functions:
+    command_of: Extracts the command name of a message text.
+"""
+
+from functools import partial
+
+
+def command_of(text):
+    """
+    Extracts the command name of a message text.
+
+    Args:
+        text (str): The message text, e.g. "/check@my_bot RUB".
+
+    Returns:
+        str: The lowercase command without the slash and bot name, or None
+        if the text is not a command.
+    """
+    if not text or text[0] != "/":
+        return None
+    return (
+        text[1:].split(maxsplit=1)[0].split("@", 1)[0].lower() if len(text) > 1 else ""
+    )
+
+
+class Router:
+    """
+    Routing table of commands and button labels with middleware.
+
+    Middleware are coroutine functions called as middleware(handler, message)
+    that are expected to await handler(message). The first registered
+    middleware is the outermost one.
+    """
+
+    def __init__(self):
+        self._commands = {}
+        self._texts = {}
+        self._middleware = []
+        self._chains = {}
+
+    def add(self, handler, commands=(), texts=()):
+        """
+        Routes commands and exact message texts to a handler.
+
+        Args:
+            handler (callable): Coroutine function taking the message.
+            commands (iterable): Command names without the slash.
+            texts (iterable): Exact message texts, e.g. keyboard button labels.
+        """
+        for command in commands:
+            self._commands[command.lower()] = handler
+        for text in texts:
+            self._texts[text] = handler
+        self._chains.clear()
+
+    def use(self, middleware):
+        """
+        Wraps every handler in a middleware.
+
+        Args:
+            middleware (callable): Coroutine function called as middleware(handler, message).
+        """
+        self._middleware.append(middleware)
+        self._chains.clear()
+
+    def resolve(self, text):
+        """
+        Returns the handler of a message text.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            callable: The routed handler, or None if nothing matches.
+        """
+        command = command_of(text)
+        if command is not None:
+            return self._commands.get(command)
+        return self._texts.get(text.strip()) if text else None
+
+    async def dispatch(self, message):
+        """
+        Runs the handler of a message through the middleware.
+
+        Args:
+            message: The message object from the user.
+
+        Returns:
+            bool: True if a handler was found.
+        """
+        handler = self.resolve(message.text)
+        if handler is None:
+            return False
+
+        chain = self._chains.get(handler)
+        if chain is None:
+            chain = handler
+            for middleware in reversed(self._middleware):
+                chain = partial(middleware, chain)
+            self._chains[handler] = chain
+        await chain(message)
+        return True
@@ -0,0 +1,547 @@
+"""
+Rate-limited outbound queue for Telegram messages.
+
+This module sends every outgoing message through one queue that respects the
+Telegram Bot API limits: a global token bucket caps the total send rate and a
+token bucket per chat caps the rate within one chat. Consecutive messages
+queued for the same chat are merged into one message, and 429 responses are
+retried after the delay Telegram asks for. That delay holds only the chat for
+groups and channels, which have their own per-chat limit, and every chat
+otherwise, since Telegram does not say which limit was hit.
+
+Classes:
+    TokenBucket: Token bucket rate limiter.
+    MessageSender: Priority queue of outgoing messages with rate limiting.
+
+Attributes:
+    PRIORITY_HIGH (int): Priority of replies to user commands.
+    PRIORITY_LOW (int): Priority of broadcast messages (alerts, digests).
+    MAX_MESSAGE_LENGTH (int): Maximum length of a Telegram text message.
+    sender (MessageSender): The process-wide message sender.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from telebot.asyncio_helper import ApiTelegramException
+from bot.config import bot
+from utils.config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Lower values are sent first
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 10
+
+# Telegram rejects text messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+
+# Separator between coalesced messages
+COALESCE_SEPARATOR = "\n\n"
+
+# Number of recent send latencies kept for the statistics
+LATENCY_WINDOW = 1024
+
+# Number of idle per-chat buckets tolerated before they are pruned
+MAX_IDLE_BUCKETS = 10000
+
+# Send metrics: errors labelled by Telegram error code, and the time from
+# enqueueing a message to the API response
+SEND_ERRORS = metrics.counter(
+    "telegram_send_errors_total", "Failed Telegram API calls by error code.", "code"
+)
+SEND_LATENCY = metrics.histogram(
+    "telegram_send_seconds", "Time from enqueueing a message to its delivery."
+)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, i.e. the allowed burst.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens.
+            now (float): Current monotonic time.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """
+        Returns the number of seconds until a token is available.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            float: 0 if a token is available now.
+        """
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self, now):
+        """
+        Takes one token.
+
+        Args:
+            now (float): Current monotonic time.
+        """
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_idle(self, now):
+        """
+        Returns whether the bucket is full, so dropping it changes nothing.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            bool: True if the bucket holds its full capacity.
+        """
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class _Outgoing:
+    """
+    One queued API call and the future waiting for its result.
+    """
+
+    __slots__ = (
+        "method",
+        "chat_id",
+        "text",
+        "kwargs",
+        "priority",
+        "coalesce",
+        "future",
+        "enqueued",
+        "attempts",
+    )
+
+    def __init__(self, method, chat_id, text, kwargs, priority, coalesce):
+        self.method = method
+        self.chat_id = chat_id
+        self.text = text
+        self.kwargs = {key: value for key, value in kwargs.items() if value is not None}
+        self.priority = priority
+        self.coalesce = coalesce
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+        self.attempts = 0
+
+    def can_merge(self, other, length):
+        """
+        Returns whether another message can be appended to this one.
+
+        Args:
+            other (_Outgoing): The next queued message for the same chat.
+            length (int): Current length of the merged text.
+
+        Returns:
+            bool: True if both are plain sends with the same priority and
+            options and fit in one message.
+        """
+        return (
+            self.method == other.method == "send_message"
+            and self.priority == other.priority
+            and self.coalesce
+            and other.coalesce
+            and self.kwargs == other.kwargs
+            and length + len(COALESCE_SEPARATOR) + len(other.text) <= MAX_MESSAGE_LENGTH
+        )
+
+
+class MessageSender:
+    """
+    Priority queue of outgoing messages with global and per-chat rate limits.
+
+    Messages for one chat are delivered in order, one at a time. Chats whose
+    bucket has a token wait in a heap ordered by priority and arrival; chats
+    that must wait sit in a second heap ordered by the time they may send.
+    """
+
+    def __init__(self, bot, global_rate, chat_rate, chat_burst, max_retries):
+        """
+        Args:
+            bot (AsyncTeleBot): The bot used for the API calls.
+            global_rate (float): Messages per second across all chats.
+            chat_rate (float): Messages per second within one chat.
+            chat_burst (int): Messages one chat may receive back to back.
+            max_retries (int): Retries of a message rejected with 429.
+        """
+        self._bot = bot
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._max_retries = max_retries
+        self._global = TokenBucket(global_rate, max(1.0, global_rate), time.monotonic())
+        self._buckets = {}
+        self._queues = {}
+        self._ready = []
+        self._waiting = []
+        self._scheduled = set()
+        self._in_flight = set()
+        self._hold_until = {}
+        self._global_hold_until = 0.0
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._deliveries = set()
+        self._depth = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {"sent": 0, "failed": 0, "retried": 0, "coalesced": 0}
+
+    async def send_message(
+        self, chat_id, text, priority=PRIORITY_HIGH, coalesce=True, **kwargs
+    ):
+        """
+        Queues a text message and waits until it is sent.
+
+        Args:
+            chat_id (int): The target chat.
+            text (str): The message text.
+            priority (int): PRIORITY_HIGH for replies, PRIORITY_LOW for broadcasts.
+            coalesce (bool): Whether the message may be merged with neighbours
+                queued for the same chat. Disable it for messages edited later.
+            **kwargs: Other bot.send_message arguments (e.g. reply_markup).
+
+        Returns:
+            Message: The sent message, shared by all coalesced senders.
+        """
+        return await self._enqueue(
+            _Outgoing("send_message", chat_id, text, kwargs, priority, coalesce)
+        )
+
+    async def edit_message_text(self, text, chat_id, message_id, **kwargs):
+        """
+        Queues a message edit and waits until it is applied.
+
+        Args:
+            text (str): The new message text.
+            chat_id (int): The chat of the message.
+            message_id (int): The message to edit.
+            **kwargs: Other bot.edit_message_text arguments.
+
+        Returns:
+            The result of bot.edit_message_text.
+        """
+        kwargs["message_id"] = message_id
+        return await self._enqueue(
+            _Outgoing("edit_message_text", chat_id, text, kwargs, PRIORITY_HIGH, False)
+        )
+
+    @property
+    def queue_depth(self):
+        """int: Number of messages waiting in the queue."""
+        return self._depth
+
+    @property
+    def counters(self):
+        """dict: Numbers of API calls sent, failed and retried, and of messages coalesced."""
+        return dict(self._counters)
+
+    def stats(self):
+        """
+        Returns queue depth and send latency statistics.
+
+        Latencies are measured from enqueueing to the API response over the
+        last LATENCY_WINDOW deliveries.
+
+        Returns:
+            dict: Queue depth, in-flight chats, counters and latency figures in seconds.
+        """
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            "queue_depth": self._depth,
+            "in_flight": len(self._in_flight),
+            **self._counters,
+            "latency_avg": sum(latencies) / count if count else 0.0,
+            "latency_p95": latencies[int(0.95 * (count - 1))] if count else 0.0,
+            "latency_max": latencies[-1] if count else 0.0,
+        }
+
+    async def close(self):
+        """
+        Stops the worker and cancels the messages still queued.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+        for queue in self._queues.values():
+            for item in queue:
+                item.future.cancel()
+        self._queues.clear()
+        self._ready.clear()
+        self._waiting.clear()
+        self._scheduled.clear()
+        self._hold_until.clear()
+        self._global_hold_until = 0.0
+        self._depth = 0
+
+    async def _enqueue(self, item):
+        """
+        Adds a call to its chat queue and waits for the result.
+
+        Args:
+            item (_Outgoing): The queued call.
+
+        Returns:
+            The result of the API call.
+        """
+        self._queues.setdefault(item.chat_id, deque()).append(item)
+        self._depth += 1
+        self._schedule(item.chat_id, time.monotonic())
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await item.future
+
+    def _bucket(self, chat_id, now):
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(
+                self._chat_rate, self._chat_burst, now
+            )
+        return bucket
+
+    def _schedule(self, chat_id, now):
+        """
+        Puts a chat with queued messages into the ready or the waiting heap.
+
+        Args:
+            chat_id (int): The chat to schedule.
+            now (float): Current monotonic time.
+        """
+        if chat_id in self._scheduled or chat_id in self._in_flight:
+            return
+        queue = self._queues.get(chat_id)
+        if not queue:
+            return
+
+        not_before = max(
+            now + self._bucket(chat_id, now).delay(now),
+            self._hold_until.get(chat_id, 0.0),
+        )
+        if not_before <= now:
+            self._hold_until.pop(chat_id, None)
+            entry = (queue[0].priority, next(self._sequence), chat_id)
+            heapq.heappush(self._ready, entry)
+        else:
+            heapq.heappush(self._waiting, (not_before, next(self._sequence), chat_id))
+        self._scheduled.add(chat_id)
+        self._wakeup.set()
+
+    async def _run(self):
+        """
+        Worker loop that starts deliveries as the rate limits allow.
+        """
+        while True:
+            now = time.monotonic()
+            while self._waiting and self._waiting[0][0] <= now:
+                _, _, chat_id = heapq.heappop(self._waiting)
+                self._scheduled.discard(chat_id)
+                self._schedule(chat_id, now)
+
+            if not self._ready:
+                timeout = self._waiting[0][0] - now if self._waiting else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+                continue
+
+            delay = max(self._global.delay(now), self._global_hold_until - now)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, chat_id = heapq.heappop(self._ready)
+            self._scheduled.discard(chat_id)
+            batch = self._take_batch(chat_id)
+            self._global.consume(now)
+            self._bucket(chat_id, now).consume(now)
+            self._in_flight.add(chat_id)
+
+            task = asyncio.create_task(self._deliver(chat_id, batch))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+            if len(self._buckets) > MAX_IDLE_BUCKETS:
+                self._prune_buckets(now)
+
+    def _take_batch(self, chat_id):
+        """
+        Takes the next message of a chat together with the messages merged into it.
+
+        Args:
+            chat_id (int): The chat to take messages from.
+
+        Returns:
+            list: The queued calls delivered as one API call.
+        """
+        queue = self._queues[chat_id]
+        batch = [queue.popleft()]
+        length = len(batch[0].text)
+        while queue and batch[0].can_merge(queue[0], length):
+            length += len(COALESCE_SEPARATOR) + len(queue[0].text)
+            batch.append(queue.popleft())
+        self._depth -= len(batch)
+        self._counters["coalesced"] += len(batch) - 1
+        return batch
+
+    async def _deliver(self, chat_id, batch):
+        """
+        Makes one API call for a batch and resolves the waiting futures.
+
+        Args:
+            chat_id (int): The target chat.
+            batch (list): The queued calls merged into this API call.
+        """
+        head = batch[0]
+        text = COALESCE_SEPARATOR.join(item.text for item in batch)
+        try:
+            if head.method == "send_message":
+                result = await self._bot.send_message(chat_id, text, **head.kwargs)
+            else:
+                result = await self._bot.edit_message_text(
+                    text, chat_id=chat_id, **head.kwargs
+                )
+        except ApiTelegramException as e:
+            SEND_ERRORS.labels(str(e.error_code)).inc()
+            retry_after = _retry_after(e)
+            if retry_after is not None and head.attempts < self._max_retries:
+                logger.warning(
+                    f"Rate limited in chat {chat_id}, retrying in {retry_after}s"
+                )
+                for item in batch:
+                    item.attempts += 1
+                self._queues[chat_id].extendleft(reversed(batch))
+                self._depth += len(batch)
+                hold_until = time.monotonic() + retry_after
+                self._hold_until[chat_id] = hold_until
+                if not _is_group_chat(chat_id):
+                    self._global_hold_until = max(self._global_hold_until, hold_until)
+                self._counters["retried"] += 1
+            else:
+                self._fail(batch, e)
+        except Exception as e:
+            SEND_ERRORS.labels("other").inc()
+            self._fail(batch, e)
+        else:
+            now = time.monotonic()
+            for item in batch:
+                self._latencies.append(now - item.enqueued)
+                SEND_LATENCY.observe(now - item.enqueued)
+                if not item.future.done():
+                    item.future.set_result(result)
+            self._counters["sent"] += 1
+        finally:
+            self._in_flight.discard(chat_id)
+            if self._queues.get(chat_id):
+                self._schedule(chat_id, time.monotonic())
+            else:
+                self._queues.pop(chat_id, None)
+
+    def _fail(self, batch, error):
+        """
+        Passes a delivery error to every sender of a batch.
+
+        Args:
+            batch (list): The queued calls of the failed API call.
+            error (Exception): The error raised by the API call.
+        """
+        self._counters["failed"] += 1
+        for item in batch:
+            if not item.future.done():
+                item.future.set_exception(error)
+
+    def _prune_buckets(self, now):
+        """
+        Drops per-chat buckets of chats that are idle and fully refilled.
+
+        Args:
+            now (float): Current monotonic time.
+        """
+        active = self._queues.keys() | self._in_flight
+        self._buckets = {
+            chat_id: bucket
+            for chat_id, bucket in self._buckets.items()
+            if chat_id in active or not bucket.is_idle(now)
+        }
+
+
+def _is_group_chat(chat_id):
+    """
+    Returns whether a chat is a group or a channel, which have negative ids.
+
+    Args:
+        chat_id (int or str): The chat id, or the @username of a channel.
+
+    Returns:
+        bool: True for groups and channels.
+    """
+    return isinstance(chat_id, str) or chat_id < 0
+
+
+def _retry_after(error):
+    """
+    Returns the retry delay of a 429 response.
+
+    Args:
+        error (ApiTelegramException): The API error.
+
+    Returns:
+        float: Seconds to wait, or None if the error is not a rate limit.
+    """
+    if error.error_code != 429:
+        return None
+    parameters = (error.result_json or {}).get("parameters") or {}
+    return float(parameters.get("retry_after", 1))
+
+
+# Process-wide sender shared by all handlers
+sender = MessageSender(
+    bot,
+    Config.SEND_GLOBAL_RATE,
+    Config.SEND_CHAT_RATE,
+    Config.SEND_CHAT_BURST,
+    Config.SEND_MAX_RETRIES,
+)
+metrics.gauge(
+    "telegram_send_queue_depth",
+    "Messages waiting in the send queue.",
+    lambda: sender.queue_depth,
+)
+for _counter in ("sent", "failed", "retried", "coalesced"):
+    metrics.gauge(
+        f"telegram_send_{_counter}_total",
+        f"Telegram API calls {_counter} by the send queue.",
+        lambda counter=_counter: sender.counters[counter],
+        kind="counter",
+    )
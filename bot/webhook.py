@@ -0,0 +1,132 @@
+"""
+Webhook server for the Telegram bot.
+
+This module receives updates over HTTP instead of long polling. Telegram posts
+each update to an aiohttp endpoint, the secret token header is checked, and the
+update is handed to the AsyncTeleBot dispatcher in the background so that the
+request is acknowledged at once.
+
+Functions:
+    create_webhook_app: Creates the aiohttp application serving the webhook.
+    run_webhook: Registers the webhook with Telegram and serves it until cancelled.
+
+Attributes:
+    SECRET_TOKEN_HEADER (str): Header carrying the webhook secret token.
+"""
+
+import asyncio
+import hmac
+from aiohttp import web
+from telebot import types
+from bot.config import bot
+from utils.config import Config
+from utils.logger import get_logger
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Header Telegram sets to the secret token given to setWebhook
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Update processing tasks, referenced until they finish
+_update_tasks = set()
+
+
+async def _handle_update(request):
+    """
+    Validates a webhook request and dispatches its update.
+
+    Args:
+        request (web.Request): The incoming webhook request.
+
+    Returns:
+        web.Response: 200 once the update is accepted, 403 for a wrong secret
+        token and 400 for a body that is not an update.
+    """
+    secret_token = request.headers.get(SECRET_TOKEN_HEADER, "")
+    if not hmac.compare_digest(
+        secret_token.encode(), request.app["secret_token"].encode()
+    ):
+        logger.warning("Rejected webhook request from %s", request.remote)
+        return web.Response(status=403)
+
+    try:
+        update = types.Update.de_json(await request.json())
+    except Exception as e:
+        logger.warning("Invalid webhook update: %s", e)
+        return web.Response(status=400)
+    if update is None:
+        return web.Response(status=400)
+
+    task = asyncio.create_task(bot.process_new_updates([update]))
+    _update_tasks.add(task)
+    task.add_done_callback(_update_tasks.discard)
+    return web.Response()
+
+
+async def _handle_health(request):
+    """
+    Answers load balancer health checks.
+
+    Args:
+        request (web.Request): The incoming request.
+
+    Returns:
+        web.Response: Always 200.
+    """
+    return web.Response(text="ok")
+
+
+def create_webhook_app(secret_token=None, path=None):
+    """
+    Creates the aiohttp application serving the webhook.
+
+    Args:
+        secret_token (str, optional): Expected secret token. Defaults to Config.WEBHOOK_SECRET.
+        path (str, optional): URL path of the webhook. Defaults to Config.WEBHOOK_PATH.
+
+    Returns:
+        web.Application: The webhook application.
+    """
+    secret_token = secret_token if secret_token is not None else Config.WEBHOOK_SECRET
+    if not secret_token:
+        raise ValueError("WEBHOOK_SECRET must be set in webhook mode")
+
+    app = web.Application()
+    app["secret_token"] = secret_token
+    app.router.add_post(path or Config.WEBHOOK_PATH, _handle_update)
+    app.router.add_get("/healthz", _handle_health)
+    return app
+
+
+async def run_webhook():
+    """
+    Registers the webhook with Telegram and serves it until cancelled.
+
+    The webhook is registered only if WEBHOOK_URL is set, so several instances
+    behind a load balancer can share one registration. It is left in place on
+    shutdown for the same reason.
+    """
+    app = create_webhook_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, Config.WEBHOOK_HOST, Config.WEBHOOK_PORT)
+        await site.start()
+        logger.info(
+            f"Webhook server listening on "
+            f"{Config.WEBHOOK_HOST}:{Config.WEBHOOK_PORT}{Config.WEBHOOK_PATH}"
+        )
+
+        if Config.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=Config.WEBHOOK_URL.rstrip("/") + Config.WEBHOOK_PATH,
+                secret_token=Config.WEBHOOK_SECRET,
+            )
+            logger.info("Webhook registered with Telegram.")
+
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        if _update_tasks:
+            await asyncio.gather(*_update_tasks, return_exceptions=True)
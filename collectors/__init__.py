@@ -2,12 +2,27 @@
 Currency data collectors package.
 
 This package contains modules for collecting currency data from different sources.
+
+The exported functions are imported from their submodules on first access,
+so importing one collector does not load the others. browser_manager is not
+exported: its submodule has the same name and would shadow it once imported,
+so it is imported from collectors.browser_manager.
 """
 
-from utils.logger import get_logger
-from .api_collector import collect_api_data
-from .scrapper_collector import collect_exchange_data
+import importlib
 
-logger = get_logger(__name__)
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "collect_api_data": ".api_collector",
+    "collect_exchange_data": ".scrapper_collector",
+}
 
 __all__ = ["collect_api_data", "collect_exchange_data"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,17 +1,30 @@
 """
 Module for collecting currency data from APIs.
 
-This module fetches currency exchange rates from configured API endpoints and updates the database.
+This module fetches USD-based currency exchange rates from the configured API
+endpoint and derives the EUR-based rates from them with the cross-rate engine,
+so a single request is enough.
+Requests are conditional: the ETag, Last-Modified and next update time of the
+last response are stored, the network is skipped until the provider's next
+update, and unchanged data is reported as API_DATA_UNCHANGED. The metadata of
+a new response is returned with its rates, and the caller stores it with
+update_api_fetch_state only once the rates are written.
+
+Attributes:
+    API_DATA_UNCHANGED: Returned by collect_api_data when the API has no new data.
 
 Functions:
     fetch_rates: Fetches currency rates from a given API endpoint.
     collect_api_data: Collects currency data from APIs and prepares it for database updates.
+    build_api_batch: Turns a USD-based API response into rows for database insertion.
 """
 
+import time
 from datetime import UTC, datetime
 import aiohttp
-import asyncio
+from database.db_utils import fetch_api_fetch_state
 from utils.config import Config
+from utils.cross_rates import CrossRates
 from utils.logger import (
     get_logger,
 )  # Import directly from utils.logger instead of collectors
@@ -19,26 +32,64 @@ from utils.logger import (
 # Create logger for this module
 logger = get_logger(__name__)
 
-# API endpoints for fetching currency rates
+# API endpoint for fetching USD-based currency rates
 API_USD_URL = Config.API_USD_URL
-API_EUR_URL = Config.API_EUR_URL
 
 
-async def fetch_rates(session, url):
+class _Unchanged:
+    """Marker type for API data that has not changed since the last collection."""
+
+    def __repr__(self):
+        return "API_DATA_UNCHANGED"
+
+
+# Returned by collect_api_data when the API has no new data
+API_DATA_UNCHANGED = _Unchanged()
+
+
+async def fetch_rates(session, url, state=None):
     """
     Fetches currency rates from a given API endpoint.
 
     Args:
         session (aiohttp.ClientSession): The HTTP session for making requests.
         url (str): The API endpoint URL.
+        state (tuple, optional): The stored response metadata of the endpoint,
+            as returned by fetch_api_fetch_state.
 
     Returns:
-        dict: The JSON response containing currency rates, or None if the request fails.
+        tuple: (JSON response or None if the data is unchanged, new metadata
+        tuple or None if the data is unchanged), or None if the request fails.
     """
+    _, etag, last_modified, next_update_unix, _ = state or (None,) * 5
+
+    # The provider has told us when it updates next; don't ask before that
+    if state is not None and next_update_unix and time.time() < next_update_unix:
+        logger.debug("Skipping request for %s until %s", url, next_update_unix)
+        return None, None
+
+    headers = {}
+    if state is not None:
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
     try:
-        async with session.get(url, timeout=10) as response:
+        async with session.get(url, headers=headers, timeout=10) as response:
+            if response.status == 304 and state is not None:
+                logger.debug("%s not modified", url)
+                return None, None
             response.raise_for_status()
-            return await response.json()
+            data = await response.json()
+            new_state = (
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                data.get("time_next_update_unix"),
+                datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            return data, new_state
     except aiohttp.ClientError as e:
         logger.error(f"HTTP request failed for {url}: {e}", exc_info=True)
         return None
@@ -48,37 +99,63 @@ async def collect_api_data():
     """
     Collects currency data from APIs and prepares it for database updates.
 
+    Only the USD-based rates are requested; the EUR-based rates are derived
+    from them by build_api_batch.
+
+    The response metadata is not stored here: the caller passes it to
+    update_api_fetch_state after the rates are written, so that a failed
+    write is retried with an unconditional request on the next run.
+
     Returns:
-        tuple: A batch of currency data ready for database insertion.
+        tuple: (batch of currency data ready for database insertion, response
+        metadata tuple), API_DATA_UNCHANGED if the API returned no new data,
+        or None if the request failed.
     """
+    state = await fetch_api_fetch_state(API_USD_URL)
+
     async with aiohttp.ClientSession() as session:
-        # Fetch USD and EUR rates concurrently
-        usd_task = fetch_rates(session, API_USD_URL)
-        eur_task = fetch_rates(session, API_EUR_URL)
+        result = await fetch_rates(session, API_USD_URL, state)
 
-        usd_resp, eur_resp = await asyncio.gather(usd_task, eur_task)
+    # Handle a missing response
+    if result is None:
+        logger.error("USD API response is None. Skipping API rates.")
+        return None
 
-        # Handle missing responses
-        if usd_resp is None:
-            logger.error("USD API response is None. Skipping USD rates.")
-            usd_resp = {}
+    usd_resp, new_state = result
+    if new_state is None:
+        logger.info("API rates unchanged since the last collection.")
+        return API_DATA_UNCHANGED
 
-        if eur_resp is None:
-            logger.error("EUR API response is None. Skipping EUR rates.")
-            eur_resp = {}
+    batch_data = build_api_batch(usd_resp)
+    logger.info(f"Fetched {len(batch_data)} USD rates from the API.")
+    return batch_data, new_state
 
-        usd_rates = usd_resp.get("rates", {})
-        eur_rates = eur_resp.get("rates", {})
 
-        logger.info(
-            f"Fetched {len(usd_rates)} USD rates and {len(eur_rates)} EUR rates from APIs."
-        )
+def build_api_batch(usd_resp):
+    """
+    Turns a USD-based API response into rows for database insertion.
 
-        # Prepare data for database insertion
-        today = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
-        batch_data = tuple(
-            (currency_code, to_usd, eur_rates.get(currency_code, None), today)
-            for currency_code, to_usd in usd_rates.items()
-        )
+    The EUR-based rates are derived from the USD-based ones in one vectorized
+    operation.
 
-        return batch_data
+    Args:
+        usd_resp (dict): The decoded API response.
+
+    Returns:
+        tuple: (currency code, USD rate, EUR rate or None, date) for every currency.
+    """
+    cross_rates = CrossRates(usd_resp.get("rates", {}))
+    usd_rates = cross_rates.rebase("USD")
+    eur_rates = cross_rates.rebase("EUR") if "EUR" in cross_rates else None
+
+    # Prepare data for database insertion
+    today = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+    return tuple(
+        (
+            currency_code,
+            float(usd_rates[index]),
+            float(eur_rates[index]) if eur_rates is not None else None,
+            today,
+        )
+        for index, currency_code in enumerate(cross_rates.codes)
+    )
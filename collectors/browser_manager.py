@@ -0,0 +1,207 @@
+"""
+Long-lived Playwright browser for the web scrapers.
+
+This module keeps one Chromium instance warm between scrapes and hands out a
+fresh, isolated browser context for every scrape. The browser is recycled after
+a number of uses or when its memory grows too large, and it is relaunched
+automatically if it crashes.
+
+Classes:
+    BrowserManager: Owns the Playwright driver and the shared browser.
+
+Attributes:
+    browser_manager (BrowserManager): The process-wide browser manager.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from utils.config import Config
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Browser launch timeout: 10 minutes in milliseconds
+LAUNCH_TIMEOUT_MS = 600000
+
+
+def _process_tree_memory_mb(root_pid):
+    """
+    Returns the resident memory of all descendants of a process.
+
+    Only works on Linux, where the browser runs in the Docker image.
+
+    Args:
+        root_pid (int): The process whose descendants are measured.
+
+    Returns:
+        float: Resident memory in megabytes, or None if it cannot be measured.
+    """
+    try:
+        children = {}
+        rss_kb = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/status") as status:
+                    fields = dict(line.split(":", 1) for line in status if ":" in line)
+            except OSError:
+                continue
+            pid = int(entry)
+            children.setdefault(int(fields["PPid"]), []).append(pid)
+            rss_kb[pid] = int(fields.get("VmRSS", "0 kB").split()[0])
+    except (OSError, KeyError, ValueError):
+        return None
+
+    total_kb = 0
+    pending = list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        total_kb += rss_kb.get(pid, 0)
+        pending.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class BrowserManager:
+    """
+    Keeps a single Chromium browser warm and hands out isolated contexts.
+    """
+
+    def __init__(self, max_uses, max_memory_mb):
+        """
+        Args:
+            max_uses (int): Number of contexts after which the browser is recycled.
+            max_memory_mb (int): Memory of the browser processes, in megabytes,
+                above which the browser is recycled. 0 disables the check.
+        """
+        self._max_uses = max_uses
+        self._max_memory_mb = max_memory_mb
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self._active = 0
+        self._lock = asyncio.Lock()
+
+    def _restart_reason(self):
+        """
+        Returns why the browser has to be (re)started before the next scrape.
+
+        Returns:
+            str: The reason, or None if the current browser can be reused.
+        """
+        if self._browser is None:
+            return "not started"
+        if not self._browser.is_connected():
+            return "browser disconnected"
+        # Never recycle a browser that is still in use by another scrape
+        if self._active:
+            return None
+        if self._uses >= self._max_uses:
+            return f"reached {self._uses} uses"
+        if self._max_memory_mb:
+            memory_mb = _process_tree_memory_mb(os.getpid())
+            if memory_mb is not None and memory_mb > self._max_memory_mb:
+                return f"memory grew to {memory_mb:.0f} MB"
+        return None
+
+    async def _start(self):
+        """
+        Starts the Playwright driver and launches the browser.
+        """
+        if self._playwright is None:
+            # Playwright is slow to import and only needed once a browser starts
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(
+                headless=True,
+                timeout=LAUNCH_TIMEOUT_MS,
+            )
+        except Exception:
+            # The driver itself may have died; start a new one next time
+            playwright, self._playwright = self._playwright, None
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+            raise
+        self._uses = 0
+        logger.info("Browser launched")
+
+    async def _stop_browser(self):
+        """
+        Closes the browser, ignoring errors from a browser that already crashed.
+        """
+        browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+            logger.debug("Browser closed successfully")
+        except Exception as e:
+            logger.warning(f"Error while closing browser: {e}")
+
+    async def warm_up(self):
+        """
+        Launches the browser ahead of the first scrape.
+        """
+        try:
+            async with self._lock:
+                if self._restart_reason() is not None:
+                    await self._stop_browser()
+                    await self._start()
+        except Exception as e:
+            logger.error(f"Failed to warm up browser: {e}", exc_info=True)
+
+    @asynccontextmanager
+    async def new_context(self):
+        """
+        Provides a fresh, isolated browser context for one scrape.
+
+        Yields:
+            playwright.async_api.BrowserContext: The browser context.
+        """
+        async with self._lock:
+            reason = self._restart_reason()
+            if reason is not None:
+                logger.info(f"Starting browser: {reason}")
+                await self._stop_browser()
+                await self._start()
+            self._uses += 1
+            self._active += 1
+            browser = self._browser
+
+        try:
+            context = await browser.new_context()
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                    logger.debug("Browser context closed successfully")
+                except Exception as e:
+                    logger.warning(f"Error while closing browser context: {e}")
+        finally:
+            self._active -= 1
+
+    async def close(self):
+        """
+        Closes the browser and stops the Playwright driver.
+        """
+        async with self._lock:
+            await self._stop_browser()
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    logger.warning(f"Error while stopping Playwright: {e}")
+                self._playwright = None
+
+
+# Process-wide browser shared by every scrape
+browser_manager = BrowserManager(
+    Config.SCRAPPER_BROWSER_MAX_USES, Config.SCRAPPER_BROWSER_MAX_MEMORY_MB
+)
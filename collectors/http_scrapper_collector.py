@@ -0,0 +1,57 @@
+"""
+Browserless fast path for collecting exchange rates.
+
+This module downloads the exchange rate page with aiohttp and parses the rate
+table while the response streams in, without starting a browser.
+
+Functions:
+    fetch_exchange_rates_http: Downloads and parses the rate table over plain HTTP.
+"""
+
+import codecs
+import aiohttp
+from collectors.sharaf_parser import RateTableParser, parse_exchange_rows
+from utils.config import Config
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Size of the chunks fed to the parser while the page downloads
+CHUNK_SIZE = 64 * 1024
+
+
+async def fetch_exchange_rates_http(url=None):
+    """
+    Downloads the exchange rate page and parses the rate table as it streams in.
+
+    Args:
+        url (str, optional): The page URL. Defaults to Config.SCRAPPER_URL.
+
+    Returns:
+        dict: Currency code -> (buy AED rate, sell AED rate), or None if the request fails.
+    """
+    url = url or Config.SCRAPPER_URL
+    headers = {"User-Agent": Config.SCRAPPER_USER_AGENT}
+    timeout = aiohttp.ClientTimeout(total=Config.SCRAPPER_HTTP_TIMEOUT)
+
+    try:
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                # get_encoding() would need the whole body to guess a charset
+                # the server did not declare
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                    errors="replace"
+                )
+
+                parser = RateTableParser()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    parser.feed(decoder.decode(chunk))
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+    except (aiohttp.ClientError, TimeoutError, LookupError) as e:
+        logger.warning(f"HTTP fast path request failed for {url}: {e}")
+        return None
+
+    return parse_exchange_rows(parser.rows)
@@ -2,13 +2,26 @@
 Module for collecting currency data via web scraping.
 
 This module scrapes exchange rates from a configured website and returns the data.
+The page is first fetched over plain HTTP; the browser is used only when that
+fast path does not yield a valid rate table. Browser pages are opened in fresh
+contexts of the shared, long-lived browser that abort requests for
+non-essential resources and third-party hosts, and the rate table is extracted
+with a single in-page evaluation.
 
 Functions:
     collect_exchange_data: Scrapes exchange rates and returns the data.
 """
 
+import time
 from datetime import UTC, datetime
-from playwright.async_api import async_playwright
+from urllib.parse import urlsplit
+from collectors.browser_manager import browser_manager
+from collectors.http_scrapper_collector import fetch_exchange_rates_http
+from collectors.sharaf_parser import (
+    EXTRACT_ROWS_JS,
+    is_valid_rate_table,
+    parse_exchange_rows,
+)
 from utils.config import Config
 from utils.logger import (
     get_logger,
@@ -17,87 +30,159 @@ from utils.logger import (
 # Create logger for this module
 logger = get_logger(__name__)
 
+# Resource types the rate table does not need
+BLOCKED_RESOURCE_TYPES = frozenset(Config.SCRAPPER_BLOCKED_RESOURCE_TYPES)
+
+# Hosts (and their subdomains) the page may load resources from; by default the
+# site of SCRAPPER_URL itself
+ALLOWED_HOSTS = tuple(
+    Config.SCRAPPER_ALLOWED_HOSTS
+    or [urlsplit(Config.SCRAPPER_URL).hostname.removeprefix("www.")]
+)
+
+
+def is_request_allowed(resource_type, url):
+    """
+    Decides whether the scraper page may load a resource.
+
+    Args:
+        resource_type (str): The Playwright resource type (e.g. "image", "script").
+        url (str): The resource URL.
+
+    Returns:
+        bool: True if the request should continue, False if it should be aborted.
+    """
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return False
+    host = urlsplit(url).hostname
+    if host is None:
+        # data: and blob: URLs never leave the browser
+        return True
+    return any(
+        host == allowed or host.endswith(f".{allowed}") for allowed in ALLOWED_HOSTS
+    )
+
 
 async def collect_exchange_data():
     """
     Scrapes exchange rates from a configured website.
 
+    Depending on Config.SCRAPPER_MODE, the rates are collected over plain HTTP
+    ("http"), with the browser ("browser"), or over HTTP with the browser as a
+    fallback when the fast path fails validation ("auto", the default).
+
     Returns:
         list: A list of tuples containing currency data for database insertion.
         Returns None if an error occurs.
     """
-    try:
-        async with async_playwright() as p:
-            # Launch browser with explicit browser close handling and 10-minute timeout
-            browser = await p.chromium.launch(
-                headless=True,
-                timeout=600000,  # 10 minutes in milliseconds
+    mode = Config.SCRAPPER_MODE
+    rates = None
+
+    if mode in ("auto", "http"):
+        try:
+            rates = await fetch_exchange_rates_http()
+        except Exception as e:
+            # Any failure of the fast path leaves the browser to collect the rates
+            logger.error(f"HTTP fast path failed: {e}", exc_info=True)
+            rates = None
+        if rates is not None and not is_valid_rate_table(rates):
+            logger.warning(
+                f"HTTP fast path returned an incomplete table ({len(rates)} currencies)"
             )
-            page = None
-            try:
-                # Set page timeout to 10 minutes as well
-                page = await browser.new_page()
-                page.set_default_timeout(600000)  # 10 minutes in milliseconds
-
-                # Navigate to the configured URL and wait for the page to load
-                await page.goto(Config.SCRAPPER_URL, wait_until="networkidle")
-
-                # Wait for the currency data to be available on the page
-                await page.wait_for_selector('ul:has(> li:has(div[class*="fc_buy"]))')
-                currency_elements = await page.query_selector_all("ul > li")
-
-                rates = {}
-                for element in currency_elements:
-                    # Extract currency code and rates
-                    currency_div = await element.query_selector(
-                        "div[class*='currency']"
-                    )
-                    if not currency_div:
-                        continue
-
-                    currency_text = await currency_div.text_content()
-                    if not currency_text or " - " not in currency_text:
-                        continue
-
-                    currency_code = currency_text.split(" - ")[0].strip()[-3:]
-
-                    buy_element = await element.query_selector("div[class*='fc_buy']")
-                    sell_element = await element.query_selector("div[class*='fc_cell']")
-
-                    if buy_element and sell_element:
-                        buy_text = await buy_element.text_content()
-                        sell_text = await sell_element.text_content()
-
-                        if buy_text and sell_text:
-                            buy = float(buy_text.strip())
-                            sell = float(sell_text.strip())
-
-                            if buy > 0 and sell > 0:
-                                rates[currency_code] = (1 / buy, 1 / sell)
-
-                # Sort and log the collected rates
-                sorted_rates = dict(sorted(rates.items()))
-                logger.info(f"Collected {len(sorted_rates)} currencies")
-
-                # Prepare data for database insertion
-                today = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
-                db_data = [
-                    (currency_code, buy, sell, today)
-                    for currency_code, (buy, sell) in sorted_rates.items()
-                ]
-
-                logger.debug(f"Collected rates: {rates}")
-                logger.debug(f"Database data prepared: {db_data}")
-
-                return db_data
-            finally:
-                # Ensure browser and contexts are closed properly
-                if page:
-                    await page.close()
-                    logger.debug("Page closed successfully")
-                await browser.close()
-                logger.debug("Browser closed successfully")
+            rates = None
+
+    if rates is None and mode in ("auto", "browser"):
+        rates = await _collect_with_browser()
+
+    if rates is None:
+        return None
+
+    # Log the collected rates
+    logger.info(f"Collected {len(rates)} currencies")
+
+    # Prepare data for database insertion
+    today = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+    db_data = [
+        (currency_code, buy, sell, today)
+        for currency_code, (buy, sell) in rates.items()
+    ]
+
+    logger.debug("Collected rates: %s", rates)
+    logger.debug("Database data prepared: %s", db_data)
+
+    return db_data
+
+
+async def _collect_with_browser():
+    """
+    Scrapes exchange rates with the shared headless browser.
+
+    Returns:
+        dict: Currency code -> (buy AED rate, sell AED rate), or None if an error occurs.
+    """
+    timings = {}
+    blocked = 0
+
+    async def route_request(route):
+        nonlocal blocked
+        request = route.request
+        if is_request_allowed(request.resource_type, request.url):
+            await route.continue_()
+        else:
+            blocked += 1
+            await route.abort()
+
+    try:
+        phase_started = time.perf_counter()
+        async with browser_manager.new_context() as context:
+            await context.route("**/*", route_request)
+
+            # Set page timeout to 10 minutes
+            page = await context.new_page()
+            page.set_default_timeout(600000)  # 10 minutes in milliseconds
+            phase_started = _record_phase(timings, "launch", phase_started)
+
+            # Navigate with an early load state; the selector wait below is
+            # what tells us the table is ready
+            await page.goto(Config.SCRAPPER_URL, wait_until="domcontentloaded")
+            phase_started = _record_phase(timings, "navigate", phase_started)
+
+            # Wait for the currency data to be available on the page
+            await page.wait_for_selector('ul:has(> li:has(div[class*="fc_buy"]))')
+            phase_started = _record_phase(timings, "selector", phase_started)
+
+            # Extract the whole table in one in-page evaluation
+            rows = await page.eval_on_selector_all("ul > li", EXTRACT_ROWS_JS)
+            _record_phase(timings, "extract", phase_started)
+
+        logger.info(
+            "Scraped %d rows (%d requests blocked), timings: %s",
+            len(rows),
+            blocked,
+            ", ".join(f"{phase} {ms:.1f} ms" for phase, ms in timings.items()),
+        )
+        return parse_exchange_rows(rows)
     except Exception as e:
         # Log any errors that occur during data collection
-        logger.error(f"An error occurred during data collection: {e}", exc_info=True)
+        logger.error(
+            f"An error occurred during data collection after phases {timings}: {e}",
+            exc_info=True,
+        )
         return None
+
+
+def _record_phase(timings, phase, started):
+    """
+    Records the duration of a scrape phase.
+
+    Args:
+        timings (dict): Phase name -> duration in milliseconds, updated in place.
+        phase (str): The phase that has just finished.
+        started (float): perf_counter value at the start of the phase.
+
+    Returns:
+        float: perf_counter value at the end of the phase.
+    """
+    finished = time.perf_counter()
+    timings[phase] = (finished - started) * 1000
+    return finished
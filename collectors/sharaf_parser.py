@@ -0,0 +1,193 @@
+"""
+Parsing of the Sharaf Exchange rate table.
+
+This module turns the raw text of the rate table into validated rates. It does
+not depend on a browser, so it can be used for any extraction strategy and
+checked offline against saved pages.
+
+Attributes:
+    EXTRACT_ROWS_JS (str): In-page function returning the raw table rows.
+
+Classes:
+    RateTableParser: Streaming HTML parser that extracts the raw table rows.
+
+Functions:
+    parse_exchange_rows: Parses raw table rows into AED rates per currency.
+    parse_exchange_html: Parses the rate table out of page HTML.
+    is_valid_rate_table: Checks that parsed rates look like a complete table.
+"""
+
+from html.parser import HTMLParser
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Runs inside the page on all "ul > li" elements and returns every row as
+# [currency text, buy text, sell text] in a single protocol round trip
+EXTRACT_ROWS_JS = """
+rows => rows.map(row => {
+    const text = selector => {
+        const element = row.querySelector(selector);
+        return element ? element.textContent : null;
+    };
+    return [
+        text("div[class*='currency']"),
+        text("div[class*='fc_buy']"),
+        text("div[class*='fc_cell']"),
+    ];
+})
+"""
+
+
+# Class substrings of the row cells, in (currency, buy, sell) order. They match
+# the selectors used in the browser, div[class*='...'].
+CELL_CLASSES = ("currency", "fc_buy", "fc_cell")
+
+# Currencies that must be present for a scrape to be accepted
+REQUIRED_CURRENCIES = ("USD", "EUR")
+
+# Minimum number of currencies for a scrape to be accepted
+MIN_CURRENCIES = 5
+
+
+class RateTableParser(HTMLParser):
+    """
+    Streaming HTML parser that extracts the raw rate table rows.
+
+    For every <li>, the text of the first <div> whose class contains each of
+    CELL_CLASSES is collected, mirroring querySelector in the browser. The
+    document can be fed in chunks as it is downloaded.
+
+    Attributes:
+        rows (list): (currency text, buy text, sell text) for every finished <li>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        # Open <li> elements: [cell texts, active captures {cell index: div depth}]
+        self._open_rows = []
+        self._div_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "li":
+            self._open_rows.append([[None, None, None], {}])
+            return
+        if tag != "div":
+            return
+
+        self._div_depth += 1
+        classes = dict(attrs).get("class") or ""
+        for cells, captures in self._open_rows:
+            for index, cell_class in enumerate(CELL_CLASSES):
+                if cells[index] is None and cell_class in classes:
+                    cells[index] = ""
+                    captures[index] = self._div_depth
+
+    def handle_endtag(self, tag):
+        if tag == "li" and self._open_rows:
+            cells, _ = self._open_rows.pop()
+            self.rows.append(tuple(cells))
+            return
+        if tag != "div":
+            return
+
+        for _, captures in self._open_rows:
+            for index, depth in list(captures.items()):
+                if depth == self._div_depth:
+                    del captures[index]
+        self._div_depth = max(0, self._div_depth - 1)
+
+    def handle_data(self, data):
+        for cells, captures in self._open_rows:
+            for index in captures:
+                cells[index] += data
+
+
+def _parse_rate(text):
+    """
+    Parses a positive rate from its text.
+
+    Args:
+        text (str): The rate text.
+
+    Returns:
+        float: The rate, or None if the text is not a positive number.
+    """
+    try:
+        rate = float(text.strip().replace(",", ""))
+    except (AttributeError, ValueError):
+        return None
+    return rate if rate > 0 else None
+
+
+def parse_exchange_rows(rows):
+    """
+    Parses raw table rows into AED rates per currency.
+
+    The site quotes how much foreign currency one AED buys, so both rates are
+    inverted to get the AED price of one unit of the currency.
+
+    Args:
+        rows (iterable): (currency text, buy text, sell text) for every row.
+            Rows that are not currency rows have None in place of the texts.
+
+    Returns:
+        dict: Currency code -> (buy AED rate, sell AED rate), sorted by code.
+    """
+    # Keep only currency rows, e.g. "USD - US Dollar"
+    candidates = [
+        (currency_text.split(" - ")[0].strip()[-3:], buy_text, sell_text)
+        for currency_text, buy_text, sell_text in rows
+        if currency_text and " - " in currency_text and buy_text and sell_text
+    ]
+
+    parsed = [
+        (currency_code, _parse_rate(buy_text), _parse_rate(sell_text))
+        for currency_code, buy_text, sell_text in candidates
+    ]
+
+    rates = {
+        currency_code: (1 / buy, 1 / sell)
+        for currency_code, buy, sell in parsed
+        if buy and sell
+    }
+
+    skipped = len(candidates) - len(rates)
+    if skipped:
+        logger.debug("Skipped %d rows with invalid rates", skipped)
+
+    return dict(sorted(rates.items()))
+
+
+def parse_exchange_html(chunks):
+    """
+    Parses the rate table out of page HTML.
+
+    Args:
+        chunks (str or iterable of str): The page HTML, whole or in chunks.
+
+    Returns:
+        dict: Currency code -> (buy AED rate, sell AED rate), sorted by code.
+    """
+    parser = RateTableParser()
+    for chunk in [chunks] if isinstance(chunks, str) else chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parse_exchange_rows(parser.rows)
+
+
+def is_valid_rate_table(rates):
+    """
+    Checks that parsed rates look like a complete rate table.
+
+    Args:
+        rates (dict): Currency code -> (buy AED rate, sell AED rate).
+
+    Returns:
+        bool: True if the table has enough currencies, including the required ones.
+    """
+    return len(rates) >= MIN_CURRENCIES and all(
+        currency_code in rates for currency_code in REQUIRED_CURRENCIES
+    )
@@ -2,24 +2,80 @@
 Database package for the currency bot.
 
 This package contains database models and utilities for storing and retrieving currency data.
+
+The exported functions are imported from their submodules on first access,
+so importing one submodule such as database.pool does not load the others.
 """
 
-from utils.logger import get_logger
-from .db_helpers import update_rates, fetch_rates
-from .db_utils import (
-    update_api_rates,
-    update_scrapper_rates,
-    fetch_api_rates,
-    fetch_scrapper_rates,
-)
+import importlib
 
-logger = get_logger(__name__)
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "update_rates": ".db_helpers",
+    "fetch_rates": ".db_helpers",
+    "rates_cache": ".cache",
+    "db_pool": ".pool",
+    "update_api_rates": ".db_utils",
+    "update_scrapper_rates": ".db_utils",
+    "fetch_api_rates": ".db_utils",
+    "fetch_scrapper_rates": ".db_utils",
+    "fetch_api_rates_many": ".db_utils",
+    "fetch_scrapper_rates_many": ".db_utils",
+    "fetch_currency_rates": ".db_utils",
+    "fetch_currency_rates_many": ".db_utils",
+    "fetch_cross_rates": ".db_utils",
+    "fetch_rate_changes": ".db_utils",
+    "add_alert": ".alerts",
+    "delete_alert": ".alerts",
+    "fetch_chat_alerts": ".alerts",
+    "fetch_all_alerts": ".alerts",
+    "add_subscriber": ".subscriptions",
+    "delete_subscribers": ".subscriptions",
+    "fetch_subscribers_page": ".subscriptions",
+    "create_digest_run": ".subscriptions",
+    "fetch_digest_run": ".subscriptions",
+    "fetch_unfinished_digest_runs": ".subscriptions",
+    "update_digest_run": ".subscriptions",
+    "append_api_history": ".history",
+    "append_scrapper_history": ".history",
+    "fetch_history_summary": ".history",
+}
 
 __all__ = [
     "update_rates",
     "fetch_rates",
+    "rates_cache",
+    "db_pool",
     "update_api_rates",
     "update_scrapper_rates",
     "fetch_api_rates",
     "fetch_scrapper_rates",
+    "fetch_api_rates_many",
+    "fetch_scrapper_rates_many",
+    "fetch_currency_rates",
+    "fetch_currency_rates_many",
+    "fetch_cross_rates",
+    "fetch_rate_changes",
+    "add_alert",
+    "delete_alert",
+    "fetch_chat_alerts",
+    "fetch_all_alerts",
+    "add_subscriber",
+    "delete_subscribers",
+    "fetch_subscribers_page",
+    "create_digest_run",
+    "fetch_digest_run",
+    "fetch_unfinished_digest_runs",
+    "update_digest_run",
+    "append_api_history",
+    "append_scrapper_history",
+    "fetch_history_summary",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
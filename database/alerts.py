@@ -0,0 +1,104 @@
+"""
+Rate alert storage.
+
+This module persists the threshold alerts users set with the /alert command.
+
+Functions:
+    add_alert: Stores a new alert.
+    delete_alert: Deletes an alert of a chat.
+    fetch_chat_alerts: Fetches the alerts of one chat.
+    fetch_all_alerts: Fetches every stored alert.
+"""
+
+from datetime import UTC, datetime
+from database.db_helpers import fetch_query
+from database.pool import db_pool
+from utils.logger import get_logger
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Columns of an alert row, in the order returned by the fetch functions
+ALERT_COLUMNS = ["id", "chat_id", "currency_code", "metric", "direction", "threshold"]
+
+
+async def add_alert(chat_id, currency_code, metric, direction, threshold):
+    """
+    Stores a new alert.
+
+    Args:
+        chat_id (int): The chat to notify.
+        currency_code (str): The watched currency code.
+        metric (str): The watched rate column (e.g. "sell_aed").
+        direction (str): "below" or "above".
+        threshold (float): The rate that triggers the alert when crossed.
+
+    Returns:
+        tuple: The stored alert as (id, chat_id, currency_code, metric, direction, threshold).
+    """
+    async with db_pool.writer() as conn:
+        cursor = await conn.execute(
+            """
+            INSERT INTO alerts (chat_id, currency_code, metric, direction, threshold, date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                chat_id,
+                currency_code,
+                metric,
+                direction,
+                threshold,
+                datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
+            ),
+        )
+        alert_id = cursor.lastrowid
+        await cursor.close()
+
+    logger.info(f"Added alert {alert_id} for chat {chat_id}.")
+    return alert_id, chat_id, currency_code, metric, direction, threshold
+
+
+async def delete_alert(chat_id, alert_id):
+    """
+    Deletes an alert of a chat.
+
+    Args:
+        chat_id (int): The chat owning the alert.
+        alert_id (int): The alert to delete.
+
+    Returns:
+        bool: True if the alert existed and belonged to the chat.
+    """
+    async with db_pool.writer() as conn:
+        cursor = await conn.execute(
+            "DELETE FROM alerts WHERE id = ? AND chat_id = ?", (alert_id, chat_id)
+        )
+        deleted = cursor.rowcount > 0
+        await cursor.close()
+    return deleted
+
+
+async def fetch_chat_alerts(chat_id):
+    """
+    Fetches the alerts of one chat.
+
+    Args:
+        chat_id (int): The chat to fetch alerts for.
+
+    Returns:
+        list of tuples: Alert rows ordered by id.
+    """
+    return await fetch_query(
+        f"SELECT {', '.join(ALERT_COLUMNS)} FROM alerts WHERE chat_id = ? ORDER BY id",
+        (chat_id,),
+    )
+
+
+async def fetch_all_alerts():
+    """
+    Fetches every stored alert.
+
+    Returns:
+        list of tuples: All alert rows.
+    """
+    return await fetch_query(f"SELECT {', '.join(ALERT_COLUMNS)} FROM alerts")
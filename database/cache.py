@@ -0,0 +1,220 @@
+"""
+In-memory snapshot cache for currency rates.
+
+This module keeps a process-wide, versioned copy of the api_rates and
+sharaf_exchange_rates tables so that bot handlers can answer from memory
+instead of opening a database connection for every request. Every write to
+the rate tables adds entries to the rate_changes log, so the snapshot is
+checked against the id of the latest log entry and writes to other tables
+never cause a reload.
+
+Classes:
+    RatesSnapshot: An immutable view of both rate tables at one point in time.
+    RatesCache: Holds the current snapshot and reloads it when the database changes.
+
+Attributes:
+    rates_cache (RatesCache): The process-wide cache instance.
+"""
+
+import asyncio
+import time
+from database.db_helpers import fetch_all_rates, fetch_query
+from utils.config import Config
+from utils.cross_rates import CrossRates
+from utils.currency_index import CurrencyIndex
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Columns loaded into the snapshot, matching the rows returned by db_utils
+API_COLUMNS = ["currency_code", "usd_to_currency", "euro_to_currency"]
+SCRAPPER_COLUMNS = ["currency_code", "buy_aed", "sell_aed"]
+
+# Id of the latest rate change; it only grows when a rate table is written
+SIGNATURE_QUERY = "SELECT MAX(id) FROM rate_changes"
+
+# Snapshot lookups by outcome: served without a check, checked and still
+# current, or reloaded from the database
+LOOKUPS = metrics.counter(
+    "rates_cache_lookups_total", "Rates snapshot lookups by outcome.", "result"
+)
+LOOKUP_HIT = LOOKUPS.labels("hit")
+LOOKUP_VALIDATED = LOOKUPS.labels("validated")
+LOOKUP_RELOAD = LOOKUPS.labels("reload")
+
+
+class RatesSnapshot:
+    """
+    An immutable view of both rate tables.
+
+    Attributes:
+        version (int): Monotonically increasing snapshot number.
+        api_rates (dict): Currency code -> (currency_code, usd_to_currency, euro_to_currency).
+        scrapper_rates (dict): Currency code -> (currency_code, buy_aed, sell_aed).
+        signature (int): Id of the latest rate change when the snapshot was loaded.
+    """
+
+    __slots__ = (
+        "version",
+        "api_rates",
+        "scrapper_rates",
+        "signature",
+        "_cross_rates",
+        "_currency_index",
+    )
+
+    def __init__(self, version, api_rates, scrapper_rates, signature):
+        self.version = version
+        self.api_rates = api_rates
+        self.scrapper_rates = scrapper_rates
+        self.signature = signature
+        self._cross_rates = None
+        self._currency_index = None
+
+    @property
+    def cross_rates(self):
+        """CrossRates: Cross-rate engine over the official USD rates, built on first use."""
+        if self._cross_rates is None:
+            self._cross_rates = CrossRates(
+                {code: row[1] for code, row in self.api_rates.items()}
+            )
+        return self._cross_rates
+
+    @property
+    def currency_index(self):
+        """CurrencyIndex: Prefix index over every currency in either table, built on first use."""
+        if self._currency_index is None:
+            self._currency_index = CurrencyIndex(
+                self.api_rates.keys() | self.scrapper_rates.keys()
+            )
+        return self._currency_index
+
+
+class RatesCache:
+    """
+    Process-wide cache of the rate tables.
+
+    The snapshot is replaced as a whole, so readers always see a consistent
+    pair of tables. Changes made by other processes (e.g. a standalone
+    daily_job run) are detected through the rate change log.
+    """
+
+    def __init__(self, check_interval):
+        """
+        Args:
+            check_interval (float): Minimum number of seconds between change log checks.
+        """
+        self._check_interval = check_interval
+        self._snapshot = None
+        self._version = 0
+        self._next_check = 0.0
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    @property
+    def snapshot(self):
+        """RatesSnapshot or None: The current snapshot, without any freshness check."""
+        return self._snapshot
+
+    def add_listener(self, listener):
+        """
+        Registers a function called with every new snapshot right after it is swapped in.
+
+        Args:
+            listener (callable): Function taking the new RatesSnapshot.
+        """
+        self._listeners.append(listener)
+
+    async def _db_signature(self):
+        """
+        Returns the id of the latest rate change, a single index lookup.
+
+        Returns:
+            int: The id, or None if no rate was ever written.
+        """
+        rows = await fetch_query(SIGNATURE_QUERY)
+        return rows[0][0]
+
+    async def reload(self):
+        """
+        Loads both rate tables and atomically swaps in a new snapshot.
+
+        If the rates are the same as in the current snapshot, the snapshot is
+        kept, so its version and everything cached for it stay valid.
+
+        Returns:
+            RatesSnapshot: The new snapshot, or the previous one if loading failed.
+        """
+        async with self._lock:
+            # Take the signature before reading, so a write racing with the
+            # load is picked up by the next freshness check.
+            try:
+                signature = await self._db_signature()
+                api_rows = await fetch_all_rates("api_rates", API_COLUMNS)
+                scrapper_rows = await fetch_all_rates(
+                    "sharaf_exchange_rates", SCRAPPER_COLUMNS
+                )
+            except Exception as e:
+                logger.error(f"Failed to load rates snapshot: {e}", exc_info=True)
+                return self._snapshot
+
+            api_rates = {row[0]: tuple(row) for row in api_rows}
+            scrapper_rates = {row[0]: tuple(row) for row in scrapper_rows}
+            self._next_check = time.monotonic() + self._check_interval
+            current = self._snapshot
+            if (
+                current is not None
+                and current.api_rates == api_rates
+                and current.scrapper_rates == scrapper_rates
+            ):
+                current.signature = signature
+                logger.debug("Rates unchanged, keeping snapshot v%d", current.version)
+                return current
+
+            self._version += 1
+            self._snapshot = RatesSnapshot(
+                self._version, api_rates, scrapper_rates, signature
+            )
+            for listener in self._listeners:
+                try:
+                    listener(self._snapshot)
+                except Exception as e:
+                    logger.error(f"Rates snapshot listener failed: {e}", exc_info=True)
+            logger.info(
+                f"Loaded rates snapshot v{self._version}: "
+                f"{len(api_rows)} API rates, {len(scrapper_rows)} scrapper rates."
+            )
+            return self._snapshot
+
+    async def get_snapshot(self):
+        """
+        Returns the current snapshot, reloading it if the database has changed.
+
+        Returns:
+            RatesSnapshot: The current snapshot, or None if it could not be loaded.
+        """
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now < self._next_check:
+            LOOKUP_HIT.inc()
+            return snapshot
+
+        self._next_check = now + self._check_interval
+        if snapshot is not None:
+            try:
+                signature = await self._db_signature()
+            except Exception as e:
+                logger.error(f"Failed to check the rates snapshot: {e}", exc_info=True)
+                return snapshot
+        if snapshot is None or snapshot.signature != signature:
+            logger.debug("Rates snapshot is stale, reloading")
+            LOOKUP_RELOAD.inc()
+            return await self.reload()
+        LOOKUP_VALIDATED.inc()
+        return snapshot
+
+
+# Process-wide cache instance shared by the bot handlers and the daily job
+rates_cache = RatesCache(Config.RATES_CACHE_CHECK_INTERVAL)
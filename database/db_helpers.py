@@ -3,23 +3,32 @@
 Database helper functions module.
 
 This module provides reusable database operations such as updating and fetching data.
+All operations run on the long-lived connections of the database pool.
 
 Functions:
     update_rates: Inserts or updates rates in a specified table.
+    update_changed_rates: Writes only the rates that changed and logs each change.
     fetch_rates: Fetches data from a table based on a condition.
+    fetch_all_rates: Fetches all rows of a table.
+    fetch_rates_many: Fetches the rows matching any of several values in one query.
+    fetch_query: Runs an arbitrary read query and returns all rows.
 """
 
-import aiosqlite
-from utils.config import Config
+import math
+from database.pool import db_pool
 from utils.logger import get_logger
-
-# Path to the SQLite database file
-DB_PATH = Config.DB_PATH
+from utils.metrics import metrics
 
 # Initialize logger for this module
 logger = get_logger(__name__)
 
+# Latency of every helper call, labelled by helper name
+DB_LATENCY = metrics.histogram(
+    "db_operation_seconds", "Duration of database helper calls.", "operation"
+)
+
 
+@DB_LATENCY.labels("update_rates").time()
 async def update_rates(table_name, columns, data):
     """
     Inserts or updates rates in a specified table using the ON CONFLICT clause.
@@ -30,7 +39,7 @@ async def update_rates(table_name, columns, data):
         data (list of tuples): The data to be inserted or updated.
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as conn:
+        async with db_pool.writer() as conn:
             # Prepare placeholders and update clause for the SQL query
             placeholders = ", ".join(["?" for _ in columns])
             update_clause = ", ".join(
@@ -47,7 +56,6 @@ async def update_rates(table_name, columns, data):
                 """,
                 data,
             )
-            await conn.commit()
 
         logger.info(f"Updated {table_name} with {len(data)} entries.")
     except Exception as e:
@@ -55,6 +63,99 @@ async def update_rates(table_name, columns, data):
         logger.error(f"Failed to update rates in {table_name}: {e}", exc_info=True)
 
 
+def _value_changed(old, new, tolerance):
+    """
+    Checks whether a rate changed beyond a relative tolerance.
+
+    Args:
+        old (float): The stored value, or None.
+        new (float): The new value, or None.
+        tolerance (float): The relative tolerance.
+
+    Returns:
+        bool: True if the value changed.
+    """
+    if old is None or new is None:
+        return old is not new
+    return not math.isclose(old, new, rel_tol=tolerance, abs_tol=0.0)
+
+
+@DB_LATENCY.labels("update_changed_rates").time()
+async def update_changed_rates(table_name, columns, data, tolerance):
+    """
+    Writes only the rates that changed beyond a tolerance and logs each change.
+
+    The new batch is compared with the stored rows inside a single write
+    transaction. Changed and new rows are upserted, and every changed value is
+    recorded in the rate_changes table. Unchanged rows are not touched.
+
+    Args:
+        table_name (str): The name of the database table.
+        columns (list): Column names: the key, the rate columns, and the date column last.
+        data (list of tuples): The new rows, in column order.
+        tolerance (float): Relative tolerance below which a value is considered unchanged.
+
+    Returns:
+        list of tuples: (currency code, metric, old value, new value) for every
+        changed value, or None if the update failed.
+    """
+    key, rate_columns, date_column = columns[0], columns[1:-1], columns[-1]
+    try:
+        async with db_pool.writer() as conn:
+            async with conn.execute(
+                f"SELECT {key}, {', '.join(rate_columns)} FROM {table_name}"
+            ) as cursor:
+                stored = {row[0]: row[1:] for row in await cursor.fetchall()}
+
+            changed_rows = []
+            changes = []
+            log_rows = []
+            for row in data:
+                old_values = stored.get(row[0], (None,) * len(rate_columns))
+                row_changes = [
+                    (row[0], metric, old, new)
+                    for metric, old, new in zip(rate_columns, old_values, row[1:-1])
+                    if _value_changed(old, new, tolerance)
+                ]
+                if row_changes or row[0] not in stored:
+                    changed_rows.append(row)
+                    changes.extend(row_changes)
+                    log_rows.extend((*change, row[-1]) for change in row_changes)
+
+            if changed_rows:
+                placeholders = ", ".join(["?" for _ in columns])
+                update_clause = ", ".join(
+                    [f"{col} = excluded.{col}" for col in columns[1:]]
+                )
+                await conn.executemany(
+                    f"""
+                    INSERT INTO {table_name} ({", ".join(columns)})
+                    VALUES ({placeholders})
+                    ON CONFLICT({key})
+                    DO UPDATE SET {update_clause}
+                    """,
+                    changed_rows,
+                )
+                await conn.executemany(
+                    f"""
+                    INSERT INTO rate_changes
+                        (currency_code, metric, old_value, new_value, {date_column})
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    log_rows,
+                )
+
+        logger.info(
+            f"Updated {table_name}: {len(changed_rows)} of {len(data)} entries changed."
+        )
+        return changes
+    except Exception as e:
+        # Log any errors that occur during the update operation
+        logger.error(f"Failed to update rates in {table_name}: {e}", exc_info=True)
+        return None
+
+
+@DB_LATENCY.labels("fetch_rates").time()
 async def fetch_rates(table_name, columns, condition_column, condition_value):
     """
     Fetches data from a table based on a condition.
@@ -68,7 +169,7 @@ async def fetch_rates(table_name, columns, condition_column, condition_value):
     Returns:
         tuple: The fetched row from the database, or None if no match is found.
     """
-    async with aiosqlite.connect(DB_PATH) as conn:
+    async with db_pool.reader() as conn:
         # Prepare the SQL query to fetch data
         query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {condition_column} = ?"
 
@@ -81,3 +182,72 @@ async def fetch_rates(table_name, columns, condition_column, condition_value):
             )
 
             return result
+
+
+@DB_LATENCY.labels("fetch_all_rates").time()
+async def fetch_all_rates(table_name, columns):
+    """
+    Fetches all rows of a table.
+
+    Args:
+        table_name (str): The name of the database table.
+        columns (list): A list of column names to fetch.
+
+    Returns:
+        list of tuples: All rows of the table.
+    """
+    async with db_pool.reader() as conn:
+        query = f"SELECT {', '.join(columns)} FROM {table_name}"
+
+        async with conn.execute(query) as cursor:
+            rows = await cursor.fetchall()
+
+            logger.debug("Fetched %d rows from %s", len(rows), table_name)
+
+            return rows
+
+
+@DB_LATENCY.labels("fetch_rates_many").time()
+async def fetch_rates_many(table_name, columns, condition_column, condition_values):
+    """
+    Fetches the rows matching any of several values with a single IN (...) query.
+
+    Args:
+        table_name (str): The name of the database table.
+        columns (list): A list of column names to fetch.
+        condition_column (str): The column name for the condition.
+        condition_values (list): The values to match in the condition column.
+
+    Returns:
+        list of tuples: The fetched rows, in no particular order.
+    """
+    if not condition_values:
+        return []
+
+    placeholders = ", ".join(["?" for _ in condition_values])
+    query = (
+        f"SELECT {', '.join(columns)} FROM {table_name} "
+        f"WHERE {condition_column} IN ({placeholders})"
+    )
+    return await fetch_query(query, condition_values)
+
+
+@DB_LATENCY.labels("fetch_query").time()
+async def fetch_query(query, params=()):
+    """
+    Runs a read query on a pooled reader connection.
+
+    Args:
+        query (str): The SQL query to run.
+        params (sequence): The query parameters.
+
+    Returns:
+        list of tuples: All rows returned by the query.
+    """
+    async with db_pool.reader() as conn:
+        async with conn.execute(query, tuple(params)) as cursor:
+            rows = await cursor.fetchall()
+
+            logger.debug("Query returned %d rows", len(rows))
+
+            return rows
@@ -3,16 +3,37 @@ Database utilities module.
 
 This module provides asynchronous functions for interacting with the database,
 including updating and fetching currency rates from API and scrapper sources.
+Reads are served from the in-memory rates snapshot and fall back to a direct
+query only when the snapshot is unavailable.
 
 Functions:
     update_api_rates: Updates API rates in the database.
     update_scrapper_rates: Updates scrapper rates in the database.
     fetch_api_rates: Fetches API rates for a given currency code.
     fetch_scrapper_rates: Fetches scrapper rates for a given currency code.
+    fetch_api_rates_many: Fetches API rates for several currency codes at once.
+    fetch_scrapper_rates_many: Fetches scrapper rates for several currency codes at once.
+    fetch_currency_rates: Fetches API and scrapper rates for one currency code.
+    fetch_currency_rates_many: Fetches API and scrapper rates for several currency codes at once.
+    fetch_cross_rates: Returns the cross-rate engine over the official USD rates.
+    fetch_api_fetch_state: Fetches the stored response metadata of an API endpoint.
+    update_api_fetch_state: Stores the response metadata of API endpoints.
+    fetch_rate_changes: Fetches the change log of stored rates after a given entry.
+    fetch_job_run: Fetches the persisted state of a scheduled job.
+    update_job_run: Stores the state of scheduled jobs.
 """
 
-from database.db_helpers import fetch_rates, update_rates
+from database.cache import rates_cache
+from database.db_helpers import (
+    fetch_all_rates,
+    fetch_query,
+    fetch_rates,
+    fetch_rates_many,
+    update_changed_rates,
+    update_rates,
+)
 from utils.config import Config
+from utils.cross_rates import CrossRates
 from utils.logger import (
     get_logger,
 )  # Import directly from utils.logger instead of database
@@ -28,49 +49,67 @@ async def update_api_rates(data):
     """
     Updates API rates in the database asynchronously.
 
+    Only the rates that changed beyond Config.RATE_CHANGE_TOLERANCE are written.
+
     Args:
         data (list of tuples): Each tuple contains currency code, USD rate, Euro rate, and date.
+
+    Returns:
+        list of tuples: (currency code, metric, old value, new value) for every
+        changed value, or None if the update failed.
     """
     try:
-        logger.debug(f"Data received for update: {data}")
+        logger.debug("Data received for update: %s", data)
         filtered_data = data
 
         if filtered_data:
-            # Update the database with the provided API rates
-            await update_rates(
+            # Update the database with the API rates that changed
+            changes = await update_changed_rates(
                 "api_rates",
                 ["currency_code", "usd_to_currency", "euro_to_currency", "date"],
                 filtered_data,
+                Config.RATE_CHANGE_TOLERANCE,
             )
-            # No need to log here as it's already logged in update_rates
+            # No need to log here as it's already logged in update_changed_rates
+            return changes
         else:
             logger.info("No API rates were updated.")
         return []
     except Exception as e:
         # Log any errors that occur during the update operation
         logger.error(f"Error in update_api_rates: {e}", exc_info=True)
+        return None
 
 
 async def update_scrapper_rates(data):
     """
     Updates scrapper rates in the database asynchronously.
 
+    Only the rates that changed beyond Config.RATE_CHANGE_TOLERANCE are written.
+
     Args:
         data (list of tuples): Each tuple contains currency code, buy AED rate, sell AED rate, and date.
+
+    Returns:
+        list of tuples: (currency code, metric, old value, new value) for every
+        changed value, or None if the update failed.
     """
 
     if data:
         # Log only at debug level to avoid duplication with db_helpers
-        logger.debug(f"Updating scrapper rates: {len(data)} currencies to update.")
-        # Update the database with the provided scrapper rates
-        await update_rates(
+        logger.debug("Updating scrapper rates: %d currencies to update.", len(data))
+        # Update the database with the scrapper rates that changed
+        changes = await update_changed_rates(
             "sharaf_exchange_rates",
             ["currency_code", "buy_aed", "sell_aed", "date"],
             data,
+            Config.RATE_CHANGE_TOLERANCE,
         )
-        # No need to log here as it's already logged in update_rates
+        # No need to log here as it's already logged in update_changed_rates
+        return changes
     else:
         logger.info("No scrapper rates were updated.")
+    return []
 
 
 async def fetch_api_rates(currency_code):
@@ -83,6 +122,10 @@ async def fetch_api_rates(currency_code):
     Returns:
         tuple: A tuple containing currency code, USD rate, and Euro rate, or None if no data is found.
     """
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        return snapshot.api_rates.get(currency_code)
+
     return await fetch_rates(
         "api_rates",
         ["currency_code", "usd_to_currency", "euro_to_currency"],
@@ -101,9 +144,221 @@ async def fetch_scrapper_rates(currency_code):
     Returns:
         tuple: A tuple containing currency code, buy AED rate, and sell AED rate, or None if no data is found.
     """
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        return snapshot.scrapper_rates.get(currency_code)
+
     return await fetch_rates(
         "sharaf_exchange_rates",
         ["currency_code", "buy_aed", "sell_aed"],
         "currency_code",
         currency_code,
     )
+
+
+async def fetch_api_rates_many(currency_codes):
+    """
+    Fetches API rates for several currency codes at once.
+
+    Args:
+        currency_codes (list): The currency codes to fetch rates for.
+
+    Returns:
+        dict: Currency code -> (currency code, USD rate, Euro rate) for every code found.
+    """
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        rows = (snapshot.api_rates.get(code) for code in currency_codes)
+    else:
+        rows = await fetch_rates_many(
+            "api_rates",
+            ["currency_code", "usd_to_currency", "euro_to_currency"],
+            "currency_code",
+            list(dict.fromkeys(currency_codes)),
+        )
+    return {row[0]: tuple(row) for row in rows if row}
+
+
+async def fetch_scrapper_rates_many(currency_codes):
+    """
+    Fetches scrapper rates for several currency codes at once.
+
+    Args:
+        currency_codes (list): The currency codes to fetch rates for.
+
+    Returns:
+        dict: Currency code -> (currency code, buy AED rate, sell AED rate) for every code found.
+    """
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        rows = (snapshot.scrapper_rates.get(code) for code in currency_codes)
+    else:
+        rows = await fetch_rates_many(
+            "sharaf_exchange_rates",
+            ["currency_code", "buy_aed", "sell_aed"],
+            "currency_code",
+            list(dict.fromkeys(currency_codes)),
+        )
+    return {row[0]: tuple(row) for row in rows if row}
+
+
+async def fetch_currency_rates(currency_code):
+    """
+    Fetches API and scrapper rates for one currency code.
+
+    Args:
+        currency_code (str): The currency code to fetch rates for.
+
+    Returns:
+        tuple: (API rates tuple or None, scrapper rates tuple or None).
+    """
+    rates = await fetch_currency_rates_many([currency_code])
+    return rates[currency_code]
+
+
+async def fetch_currency_rates_many(currency_codes):
+    """
+    Fetches API and scrapper rates for several currency codes in one round trip.
+
+    Without a snapshot, both tables are read with a single joined query.
+
+    Args:
+        currency_codes (list): The currency codes to fetch rates for.
+
+    Returns:
+        dict: Currency code -> (API rates tuple or None, scrapper rates tuple or None)
+        for every requested code, in request order.
+    """
+    codes = list(dict.fromkeys(currency_codes))
+    if not codes:
+        return {}
+
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        return {
+            code: (snapshot.api_rates.get(code), snapshot.scrapper_rates.get(code))
+            for code in codes
+        }
+
+    values = ", ".join(["(?)" for _ in codes])
+    rows = await fetch_query(
+        f"""
+        WITH requested(currency_code) AS (VALUES {values})
+        SELECT r.currency_code,
+               a.currency_code, a.usd_to_currency, a.euro_to_currency,
+               s.currency_code, s.buy_aed, s.sell_aed
+        FROM requested AS r
+        LEFT JOIN api_rates AS a ON a.currency_code = r.currency_code
+        LEFT JOIN sharaf_exchange_rates AS s ON s.currency_code = r.currency_code
+        """,
+        codes,
+    )
+
+    found = {
+        row[0]: (
+            (row[1], row[2], row[3]) if row[1] is not None else None,
+            (row[4], row[5], row[6]) if row[4] is not None else None,
+        )
+        for row in rows
+    }
+    return {code: found.get(code, (None, None)) for code in codes}
+
+
+async def fetch_cross_rates():
+    """
+    Returns the cross-rate engine over the official USD rates.
+
+    Returns:
+        CrossRates: The engine for the current snapshot, or one built from a
+        direct query when the snapshot is unavailable.
+    """
+    snapshot = await rates_cache.get_snapshot()
+    if snapshot is not None:
+        return snapshot.cross_rates
+
+    rows = await fetch_all_rates("api_rates", ["currency_code", "usd_to_currency"])
+    return CrossRates(dict(rows))
+
+
+async def fetch_api_fetch_state(url):
+    """
+    Fetches the stored response metadata of an API endpoint.
+
+    Args:
+        url (str): The API endpoint URL.
+
+    Returns:
+        tuple: (url, ETag, Last-Modified, next update unix time, date),
+        or None if the endpoint has not been fetched yet.
+    """
+    return await fetch_rates(
+        "api_fetch_state",
+        ["url", "etag", "last_modified", "next_update_unix", "date"],
+        "url",
+        url,
+    )
+
+
+async def update_api_fetch_state(data):
+    """
+    Stores the response metadata of API endpoints.
+
+    Args:
+        data (list of tuples): Each tuple contains URL, ETag, Last-Modified,
+            next update unix time, and date.
+    """
+    if data:
+        await update_rates(
+            "api_fetch_state",
+            ["url", "etag", "last_modified", "next_update_unix", "date"],
+            data,
+        )
+
+
+async def fetch_rate_changes(after_id=0, limit=1000):
+    """
+    Fetches the change log of stored rates after a given entry.
+
+    Consumers keep the id of the last entry they processed and pass it back to
+    receive only what changed since then.
+
+    Args:
+        after_id (int): Return entries with a greater id.
+        limit (int): Maximum number of entries to return.
+
+    Returns:
+        list of tuples: (id, currency code, metric, old value, new value, date), oldest first.
+    """
+    return await fetch_query(
+        """
+        SELECT id, currency_code, metric, old_value, new_value, date
+        FROM rate_changes
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (after_id, limit),
+    )
+
+
+async def fetch_job_run(name):
+    """
+    Fetches the persisted state of a scheduled job.
+
+    Args:
+        name (str): The job name.
+
+    Returns:
+        tuple: (name, last run, next due time), or None if the job has no state yet.
+    """
+    return await fetch_rates("job_runs", ["name", "last_run", "next_due"], "name", name)
+
+
+async def update_job_run(data):
+    """
+    Stores the state of scheduled jobs.
+
+    Args:
+        data (list of tuples): Each tuple contains job name, last run, and next due time.
+    """
+    await update_rates("job_runs", ["name", "last_run", "next_due"], data)
@@ -0,0 +1,200 @@
+"""
+Rate history module.
+
+This module keeps an append-only time series of every collected rate and
+incrementally maintains daily, weekly and monthly min/max/avg rollups, so that
+range queries read a bounded number of rollup rows instead of raw samples.
+
+Functions:
+    append_api_history: Appends a batch of API rates to the history.
+    append_scrapper_history: Appends a batch of scrapper rates to the history.
+    fetch_history_summary: Summarizes a currency's rates over a period using rollups.
+"""
+
+from datetime import UTC, datetime, timedelta
+from database.db_helpers import fetch_query
+from database.pool import db_pool
+from utils.logger import get_logger
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Timestamp format used by the collectors
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Rollup tables and their bucket functions, from the finest to the coarsest
+ROLLUP_TABLES = {
+    "daily": "rate_rollup_daily",
+    "weekly": "rate_rollup_weekly",
+    "monthly": "rate_rollup_monthly",
+}
+
+# Longest period (in days) served by each rollup granularity
+DAILY_ROLLUP_MAX_DAYS = 92
+WEEKLY_ROLLUP_MAX_DAYS = 730
+
+# Longest period accepted by fetch_history_summary, in days
+MAX_HISTORY_DAYS = 3650
+
+
+def rollup_bucket(granularity, moment):
+    """
+    Returns the rollup bucket key for a point in time.
+
+    Args:
+        granularity (str): One of "daily", "weekly" or "monthly".
+        moment (datetime): The point in time.
+
+    Returns:
+        str: The bucket key (day, Monday of the ISO week, or month).
+    """
+    if granularity == "daily":
+        return moment.strftime("%Y-%m-%d")
+    if granularity == "weekly":
+        return (moment - timedelta(days=moment.weekday())).strftime("%Y-%m-%d")
+    return moment.strftime("%Y-%m")
+
+
+async def _append_history(history_table, metrics, data):
+    """
+    Appends a batch of rates to a history table and updates the rollups.
+
+    Rows already recorded for the same currency and timestamp are skipped,
+    so re-running a collection does not skew the rollups.
+
+    Args:
+        history_table (str): The name of the history table.
+        metrics (list): The names of the two rate columns.
+        data (list of tuples): Each tuple contains currency code, two rates, and timestamp.
+    """
+    if not data:
+        return
+
+    try:
+        async with db_pool.writer() as conn:
+            # Both key columns are constrained, so this is a set of primary
+            # key lookups rather than a scan of the whole history
+            codes = sorted({row[0] for row in data})
+            timestamps = sorted({row[3] for row in data})
+            async with conn.execute(
+                f"SELECT currency_code, timestamp FROM {history_table} "
+                f"WHERE currency_code IN ({', '.join(['?' for _ in codes])}) "
+                f"AND timestamp IN ({', '.join(['?' for _ in timestamps])})",
+                codes + timestamps,
+            ) as cursor:
+                existing = set(await cursor.fetchall())
+
+            new_rows = [row for row in data if (row[0], row[3]) not in existing]
+            if not new_rows:
+                logger.info(f"No new rows for {history_table}.")
+                return
+
+            await conn.executemany(
+                f"""
+                INSERT INTO {history_table} (currency_code, timestamp, {", ".join(metrics)})
+                VALUES (?, ?, ?, ?)
+                """,
+                [(code, ts, first, second) for code, first, second, ts in new_rows],
+            )
+
+            for granularity, table in ROLLUP_TABLES.items():
+                samples = []
+                for code, first, second, ts in new_rows:
+                    bucket = rollup_bucket(
+                        granularity, datetime.strptime(ts, TIMESTAMP_FORMAT)
+                    )
+                    for metric, value in zip(metrics, (first, second)):
+                        if value is not None:
+                            samples.append((code, metric, bucket, value, value, value))
+
+                await conn.executemany(
+                    f"""
+                    INSERT INTO {table}
+                        (currency_code, metric, bucket, samples, min_value, max_value, sum_value)
+                    VALUES (?, ?, ?, 1, ?, ?, ?)
+                    ON CONFLICT(currency_code, metric, bucket) DO UPDATE SET
+                        samples = samples + 1,
+                        min_value = MIN(min_value, excluded.min_value),
+                        max_value = MAX(max_value, excluded.max_value),
+                        sum_value = sum_value + excluded.sum_value
+                    """,
+                    samples,
+                )
+
+        logger.info(f"Appended {len(new_rows)} entries to {history_table}.")
+    except Exception as e:
+        # Log any errors so that history problems never break the collection
+        logger.error(f"Failed to append history to {history_table}: {e}", exc_info=True)
+
+
+async def append_api_history(data):
+    """
+    Appends a batch of API rates to the history.
+
+    Args:
+        data (list of tuples): Each tuple contains currency code, USD rate, Euro rate, and date.
+    """
+    await _append_history(
+        "api_rates_history", ["usd_to_currency", "euro_to_currency"], data
+    )
+
+
+async def append_scrapper_history(data):
+    """
+    Appends a batch of scrapper rates to the history.
+
+    Args:
+        data (list of tuples): Each tuple contains currency code, buy AED rate, sell AED rate, and date.
+    """
+    await _append_history(
+        "sharaf_exchange_rates_history", ["buy_aed", "sell_aed"], data
+    )
+
+
+async def fetch_history_summary(currency_code, days, now=None):
+    """
+    Summarizes a currency's rates over a period using only the rollup tables.
+
+    The granularity is chosen from the length of the period, so the number of
+    rollup rows read is bounded no matter how much history is stored.
+
+    Args:
+        currency_code (str): The currency code.
+        days (int): The length of the period in days.
+        now (datetime, optional): The end of the period. Defaults to the current UTC time.
+
+    Returns:
+        dict: Metric name -> (min, max, avg, samples) for every metric with data.
+    """
+    days = max(1, min(days, MAX_HISTORY_DAYS))
+    now = now or datetime.now(UTC)
+    start = now - timedelta(days=days - 1)
+
+    if days <= DAILY_ROLLUP_MAX_DAYS:
+        granularity = "daily"
+    elif days <= WEEKLY_ROLLUP_MAX_DAYS:
+        granularity = "weekly"
+    else:
+        granularity = "monthly"
+
+    rows = await fetch_query(
+        f"""
+        SELECT metric, MIN(min_value), MAX(max_value), SUM(sum_value), SUM(samples)
+        FROM {ROLLUP_TABLES[granularity]}
+        WHERE currency_code = ?
+          AND metric IN ('usd_to_currency', 'euro_to_currency', 'buy_aed', 'sell_aed')
+          AND bucket BETWEEN ? AND ?
+        GROUP BY metric
+        """,
+        (
+            currency_code,
+            rollup_bucket(granularity, start),
+            rollup_bucket(granularity, now),
+        ),
+    )
+
+    return {
+        metric: (min_value, max_value, sum_value / samples, samples)
+        for metric, min_value, max_value, sum_value, samples in rows
+        if samples
+    }
@@ -7,13 +7,9 @@ Functions:
     create_tables: Creates the required database tables if they do not already exist.
 """
 
-import aiosqlite
-from utils.config import Config
+from database.pool import db_pool
 from utils.logger import get_logger
 
-# Path to the SQLite database file
-DB_PATH = Config.DB_PATH
-
 # Initialize logger for this module
 logger = get_logger("DatabaseModels")
 
@@ -25,10 +21,20 @@ async def create_tables():
     Tables:
         - api_rates: Stores official currency rates.
         - sharaf_exchange_rates: Stores exchange rates from Sharaf Exchange.
+        - api_rates_history: Append-only history of official currency rates.
+        - sharaf_exchange_rates_history: Append-only history of Sharaf Exchange rates.
+        - rate_rollup_daily, rate_rollup_weekly, rate_rollup_monthly: Min/max/avg
+          rollups of both histories per currency, metric and period.
+        - api_fetch_state: Conditional request metadata of the rate API endpoints.
+        - job_runs: Last run and next due time of scheduled jobs.
+        - rate_changes: Change log of every stored rate value that changed.
+        - alerts: Rate threshold alerts set by users.
+        - subscribers: Chats subscribed to the daily digest.
+        - digest_runs: Rendered body and progress of each daily digest broadcast.
     """
     try:
         logger.info("Creating database tables if they do not exist.")
-        async with aiosqlite.connect(DB_PATH) as conn:
+        async with db_pool.writer() as conn:
             # Table for storing official API currency rates
             await conn.execute("""
             CREATE TABLE IF NOT EXISTS api_rates (
@@ -61,9 +67,119 @@ async def create_tables():
             CREATE INDEX IF NOT EXISTS idx_sharaf_currency_code ON sharaf_exchange_rates(currency_code);
             """)
 
-            # Commit the changes to the database
-            await conn.commit()
-            logger.info("Database tables created successfully.")
+            # Append-only history of official API currency rates
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_rates_history (
+                currency_code TEXT NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                usd_to_currency REAL,
+                euro_to_currency REAL,
+                PRIMARY KEY (currency_code, timestamp)
+            ) WITHOUT ROWID;
+            """)
+
+            # Append-only history of Sharaf Exchange currency rates
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS sharaf_exchange_rates_history (
+                currency_code TEXT NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                buy_aed REAL,
+                sell_aed REAL,
+                PRIMARY KEY (currency_code, timestamp)
+            ) WITHOUT ROWID;
+            """)
+
+            # Rollup tables with the same layout for each period
+            for table in (
+                "rate_rollup_daily",
+                "rate_rollup_weekly",
+                "rate_rollup_monthly",
+            ):
+                await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    currency_code TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    samples INTEGER NOT NULL,
+                    min_value REAL NOT NULL,
+                    max_value REAL NOT NULL,
+                    sum_value REAL NOT NULL,
+                    PRIMARY KEY (currency_code, metric, bucket)
+                ) WITHOUT ROWID;
+                """)
+
+            # Response metadata of the rate API, used for conditional requests
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_fetch_state (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                next_update_unix INTEGER,
+                date TIMESTAMP
+            );
+            """)
+
+            # State of scheduled jobs, used to catch up on missed runs
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                name TEXT PRIMARY KEY,
+                last_run TIMESTAMP,
+                next_due TIMESTAMP
+            );
+            """)
+
+            # Change log of stored rates, one row per changed value
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                currency_code TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                old_value REAL,
+                new_value REAL,
+                date TIMESTAMP
+            );
+            """)
+
+            # Rate threshold alerts set by users
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                currency_code TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                direction TEXT NOT NULL,
+                threshold REAL NOT NULL,
+                date TIMESTAMP
+            );
+            """)
+
+            # Index for listing the alerts of one chat
+            await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_alerts_chat_id ON alerts(chat_id);
+            """)
+
+            # Chats subscribed to the daily digest
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS subscribers (
+                chat_id INTEGER PRIMARY KEY,
+                date TIMESTAMP
+            );
+            """)
+
+            # Daily digest broadcasts and the last chat each one reached
+            await conn.execute("""
+            CREATE TABLE IF NOT EXISTS digest_runs (
+                digest_date TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                last_chat_id INTEGER,
+                sent INTEGER NOT NULL DEFAULT 0,
+                dropped INTEGER NOT NULL DEFAULT 0,
+                finished INTEGER NOT NULL DEFAULT 0,
+                date TIMESTAMP
+            );
+            """)
+
+        logger.info("Database tables created successfully.")
     except Exception as e:
         # Log any errors that occur during table creation
         logger.error(f"Error in create_tables: {e}", exc_info=True)
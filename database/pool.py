@@ -0,0 +1,185 @@
+"""
+Connection pool for the SQLite database.
+
+This module keeps long-lived aiosqlite connections instead of opening a new
+connection for every query: one dedicated writer connection and a fixed number
+of reader connections. The database runs in WAL mode, so readers are never
+blocked by the writer, including the cron job writing from another process.
+
+Classes:
+    ConnectionPool: Manages the writer and reader connections.
+
+Attributes:
+    db_pool (ConnectionPool): The process-wide pool instance.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import aiosqlite
+from utils.config import Config
+from utils.logger import get_logger
+
+# Initialize logger for this module
+logger = get_logger(__name__)
+
+# Pragmas applied to every connection in the pool
+CONNECTION_PRAGMAS = (
+    f"PRAGMA busy_timeout = {Config.DB_BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA cache_size = -{Config.DB_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {Config.DB_MMAP_SIZE}",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class ConnectionPool:
+    """
+    A pool of long-lived SQLite connections.
+
+    Connections are opened lazily on first use. Writes are serialized through
+    a single writer connection, reads are spread over the reader connections.
+    Every connection keeps a cache of prepared statements.
+    """
+
+    def __init__(self, db_path, readers):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file.
+            readers (int): Number of reader connections.
+        """
+        self._db_path = db_path
+        self._reader_count = max(1, readers)
+        self._writer = None
+        self._idle_readers = None
+        self._write_lock = None
+        self._open_lock = asyncio.Lock()
+
+    async def _connect(self, read_only):
+        """
+        Opens a single connection and applies the pool pragmas.
+
+        Args:
+            read_only (bool): Whether the connection is used only for reads.
+
+        Returns:
+            aiosqlite.Connection: The configured connection.
+        """
+        conn = await aiosqlite.connect(
+            self._db_path, cached_statements=Config.DB_STATEMENT_CACHE
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        if read_only:
+            await conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    async def open(self):
+        """
+        Opens the writer and reader connections if they are not open yet.
+        """
+        if self._writer is not None:
+            return
+
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+
+            writer = await self._connect(read_only=False)
+            # WAL mode is persistent, so setting it once on the writer is enough
+            async with writer.execute("PRAGMA journal_mode = WAL") as cursor:
+                journal_mode = (await cursor.fetchone())[0]
+
+            readers = [
+                await self._connect(read_only=True) for _ in range(self._reader_count)
+            ]
+            self._idle_readers = asyncio.Queue()
+            for conn in readers:
+                self._idle_readers.put_nowait(conn)
+            self._write_lock = asyncio.Lock()
+            self._writer = writer
+
+            logger.info(
+                f"Opened database pool: 1 writer, {len(readers)} readers, "
+                f"journal_mode={journal_mode}"
+            )
+
+    @asynccontextmanager
+    async def reader(self):
+        """
+        Borrows a reader connection for the duration of the block.
+
+        If the pool is closed while the connection is borrowed, the connection
+        is closed when the block exits instead of being returned.
+
+        Yields:
+            aiosqlite.Connection: A read-only connection.
+        """
+        while True:
+            await self.open()
+            idle_readers = self._idle_readers
+            conn = await idle_readers.get()
+            if conn is not None:
+                break
+            # The pool was closed while waiting: wake the next waiter and
+            # borrow from the reopened pool
+            idle_readers.put_nowait(None)
+        try:
+            yield conn
+        finally:
+            if idle_readers is self._idle_readers:
+                idle_readers.put_nowait(conn)
+            else:
+                await conn.close()
+
+    @asynccontextmanager
+    async def writer(self):
+        """
+        Holds the writer connection for the duration of the block.
+
+        The block runs as one transaction: it is committed on success and
+        rolled back if an exception is raised.
+
+        Yields:
+            aiosqlite.Connection: The writer connection.
+        """
+        await self.open()
+        writer, write_lock = self._writer, self._write_lock
+        async with write_lock:
+            try:
+                yield writer
+                await writer.commit()
+            except BaseException:
+                await writer.rollback()
+                raise
+
+    async def close(self):
+        """
+        Closes all connections. The pool reopens on the next use.
+
+        Readers that are borrowed at that moment are closed when they are
+        released.
+        """
+        async with self._open_lock:
+            if self._writer is None:
+                return
+
+            # Detach the connections first, so that new borrowers wait for
+            # the pool to reopen instead of using closing connections
+            writer, write_lock = self._writer, self._write_lock
+            idle_readers = self._idle_readers
+            self._writer = self._write_lock = self._idle_readers = None
+
+            # Borrowed readers are closed by their borrowers on release
+            while not idle_readers.empty():
+                await idle_readers.get_nowait().close()
+            # Wake the coroutines waiting for a reader of the closed pool
+            idle_readers.put_nowait(None)
+
+            # Let a running write transaction finish first
+            async with write_lock:
+                await writer.close()
+            logger.info("Closed database pool")
+
+
+# Process-wide pool shared by all database helpers
+db_pool = ConnectionPool(Config.DB_PATH, Config.DB_READERS)
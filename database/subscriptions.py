@@ -0,0 +1,178 @@
+"""
+Daily digest subscription storage.
+
+This module persists the chats subscribed to the daily digest and the progress
+of each digest broadcast, so that an interrupted broadcast resumes after the
+last chat it reached.
+
+Functions:
+    add_subscriber: Subscribes a chat to the daily digest.
+    delete_subscribers: Unsubscribes chats from the daily digest.
+    fetch_subscribers_page: Fetches the next page of subscribed chats.
+    create_digest_run: Stores a new digest broadcast with its rendered body.
+    fetch_digest_run: Fetches a digest broadcast by date.
+    fetch_unfinished_digest_runs: Fetches the digest broadcasts that have not finished.
+    update_digest_run: Stores the progress of a digest broadcast.
+"""
+
+from datetime import UTC, datetime
+from database.db_helpers import fetch_query
+from database.pool import db_pool
+
+# Columns of a digest run row, in the order returned by the fetch functions
+DIGEST_RUN_COLUMNS = [
+    "digest_date",
+    "body",
+    "last_chat_id",
+    "sent",
+    "dropped",
+    "finished",
+]
+
+# Below every chat id (SQLite integers are 64-bit), used to start from the first page
+MIN_CHAT_ID = -(2**63)
+
+
+def _now():
+    return datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def add_subscriber(chat_id):
+    """
+    Subscribes a chat to the daily digest.
+
+    Args:
+        chat_id (int): The chat to subscribe.
+
+    Returns:
+        bool: True if the chat was not subscribed before.
+    """
+    async with db_pool.writer() as conn:
+        cursor = await conn.execute(
+            "INSERT OR IGNORE INTO subscribers (chat_id, date) VALUES (?, ?)",
+            (chat_id, _now()),
+        )
+        added = cursor.rowcount > 0
+        await cursor.close()
+    return added
+
+
+async def delete_subscribers(chat_ids):
+    """
+    Unsubscribes chats from the daily digest.
+
+    Args:
+        chat_ids (list): The chats to unsubscribe.
+
+    Returns:
+        int: The number of chats that were subscribed.
+    """
+    if not chat_ids:
+        return 0
+    async with db_pool.writer() as conn:
+        cursor = await conn.execute(
+            f"DELETE FROM subscribers WHERE chat_id IN ({', '.join('?' for _ in chat_ids)})",
+            list(chat_ids),
+        )
+        deleted = cursor.rowcount
+        await cursor.close()
+    return deleted
+
+
+async def fetch_subscribers_page(after_chat_id, limit):
+    """
+    Fetches the next page of subscribed chats in chat id order.
+
+    Args:
+        after_chat_id (int): Return chats with a greater id, or all chats if None.
+        limit (int): Maximum number of chats to return.
+
+    Returns:
+        list: Chat ids in ascending order.
+    """
+    # A plain range condition, so every page is a seek on the primary key
+    if after_chat_id is None:
+        after_chat_id = MIN_CHAT_ID
+    rows = await fetch_query(
+        """
+        SELECT chat_id FROM subscribers
+        WHERE chat_id > ?
+        ORDER BY chat_id
+        LIMIT ?
+        """,
+        (after_chat_id, limit),
+    )
+    return [row[0] for row in rows]
+
+
+async def create_digest_run(digest_date, body):
+    """
+    Stores a new digest broadcast with its rendered body.
+
+    Args:
+        digest_date (str): The digest date (YYYY-MM-DD).
+        body (str): The digest text sent to every subscriber.
+
+    Returns:
+        bool: True if the run was created, False if one already exists for the date.
+    """
+    async with db_pool.writer() as conn:
+        cursor = await conn.execute(
+            "INSERT OR IGNORE INTO digest_runs (digest_date, body, date) VALUES (?, ?, ?)",
+            (digest_date, body, _now()),
+        )
+        created = cursor.rowcount > 0
+        await cursor.close()
+    return created
+
+
+async def fetch_digest_run(digest_date):
+    """
+    Fetches a digest broadcast by date.
+
+    Args:
+        digest_date (str): The digest date (YYYY-MM-DD).
+
+    Returns:
+        tuple: (digest_date, body, last_chat_id, sent, dropped, finished), or None.
+    """
+    rows = await fetch_query(
+        f"SELECT {', '.join(DIGEST_RUN_COLUMNS)} FROM digest_runs WHERE digest_date = ?",
+        (digest_date,),
+    )
+    return rows[0] if rows else None
+
+
+async def fetch_unfinished_digest_runs():
+    """
+    Fetches the digest broadcasts that have not finished, oldest first.
+
+    Returns:
+        list of tuples: Digest run rows.
+    """
+    return await fetch_query(
+        f"SELECT {', '.join(DIGEST_RUN_COLUMNS)} FROM digest_runs "
+        "WHERE finished = 0 ORDER BY digest_date"
+    )
+
+
+async def update_digest_run(digest_date, last_chat_id, sent, dropped, finished):
+    """
+    Stores the progress of a digest broadcast.
+
+    Args:
+        digest_date (str): The digest date (YYYY-MM-DD).
+        last_chat_id (int): The last chat the broadcast has reached.
+        sent (int): Number of digests delivered so far.
+        dropped (int): Number of chats unsubscribed because they blocked the bot.
+        finished (bool): Whether every subscriber has been reached.
+    """
+    async with db_pool.writer() as conn:
+        await conn.execute(
+            """
+            UPDATE digest_runs
+            SET last_chat_id = ?, sent = ?, dropped = ?, finished = ?, date = ?
+            WHERE digest_date = ?
+            """,
+            (last_chat_id, sent, dropped, int(finished), _now(), digest_date),
+        )
@@ -2,11 +2,27 @@
 Jobs package for scheduled tasks.
 
 This package contains modules for scheduled and recurring tasks in the currency bot.
+
+The exported names are imported from their submodules on first access, so
+importing one submodule such as jobs.refresh does not build the scheduler or
+load the collectors. daily_job and scheduler are not exported: their
+submodules have the same names and would shadow them once imported, so they
+are imported from jobs.daily_job and jobs.scheduler.
 """
 
-from utils.logger import get_logger
-from .daily_job import daily_job
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "refresh_coordinator": ".refresh",
+}
+
+__all__ = ["refresh_coordinator"]
 
-logger = get_logger(__name__)
 
-__all__ = ["daily_job"]
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,268 @@
+"""
+Threshold alert engine.
+
+This module keeps every alert threshold in a sorted in-memory index per
+currency, rate and direction. After a collection, the alerts crossed by each
+changed rate are found with two binary searches over the old -> new interval,
+so the cost depends on the number of triggered alerts rather than on the
+number of stored ones. Notifications are sent in the background through the
+rate-limited sender with bounded concurrency.
+
+Classes:
+    AlertIndex: Sorted thresholds per (currency, metric, direction).
+    AlertEngine: Keeps the index in sync with the database and sends notifications.
+
+Attributes:
+    alert_engine (AlertEngine): The process-wide alert engine.
+"""
+
+import asyncio
+from bisect import bisect_left, bisect_right
+from bot.sender import PRIORITY_LOW, sender
+from database.alerts import add_alert, delete_alert, fetch_all_alerts
+from utils.config import Config
+from utils.formatters import format_alert_notification
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Alert directions: fire when the rate falls below / rises above the threshold
+DIRECTION_BELOW = "below"
+DIRECTION_ABOVE = "above"
+
+
+class AlertIndex:
+    """
+    Sorted alert thresholds per (currency code, metric, direction).
+
+    Each key holds a sorted list of thresholds and a parallel list of alerts,
+    so that the alerts within a rate interval are one slice of the list.
+    """
+
+    def __init__(self, alerts=()):
+        """
+        Args:
+            alerts (iterable): Alert tuples (id, chat_id, currency_code, metric,
+                direction, threshold) to index.
+        """
+        self._thresholds = {}
+        self._alerts = {}
+        self._by_id = {}
+
+        grouped = {}
+        for alert in alerts:
+            grouped.setdefault(alert[2:5], []).append(alert)
+            self._by_id[alert[0]] = alert
+        for key, group in grouped.items():
+            group.sort(key=lambda alert: (alert[5], alert[0]))
+            self._thresholds[key] = [alert[5] for alert in group]
+            self._alerts[key] = group
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, alert):
+        """
+        Adds an alert to the index.
+
+        Args:
+            alert (tuple): The alert tuple.
+        """
+        key = alert[2:5]
+        thresholds = self._thresholds.setdefault(key, [])
+        position = bisect_right(thresholds, alert[5])
+        thresholds.insert(position, alert[5])
+        self._alerts.setdefault(key, []).insert(position, alert)
+        self._by_id[alert[0]] = alert
+
+    def remove(self, alert_id):
+        """
+        Removes an alert from the index.
+
+        Args:
+            alert_id (int): The alert to remove.
+        """
+        alert = self._by_id.pop(alert_id, None)
+        if alert is None:
+            return
+        key = alert[2:5]
+        thresholds = self._thresholds[key]
+        alerts = self._alerts[key]
+        position = bisect_left(thresholds, alert[5])
+        while alerts[position][0] != alert_id:
+            position += 1
+        del thresholds[position]
+        del alerts[position]
+        if not alerts:
+            del self._thresholds[key]
+            del self._alerts[key]
+
+    def triggered(self, currency_code, metric, old_value, new_value):
+        """
+        Returns the alerts crossed by a rate change.
+
+        A "below" alert fires when the rate falls from at least the threshold
+        to under it, an "above" alert when it rises from at most the threshold
+        to over it.
+
+        Args:
+            currency_code (str): The currency code of the changed rate.
+            metric (str): The changed rate column.
+            old_value (float): The previous rate.
+            new_value (float): The new rate.
+
+        Returns:
+            list: The triggered alert tuples.
+        """
+        if old_value is None or new_value is None or old_value == new_value:
+            return []
+
+        if new_value < old_value:
+            key = (currency_code, metric, DIRECTION_BELOW)
+            thresholds = self._thresholds.get(key)
+            if not thresholds:
+                return []
+            start = bisect_right(thresholds, new_value)
+            end = bisect_right(thresholds, old_value)
+        else:
+            key = (currency_code, metric, DIRECTION_ABOVE)
+            thresholds = self._thresholds.get(key)
+            if not thresholds:
+                return []
+            start = bisect_left(thresholds, old_value)
+            end = bisect_left(thresholds, new_value)
+        return self._alerts[key][start:end]
+
+
+class AlertEngine:
+    """
+    Keeps the alert index in sync with the database and sends notifications.
+    """
+
+    def __init__(self, concurrency):
+        """
+        Args:
+            concurrency (int): Maximum number of notifications sent at once.
+        """
+        self._concurrency = concurrency
+        self._index = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    async def load(self):
+        """
+        Builds the in-memory index from the database on first use.
+
+        Returns:
+            AlertIndex: The loaded index.
+        """
+        if self._index is None:
+            async with self._lock:
+                if self._index is None:
+                    self._index = AlertIndex(await fetch_all_alerts())
+                    logger.info(f"Loaded {len(self._index)} alerts.")
+        return self._index
+
+    async def add(self, chat_id, currency_code, metric, direction, threshold):
+        """
+        Stores a new alert and adds it to the index.
+
+        Args:
+            chat_id (int): The chat to notify.
+            currency_code (str): The watched currency code.
+            metric (str): The watched rate column.
+            direction (str): DIRECTION_BELOW or DIRECTION_ABOVE.
+            threshold (float): The rate that triggers the alert when crossed.
+
+        Returns:
+            tuple: The stored alert.
+        """
+        index = await self.load()
+        alert = await add_alert(chat_id, currency_code, metric, direction, threshold)
+        index.add(alert)
+        return alert
+
+    async def remove(self, chat_id, alert_id):
+        """
+        Deletes an alert of a chat and removes it from the index.
+
+        Args:
+            chat_id (int): The chat owning the alert.
+            alert_id (int): The alert to delete.
+
+        Returns:
+            bool: True if the alert existed and belonged to the chat.
+        """
+        index = await self.load()
+        deleted = await delete_alert(chat_id, alert_id)
+        if deleted:
+            index.remove(alert_id)
+        return deleted
+
+    def dispatch(self, changes):
+        """
+        Evaluates rate changes and notifies the triggered alerts in the background.
+
+        The caller does not wait for the notifications to be sent.
+
+        Args:
+            changes (list): (currency code, metric, old value, new value) tuples
+                as returned by update_api_rates and update_scrapper_rates.
+
+        Returns:
+            asyncio.Task: The notification task, or None if there were no changes.
+        """
+        if not changes:
+            return None
+        task = asyncio.create_task(self._notify(changes))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _notify(self, changes):
+        """
+        Finds the triggered alerts and sends one notification per alert.
+
+        Args:
+            changes (list): (currency code, metric, old value, new value) tuples.
+        """
+        try:
+            index = await self.load()
+            triggered = [
+                (alert, old_value, new_value)
+                for code, metric, old_value, new_value in changes
+                for alert in index.triggered(code, metric, old_value, new_value)
+            ]
+        except Exception as e:
+            logger.error(f"Failed to evaluate alerts: {e}", exc_info=True)
+            return
+        if not triggered:
+            return
+
+        logger.info(f"Sending {len(triggered)} alert notifications.")
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def send(alert, old_value, new_value):
+            async with semaphore:
+                try:
+                    await sender.send_message(
+                        alert[1],
+                        format_alert_notification(alert, old_value, new_value),
+                        priority=PRIORITY_LOW,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to send alert {alert[0]}: {e}")
+
+        await asyncio.gather(*(send(*item) for item in triggered))
+
+    async def close(self):
+        """
+        Waits for the notifications that are still being sent.
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# Process-wide alert engine shared by the bot handlers and the daily job
+alert_engine = AlertEngine(Config.ALERT_SEND_CONCURRENCY)
@@ -5,52 +5,148 @@ This script collects data from both API and web scrapers and updates the databas
 
 Functions:
     daily_job: Collects currency data from APIs and scrapers, then updates the database.
+    run_standalone: Runs the job once outside the bot process.
 """
 
 import asyncio
-from collectors.api_collector import collect_api_data
+import time
+from collectors.api_collector import API_DATA_UNCHANGED, collect_api_data
+from collectors.browser_manager import browser_manager
 from collectors.scrapper_collector import collect_exchange_data
-from database.db_utils import update_api_rates, update_scrapper_rates
+from database.cache import rates_cache
+from database.db_utils import (
+    update_api_fetch_state,
+    update_api_rates,
+    update_scrapper_rates,
+)
+from database.history import append_api_history, append_scrapper_history
+from database.pool import db_pool
+from jobs.alerts import alert_engine
 from utils.logger import get_logger  # Import directly from utils.logger instead of jobs
+from utils.metrics import metrics
 
 # Create logger for this module
 logger = get_logger(__name__)
 
+# Duration of each daily_job stage, labelled by stage
+STAGE_LATENCY = metrics.histogram(
+    "daily_job_stage_seconds",
+    "Duration of daily_job stages.",
+    "stage",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+STAGE_FAILURES = metrics.counter(
+    "daily_job_stage_failures_total", "daily_job stages without current data.", "stage"
+)
 
-async def daily_job():
+
+async def daily_job(on_progress=None):
     """
     Collects currency data from APIs and web scrapers, then updates the database.
 
     This function performs the following steps:
-        1. Collects data from APIs and updates the database.
-        2. Collects data from web scrapers and updates the database.
+        1. Collects data from APIs, updates the database and appends to the history,
+           unless the API reports the data as unchanged. The API response
+           metadata is stored only after the rates are written.
+        2. Collects data from web scrapers, updates the database and appends to the history.
+           In both stages the history is appended only after the rates write succeeded.
         3. Logs warnings if data collection fails.
+        4. Publishes the fresh data to the in-memory rates snapshot if any rate changed.
+        5. Hands the rate changes to the alert engine, which notifies in the background.
+
+    Args:
+        on_progress (callable, optional): Coroutine function called as
+            on_progress(stage, success) after the "api" and "scrapper" stages.
+
+    Returns:
+        dict: Stage name -> whether the stage has current data (collected and
+        stored, or reported unchanged by the API).
     """
+    result = {"api": False, "scrapper": False}
+    api_changes = scrapper_changes = []
     try:
         logger.info("Starting daily job execution")
 
-        # Collect and update API data
-        api_data = await collect_api_data()
-        if api_data:
-            await update_api_rates(api_data)
+        # Collect and update API data, unless the provider reports no changes
+        started = time.perf_counter()
+        api_result = await collect_api_data()
+        STAGE_LATENCY.labels("api_fetch").observe(time.perf_counter() - started)
+        if api_result is API_DATA_UNCHANGED:
+            logger.info("API rates unchanged, skipping database write")
+            result["api"] = True
+        elif api_result and api_result[0]:
+            api_data, fetch_state = api_result
+            started = time.perf_counter()
+            api_changes = await update_api_rates(api_data)
+            if api_changes is not None:
+                # Only now may the next run skip unchanged data
+                await update_api_fetch_state([fetch_state])
+                await append_api_history(api_data)
+                result["api"] = True
+            else:
+                api_changes = []
+            STAGE_LATENCY.labels("api_write").observe(time.perf_counter() - started)
+        if on_progress:
+            await on_progress("api", result["api"])
 
         # Collect scraper data and update the database
+        started = time.perf_counter()
         scrapper_data = await collect_exchange_data()
+        STAGE_LATENCY.labels("scrape").observe(time.perf_counter() - started)
         if scrapper_data:
-            await update_scrapper_rates(scrapper_data)
+            started = time.perf_counter()
+            scrapper_changes = await update_scrapper_rates(scrapper_data)
+            if scrapper_changes is not None:
+                # History only records rates the rates table also got
+                await append_scrapper_history(scrapper_data)
+                result["scrapper"] = True
+            else:
+                scrapper_changes = []
+            STAGE_LATENCY.labels("scrapper_write").observe(
+                time.perf_counter() - started
+            )
+        if on_progress:
+            await on_progress("scrapper", result["scrapper"])
 
         # Log a warning if no data was collected
-        if not api_data or not scrapper_data:
+        for stage, success in result.items():
+            if not success:
+                STAGE_FAILURES.labels(stage).inc()
+        if not result["api"] or not result["scrapper"]:
             logger.warning("Skipped updates due to empty data collection.")
 
+        # Swap in a fresh snapshot so handlers see the new rates immediately
+        if api_changes or scrapper_changes:
+            await rates_cache.reload()
+            alert_engine.dispatch(api_changes + scrapper_changes)
+
         logger.info("Daily job execution completed")
     except Exception as e:
         # Log any errors that occur during the daily job
         logger.error(f"Error in daily_job: {e}", exc_info=True)
+    return result
+
+
+async def run_standalone():
+    """
+    Runs the daily job once, waits for its alert notifications, and closes the
+    browser and database pool afterwards.
+
+    The bot runs the job on its own schedule; this entry point is kept for
+    manual one-off refreshes (PYTHONPATH=. python jobs/daily_job.py), e.g.
+    with the scheduler disabled. A running bot picks up the new rates through
+    the rates cache.
+    """
+    try:
+        await daily_job()
+        await alert_engine.close()
+    finally:
+        await browser_manager.close()
+        await db_pool.close()
 
 
 # Add this block to run the async function when the script is executed directly
 if __name__ == "__main__":
     logger.info("Daily job script started")
-    asyncio.run(daily_job())
+    asyncio.run(run_standalone())
     logger.info("Daily job script finished")
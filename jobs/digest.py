@@ -0,0 +1,167 @@
+"""
+Daily digest broadcast.
+
+This module sends the AED rates to every chat subscribed with /subscribe after
+the scheduled daily_job. The digest body is rendered once per day and stored
+with the broadcast, subscribers are walked in chat id order one page at a
+time, and the last chat reached is checkpointed after every page, so a crash
+or restart resumes the broadcast instead of re-sending it. Chats that have
+blocked the bot are unsubscribed.
+
+Classes:
+    DigestBroadcaster: Renders the daily digest and fans it out to subscribers.
+
+Attributes:
+    digest_broadcaster (DigestBroadcaster): The process-wide digest broadcaster.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from telebot.asyncio_helper import ApiTelegramException
+from bot.sender import PRIORITY_LOW, sender
+from database.cache import rates_cache
+from database.subscriptions import (
+    create_digest_run,
+    delete_subscribers,
+    fetch_digest_run,
+    fetch_subscribers_page,
+    fetch_unfinished_digest_runs,
+    update_digest_run,
+)
+from utils.config import Config
+from utils.formatters import format_digest_message
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+
+def _is_unreachable(error):
+    """
+    Returns whether a send error means the chat can no longer be reached.
+
+    Args:
+        error (Exception): The error raised by the send.
+
+    Returns:
+        bool: True if the bot was blocked or the chat no longer exists.
+    """
+    if not isinstance(error, ApiTelegramException):
+        return False
+    return error.error_code == 403 or (
+        error.error_code == 400 and "chat not found" in str(error.description).lower()
+    )
+
+
+class DigestBroadcaster:
+    """
+    Renders the daily digest and fans it out to subscribers with checkpoints.
+    """
+
+    def __init__(self, page_size):
+        """
+        Args:
+            page_size (int): Subscribers sent to at once and per checkpoint.
+        """
+        self._page_size = page_size
+        self._lock = asyncio.Lock()
+
+    async def run(self, digest_date=None):
+        """
+        Sends the digest of a day, or continues it if it was interrupted.
+
+        The body is rendered from the current rates snapshot the first time
+        the day's digest runs and reused afterwards.
+
+        Args:
+            digest_date (str, optional): The digest date (YYYY-MM-DD). Defaults to today in UTC.
+        """
+        digest_date = digest_date or datetime.now(UTC).strftime("%Y-%m-%d")
+        async with self._lock:
+            run = await fetch_digest_run(digest_date)
+            if run is None:
+                body = await self._render()
+                if body is None:
+                    logger.warning("No rates available, daily digest skipped.")
+                    return
+                await create_digest_run(digest_date, body)
+                run = await fetch_digest_run(digest_date)
+            if run[5]:
+                logger.info(f"Daily digest for {digest_date} already sent.")
+                return
+            await self._fan_out(run)
+
+    async def resume(self):
+        """
+        Continues every digest broadcast that was interrupted by a restart.
+        """
+        try:
+            async with self._lock:
+                for run in await fetch_unfinished_digest_runs():
+                    logger.info(f"Resuming daily digest for {run[0]}")
+                    await self._fan_out(run)
+        except Exception as e:
+            logger.error(f"Failed to resume daily digest: {e}", exc_info=True)
+
+    async def _render(self):
+        """
+        Renders the digest body from the current rates snapshot.
+
+        Returns:
+            str: The digest text, or None if there are no rates.
+        """
+        snapshot = await rates_cache.get_snapshot()
+        if snapshot is None:
+            return None
+        api_rate = snapshot.api_rates.get("AED")
+        usd_rate = snapshot.scrapper_rates.get("USD")
+        eur_rate = snapshot.scrapper_rates.get("EUR")
+        if not api_rate and not (usd_rate and eur_rate):
+            return None
+        return format_digest_message(api_rate, usd_rate, eur_rate)
+
+    async def _fan_out(self, run):
+        """
+        Sends a digest to the subscribers after its checkpoint, page by page.
+
+        Args:
+            run (tuple): (digest_date, body, last_chat_id, sent, dropped, finished).
+        """
+        digest_date, body, last_chat_id, sent, dropped, _ = run
+        logger.info(f"Sending daily digest for {digest_date} after chat {last_chat_id}")
+
+        while True:
+            chat_ids = await fetch_subscribers_page(last_chat_id, self._page_size)
+            if not chat_ids:
+                break
+
+            results = await asyncio.gather(
+                *(
+                    sender.send_message(chat_id, body, priority=PRIORITY_LOW)
+                    for chat_id in chat_ids
+                ),
+                return_exceptions=True,
+            )
+
+            unreachable = []
+            for chat_id, result in zip(chat_ids, results):
+                if not isinstance(result, Exception):
+                    sent += 1
+                elif _is_unreachable(result):
+                    unreachable.append(chat_id)
+                else:
+                    logger.warning(f"Failed to send digest to chat {chat_id}: {result}")
+            dropped += await delete_subscribers(unreachable)
+
+            last_chat_id = chat_ids[-1]
+            await update_digest_run(digest_date, last_chat_id, sent, dropped, False)
+
+        await update_digest_run(digest_date, last_chat_id, sent, dropped, True)
+        logger.info(
+            f"Daily digest for {digest_date} sent to {sent} chats, "
+            f"{dropped} unreachable chats unsubscribed."
+        )
+
+
+# Process-wide digest broadcaster
+digest_broadcaster = DigestBroadcaster(Config.DIGEST_PAGE_SIZE)
@@ -0,0 +1,157 @@
+"""
+Single-flight coordination for on-demand rate refreshes.
+
+This module makes sure that only one daily_job run is in flight at a time:
+concurrent refresh requests join the running job instead of starting another
+one, and a request made shortly after a successful run gets that run's result
+without touching the network.
+
+Classes:
+    RefreshCoordinator: Runs daily_job once per burst of refresh requests.
+
+Attributes:
+    refresh_coordinator (RefreshCoordinator): The process-wide coordinator.
+"""
+
+import asyncio
+import time
+from jobs.daily_job import daily_job
+from utils.config import Config
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+
+class RefreshCoordinator:
+    """
+    Coalesces concurrent refresh requests into a single daily_job run.
+    """
+
+    def __init__(self, fresh_for):
+        """
+        Args:
+            fresh_for (float): Seconds during which a successful run is reused.
+        """
+        self._fresh_for = fresh_for
+        self._task = None
+        self._listeners = []
+        self._stages = {}
+        self._last_result = None
+        self._last_finished = None
+
+    @property
+    def in_progress(self):
+        """bool: Whether a refresh is currently running."""
+        return self._task is not None
+
+    def fresh_result(self):
+        """
+        Returns the result of the last successful run if it completed recently.
+
+        Returns:
+            tuple: (result dict, seconds since completion), or None if there is none.
+        """
+        if self._last_finished is None:
+            return None
+        age = time.monotonic() - self._last_finished
+        if age >= self._fresh_for:
+            return None
+        return self._last_result, age
+
+    async def refresh(self, on_progress=None):
+        """
+        Runs daily_job, or joins the run that is already in flight.
+
+        Args:
+            on_progress (callable, optional): Coroutine function called as
+                on_progress(stage, success) for every finished stage, including
+                stages that finished before this request joined.
+
+        Returns:
+            dict: Stage name -> whether the stage collected and stored data.
+        """
+        if self._task is None:
+            fresh = self.fresh_result()
+            if fresh is not None:
+                logger.info("Reusing refresh result from %.0f seconds ago", fresh[1])
+                return fresh[0]
+            self._task = asyncio.create_task(self._run())
+        else:
+            logger.info("Joining refresh already in progress")
+
+        task = self._task
+        if on_progress:
+            # Register first, then replay the stages a late joiner has missed
+            missed = list(self._stages.items())
+            self._listeners.append(on_progress)
+            for stage, success in missed:
+                await self._call_listener(on_progress, stage, success)
+
+        try:
+            # Shield the shared job from the cancellation of a single waiter
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # The shared run itself was cancelled, e.g. after a scheduler timeout
+            raise TimeoutError("Refresh was cancelled")
+        finally:
+            if on_progress in self._listeners:
+                self._listeners.remove(on_progress)
+
+    def cancel(self):
+        """
+        Cancels the refresh in flight, if any. Its waiters get a TimeoutError.
+        """
+        if self._task is not None:
+            logger.warning("Cancelling refresh in progress")
+            self._task.cancel()
+
+    async def _run(self):
+        """
+        Runs daily_job and records its result.
+
+        Returns:
+            dict: The daily_job result.
+        """
+        try:
+            result = await daily_job(on_progress=self._notify)
+            # Only fully successful runs are reused; failed stages may be retried
+            if all(result.values()):
+                self._last_result = result
+                self._last_finished = time.monotonic()
+            return result
+        finally:
+            self._task = None
+            self._stages = {}
+
+    async def _notify(self, stage, success):
+        """
+        Forwards a finished stage to every waiting listener.
+
+        Args:
+            stage (str): The stage name.
+            success (bool): Whether the stage succeeded.
+        """
+        self._stages[stage] = success
+        await asyncio.gather(
+            *(
+                self._call_listener(listener, stage, success)
+                for listener in list(self._listeners)
+            )
+        )
+
+    @staticmethod
+    async def _call_listener(listener, stage, success):
+        """
+        Calls a progress listener, logging instead of raising its errors.
+        """
+        try:
+            await listener(stage, success)
+        except Exception as e:
+            logger.error(f"Refresh progress listener failed: {e}", exc_info=True)
+
+
+# Process-wide coordinator shared by every refresh request
+refresh_coordinator = RefreshCoordinator(Config.REFRESH_FRESH_SECONDS)
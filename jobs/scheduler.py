@@ -0,0 +1,305 @@
+"""
+In-process scheduler for the daily job.
+
+This module runs daily_job inside the bot's event loop on a cron-like schedule,
+replacing the cron-spawned process. Runs go through the refresh coordinator, so
+they share the bot's database connections, browser and caches, and never
+overlap with refreshes requested by users.
+
+Schedules use the five cron fields (minute, hour, day of month, month, day of
+week) with "*", lists, ranges and steps, evaluated in UTC.
+
+Classes:
+    CronSchedule: A parsed cron expression.
+    DailyJobScheduler: Runs daily_job on a schedule with jitter, timeout and retries.
+
+After every successful scheduled run the daily digest is broadcast to subscribers.
+
+Attributes:
+    scheduler (DailyJobScheduler): The process-wide scheduler.
+"""
+
+import asyncio
+import random
+from datetime import UTC, datetime, timedelta
+from database.db_utils import fetch_job_run, update_job_run
+from jobs.digest import digest_broadcaster
+from jobs.refresh import refresh_coordinator
+from utils.config import Config
+from utils.logger import get_logger
+
+# Create logger for this module
+logger = get_logger(__name__)
+
+# Timestamp format of the job_runs table
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# How far ahead to look for the next matching time
+MAX_LOOKAHEAD = timedelta(days=366 * 5)
+
+
+class CronSchedule:
+    """
+    A parsed five-field cron expression.
+    """
+
+    # (low, high) bounds of each field
+    FIELD_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): The cron expression, e.g. "0 3 * * *".
+
+        Raises:
+            ValueError: If the expression is invalid.
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+
+        self.expression = expression
+        (
+            self.minutes,
+            self.hours,
+            self.days,
+            self.months,
+            weekdays,
+        ) = (
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self.FIELD_BOUNDS)
+        )
+        # Both 0 and 7 mean Sunday; store days of week as Monday=0 like datetime
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        """
+        Parses one cron field into the set of values it matches.
+
+        Args:
+            field (str): The field text.
+            low (int): The lowest allowed value.
+            high (int): The highest allowed value.
+
+        Returns:
+            set: The matching values.
+        """
+        values = set()
+        for part in field.split(","):
+            range_part, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if range_part == "*":
+                start, end = low, high
+            elif "-" in range_part:
+                start, end = (int(value) for value in range_part.split("-", 1))
+            else:
+                start = int(range_part)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        """
+        Checks the day-of-month and day-of-week fields, with cron's OR rule
+        when both are restricted.
+        """
+        day_match = moment.day in self.days
+        weekday_match = moment.weekday() in self.weekdays
+        if self._any_day:
+            return weekday_match
+        if self._any_weekday:
+            return day_match
+        return day_match or weekday_match
+
+    def next_after(self, moment):
+        """
+        Returns the first matching time strictly after a moment.
+
+        Args:
+            moment (datetime): The starting point.
+
+        Returns:
+            datetime: The next matching time, at a whole minute.
+
+        Raises:
+            ValueError: If nothing matches within MAX_LOOKAHEAD.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + MAX_LOOKAHEAD
+        while candidate <= limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                # Skip to the start of the next day
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class DailyJobScheduler:
+    """
+    Runs daily_job on a cron schedule with jitter, a timeout, retries with
+    exponential backoff and catch-up of runs missed while the bot was down.
+    """
+
+    def __init__(
+        self,
+        name,
+        schedule,
+        jitter_seconds,
+        timeout_seconds,
+        max_retries,
+        retry_backoff_seconds,
+        after_run=None,
+    ):
+        """
+        Args:
+            name (str): The job name used to persist its state.
+            schedule (CronSchedule): When to run the job.
+            jitter_seconds (float): Maximum random delay added to each run.
+            timeout_seconds (float): Maximum duration of one attempt.
+            max_retries (int): Number of retries after a failed attempt.
+            retry_backoff_seconds (float): Delay before the first retry; doubled
+                after every further failure.
+            after_run (callable, optional): Coroutine function awaited after
+                every successful scheduled run, once its state has been saved.
+        """
+        self.name = name
+        self.schedule = schedule
+        self.jitter_seconds = jitter_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.after_run = after_run
+
+    async def _load_state(self):
+        """
+        Returns the state persisted by the previous process.
+
+        Returns:
+            tuple: (last run timestamp text or None, next due datetime or None).
+        """
+        row = await fetch_job_run(self.name)
+        if row is None:
+            return None, None
+        _, last_run, next_due = row
+        if next_due is not None:
+            next_due = datetime.strptime(next_due, TIMESTAMP_FORMAT).replace(tzinfo=UTC)
+        return last_run, next_due
+
+    async def _save_state(self, last_run, next_due):
+        """
+        Persists the last run time and the next due time of the job.
+
+        Args:
+            last_run (str): When the job last succeeded, as a timestamp text, or None.
+            next_due (datetime): When the job is due next.
+        """
+        await update_job_run(
+            [(self.name, last_run, next_due.strftime(TIMESTAMP_FORMAT))]
+        )
+
+    async def _try_save_state(self, last_run, next_due):
+        """
+        Persists the job state like _save_state, logging instead of raising.
+
+        Args:
+            last_run (str): When the job last succeeded, as a timestamp text, or None.
+            next_due (datetime): When the job is due next.
+        """
+        try:
+            await self._save_state(last_run, next_due)
+        except Exception as e:
+            logger.error(f"Failed to save the state of {self.name}: {e}", exc_info=True)
+
+    async def run_once(self):
+        """
+        Runs the job with a timeout, retrying with exponential backoff.
+
+        Returns:
+            bool: Whether an attempt succeeded for every stage.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await asyncio.wait_for(
+                    refresh_coordinator.refresh(), self.timeout_seconds
+                )
+                if all(result.values()):
+                    return True
+                logger.warning(f"Scheduled {self.name} run incomplete: {result}")
+            except TimeoutError:
+                logger.error(
+                    f"Scheduled {self.name} run timed out after {self.timeout_seconds}s"
+                )
+                refresh_coordinator.cancel()
+            except Exception as e:
+                logger.error(f"Scheduled {self.name} run failed: {e}", exc_info=True)
+
+            if attempt < self.max_retries:
+                delay = self.retry_backoff_seconds * 2**attempt
+                logger.info(f"Retrying {self.name} in {delay:.0f}s")
+                await asyncio.sleep(delay)
+        return False
+
+    async def run_forever(self):
+        """
+        Runs the job on its schedule until cancelled.
+
+        Errors loading or saving the persisted state are logged and do not
+        stop the schedule; without a readable state no missed run is caught up.
+        """
+        now = datetime.now(UTC)
+        try:
+            last_run, next_due = await self._load_state()
+        except Exception as e:
+            logger.error(f"Failed to load the state of {self.name}: {e}", exc_info=True)
+            last_run = next_due = None
+        if next_due is not None and next_due <= now:
+            logger.info(f"Catching up on {self.name} missed at {next_due}")
+        else:
+            next_due = self.schedule.next_after(now)
+            await self._try_save_state(last_run, next_due)
+
+        while True:
+            delay = (next_due - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                delay += random.uniform(0, self.jitter_seconds)
+                logger.info(f"Next {self.name} run at {next_due} (+jitter)")
+                await asyncio.sleep(delay)
+
+            succeeded = await self.run_once()
+
+            finished = datetime.now(UTC)
+            next_due = self.schedule.next_after(finished)
+            if succeeded:
+                last_run = finished.strftime(TIMESTAMP_FORMAT)
+            await self._try_save_state(last_run, next_due)
+
+            # The hook publishes the run's data, so a failed run is not followed by it
+            if succeeded and self.after_run is not None:
+                try:
+                    await self.after_run()
+                except Exception as e:
+                    logger.error(
+                        f"After-run hook of {self.name} failed: {e}", exc_info=True
+                    )
+
+
+# Process-wide scheduler for the daily job
+scheduler = DailyJobScheduler(
+    "daily_job",
+    CronSchedule(Config.JOB_SCHEDULE),
+    Config.JOB_JITTER_SECONDS,
+    Config.JOB_TIMEOUT_SECONDS,
+    Config.JOB_MAX_RETRIES,
+    Config.JOB_RETRY_BACKOFF_SECONDS,
+    after_run=digest_broadcaster.run,
+)
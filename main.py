@@ -9,8 +9,17 @@ of listening for user messages.
 import asyncio
 import sys
 from bot.handlers.commands import bot
+from bot.sender import sender
+from collectors.browser_manager import browser_manager
+from database.cache import rates_cache
 from database.models import create_tables
+from database.pool import db_pool
+from jobs.alerts import alert_engine
+from jobs.digest import digest_broadcaster
+from jobs.scheduler import scheduler
+from utils.config import Config
 from utils.logger import get_logger
+from utils.metrics import metrics, start_metrics_server
 
 # Initialize logger for the main script
 logger = get_logger(__name__)
@@ -18,24 +27,72 @@ logger = get_logger(__name__)
 
 async def start_bot():
     """
-    Initializes the database and starts the bot's polling.
+    Initializes the database and starts receiving updates by polling or webhook.
     """
+    warm_up_task = scheduler_task = digest_task = metrics_runner = None
     try:
         # Log the start of the bot and database initialization
         logger.info("Starting the bot and initializing database tables.")
 
         # Create database tables
         await create_tables()
-        logger.info("Database tables initialized. Starting bot polling.")
 
-        # Start polling for bot commands with safe timeouts
-        await bot.infinity_polling(
-            timeout=10,  # timeout между запросами
-            request_timeout=35,  # общий таймаут запроса
-        )
+        # Load the rates snapshot once so handlers answer from memory
+        await rates_cache.reload()
+
+        # Build the alert index before the first collection needs it
+        await alert_engine.load()
+        logger.info("Database tables initialized. Starting the bot.")
+
+        # Expose metrics in the Prometheus text format on a local port
+        if Config.METRICS_PORT:
+            metrics_runner = await start_metrics_server(
+                metrics, Config.METRICS_HOST, Config.METRICS_PORT
+            )
+            logger.info(
+                f"Metrics available at "
+                f"http://{Config.METRICS_HOST}:{Config.METRICS_PORT}/metrics"
+            )
+
+        # Launch the scraper browser in the background so refreshes start warm.
+        # In the other modes the browser is only a fallback and starts on demand.
+        if Config.SCRAPPER_BROWSER_WARM and Config.SCRAPPER_MODE == "browser":
+            warm_up_task = asyncio.create_task(browser_manager.warm_up())
+
+        # Run the daily job on its schedule inside this event loop, and finish
+        # a digest broadcast interrupted by the previous shutdown
+        if Config.SCHEDULER_ENABLED:
+            scheduler_task = asyncio.create_task(scheduler.run_forever())
+            digest_task = asyncio.create_task(digest_broadcaster.resume())
+
+        if Config.BOT_MODE == "webhook":
+            # Receive updates pushed by Telegram to the webhook server; the
+            # server is only imported in this mode
+            from bot.webhook import run_webhook
+
+            await run_webhook()
+        else:
+            # Start polling for bot commands with safe timeouts
+            await bot.infinity_polling(
+                timeout=10,  # timeout между запросами
+                request_timeout=35,  # общий таймаут запроса
+            )
     except Exception as e:
         # Log any errors that occur during execution
         logger.error(f"An error occurred: {e}", exc_info=True)
+    finally:
+        # Stop the background tasks and the outgoing message queue, then close
+        # the browser and the pooled database connections on shutdown
+        for task in (warm_up_task, scheduler_task, digest_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await alert_engine.close()
+        await sender.close()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await browser_manager.close()
+        await db_pool.close()
 
 
 if __name__ == "__main__":
@@ -1,23 +1,61 @@
 """
 Utilities package for the Telegram currency bot.
 
-This package contains utility modules for logging, configuration, and formatting.
+This package contains utility modules for logging, configuration, formatting, and response caching.
+
+The exported names are imported from their submodules on first access, so
+importing one submodule such as utils.config does not load the others.
+response_cache is the exception: its submodule has the same name, and once
+imported the submodule would shadow a lazily resolved attribute.
 """
 
-from .logger import get_logger
-from .config import Config
-from .formatters import (
-    format_api_currency_response,
-    format_scrapper_currency_response,
-    format_check_currency_response,
-    format_help_message,
-)
+import importlib
+from .response_cache import response_cache
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "get_logger": ".logger",
+    "stop_logging": ".logger",
+    "Config": ".config",
+    "format_api_currency_response": ".formatters",
+    "format_scrapper_currency_response": ".formatters",
+    "format_check_currency_response": ".formatters",
+    "format_check_currencies_response": ".formatters",
+    "format_inline_result": ".formatters",
+    "format_history_response": ".formatters",
+    "format_refresh_status": ".formatters",
+    "format_convert_response": ".formatters",
+    "format_alert_created": ".formatters",
+    "format_alerts_list": ".formatters",
+    "format_alert_notification": ".formatters",
+    "format_digest_message": ".formatters",
+    "format_help_message": ".formatters",
+}
 
 __all__ = [
     "get_logger",
+    "stop_logging",
     "Config",
+    "response_cache",
     "format_api_currency_response",
     "format_scrapper_currency_response",
     "format_check_currency_response",
+    "format_check_currencies_response",
+    "format_inline_result",
+    "format_history_response",
+    "format_refresh_status",
+    "format_convert_response",
+    "format_alert_created",
+    "format_alerts_list",
+    "format_alert_notification",
+    "format_digest_message",
     "format_help_message",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -23,7 +23,69 @@ class Config:
     TELEGRAM_TOKEN_TEST = os.getenv("TELEGRAM_TOKEN_TEST")
     DB_PATH = os.getenv("DB_PATH", "data/currency_data.sqlite")
     API_USD_URL = os.getenv("API_USD_URL", "https://open.er-api.com/v6/latest/USD")
-    API_EUR_URL = os.getenv("API_EUR_URL", "https://open.er-api.com/v6/latest/EUR")
     SCRAPPER_URL = os.getenv(
         "SCRAPPER_URL", "https://www.sharafexchange.ae/services/currency-exchange"
     )
+    RATES_CACHE_CHECK_INTERVAL = float(os.getenv("RATES_CACHE_CHECK_INTERVAL", "1.0"))
+    DB_READERS = int(os.getenv("DB_READERS", "2"))
+    DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "8192"))
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+    DB_STATEMENT_CACHE = int(os.getenv("DB_STATEMENT_CACHE", "128"))
+    REFRESH_FRESH_SECONDS = float(os.getenv("REFRESH_FRESH_SECONDS", "60"))
+    SCRAPPER_BROWSER_WARM = os.getenv("SCRAPPER_BROWSER_WARM", "true").lower() == "true"
+    SCRAPPER_BROWSER_MAX_USES = int(os.getenv("SCRAPPER_BROWSER_MAX_USES", "20"))
+    SCRAPPER_BROWSER_MAX_MEMORY_MB = int(
+        os.getenv("SCRAPPER_BROWSER_MAX_MEMORY_MB", "768")
+    )
+    SCRAPPER_MODE = os.getenv("SCRAPPER_MODE", "auto").lower()
+    SCRAPPER_HTTP_TIMEOUT = float(os.getenv("SCRAPPER_HTTP_TIMEOUT", "30"))
+    SCRAPPER_USER_AGENT = os.getenv(
+        "SCRAPPER_USER_AGENT",
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    )
+    SCRAPPER_BLOCKED_RESOURCE_TYPES = [
+        resource_type.strip()
+        for resource_type in os.getenv(
+            "SCRAPPER_BLOCKED_RESOURCE_TYPES",
+            "image,media,font,stylesheet,texttrack,manifest,other",
+        ).split(",")
+        if resource_type.strip()
+    ]
+    SCRAPPER_ALLOWED_HOSTS = [
+        host.strip()
+        for host in os.getenv("SCRAPPER_ALLOWED_HOSTS", "").split(",")
+        if host.strip()
+    ]
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    JOB_SCHEDULE = os.getenv("JOB_SCHEDULE", "0 3 * * *")
+    JOB_JITTER_SECONDS = float(os.getenv("JOB_JITTER_SECONDS", "60"))
+    JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "900"))
+    JOB_MAX_RETRIES = int(os.getenv("JOB_MAX_RETRIES", "3"))
+    JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "60"))
+    RATE_CHANGE_TOLERANCE = float(os.getenv("RATE_CHANGE_TOLERANCE", "1e-6"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "4096"))
+    BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+    WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+    WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+    WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram/webhook")
+    WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+    WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+    SEND_GLOBAL_RATE = float(os.getenv("SEND_GLOBAL_RATE", "30"))
+    SEND_CHAT_RATE = float(os.getenv("SEND_CHAT_RATE", "1"))
+    SEND_CHAT_BURST = int(os.getenv("SEND_CHAT_BURST", "3"))
+    SEND_MAX_RETRIES = int(os.getenv("SEND_MAX_RETRIES", "3"))
+    ALERT_SEND_CONCURRENCY = int(os.getenv("ALERT_SEND_CONCURRENCY", "30"))
+    MAX_ALERTS_PER_CHAT = int(os.getenv("MAX_ALERTS_PER_CHAT", "20"))
+    DIGEST_PAGE_SIZE = int(os.getenv("DIGEST_PAGE_SIZE", "100"))
+    COMMAND_RATE_LIMIT = float(os.getenv("COMMAND_RATE_LIMIT", "1"))
+    COMMAND_BURST = int(os.getenv("COMMAND_BURST", "5"))
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+    LOG_FILE = os.getenv("LOG_FILE", "bot.log")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
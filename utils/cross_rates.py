@@ -0,0 +1,101 @@
+"""
+Cross-rate engine for currency conversion.
+
+This module holds USD-based rates in a NumPy vector indexed by currency code,
+so that the rates for any base currency, and any currency pair, are derived
+with vectorized operations instead of separate API requests or queries.
+NumPy is imported when the first engine is built, so importing this module
+stays cheap for processes that never convert currencies.
+
+Classes:
+    CrossRates: USD-based rate vector with derived bases and a cross-rate matrix.
+"""
+
+
+class CrossRates:
+    """
+    USD-based rates with derived bases and a cross-rate matrix.
+
+    Attributes:
+        codes (tuple): Currency codes in index order.
+    """
+
+    def __init__(self, usd_rates):
+        """
+        Args:
+            usd_rates (dict): Currency code -> units of the currency per 1 USD.
+                Missing, zero and negative rates are ignored.
+        """
+        import numpy as np
+
+        rates = {code: rate for code, rate in usd_rates.items() if rate and rate > 0}
+        rates.setdefault("USD", 1.0)
+
+        self.codes = tuple(rates)
+        self._index = {code: index for index, code in enumerate(self.codes)}
+        self._usd = np.fromiter(rates.values(), dtype=np.float64, count=len(rates))
+        self._matrix = None
+
+    def __contains__(self, currency_code):
+        return currency_code in self._index
+
+    def __len__(self):
+        return len(self.codes)
+
+    def rebase(self, base):
+        """
+        Derives the rates of every currency for another base currency.
+
+        Args:
+            base (str): The base currency code.
+
+        Returns:
+            numpy.ndarray: Units of each currency (in `codes` order) per 1 unit of base.
+
+        Raises:
+            KeyError: If the base currency is unknown.
+        """
+        return self._usd / self._usd[self._index[base]]
+
+    @property
+    def matrix(self):
+        """
+        numpy.ndarray: Cross-rate matrix, where matrix[i, j] is the number of
+        units of codes[j] per 1 unit of codes[i]. Built on first use.
+        """
+        if self._matrix is None:
+            self._matrix = self._usd[None, :] / self._usd[:, None]
+        return self._matrix
+
+    def rate(self, from_code, to_code):
+        """
+        Returns the number of units of one currency per 1 unit of another.
+
+        Args:
+            from_code (str): The source currency code.
+            to_code (str): The target currency code.
+
+        Returns:
+            float: The cross rate.
+
+        Raises:
+            KeyError: If either currency is unknown.
+        """
+        return float(self.matrix[self._index[from_code], self._index[to_code]])
+
+    def convert(self, amount, from_code, to_code):
+        """
+        Converts an amount between two currencies.
+
+        Args:
+            amount (float): The amount in the source currency.
+            from_code (str): The source currency code.
+            to_code (str): The target currency code.
+
+        Returns:
+            float: The amount in the target currency.
+
+        Raises:
+            KeyError: If either currency is unknown.
+        """
+        return amount * self.rate(from_code, to_code)
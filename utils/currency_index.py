@@ -0,0 +1,141 @@
+"""
+Prefix index over currency codes and localized currency names.
+
+This module keeps every searchable key (the currency code and each word of its
+Russian name) in one sorted list, so that all currencies matching a typed
+prefix are found with a binary search instead of a scan.
+
+Classes:
+    CurrencyIndex: Sorted prefix index with ranked lookups.
+
+Attributes:
+    CURRENCY_NAMES (dict): Currency code -> Russian currency name.
+"""
+
+from bisect import bisect_left
+
+# Russian names of the currencies most often looked up by users
+CURRENCY_NAMES = {
+    "AED": "Дирхам ОАЭ",
+    "AMD": "Армянский драм",
+    "ARS": "Аргентинское песо",
+    "AUD": "Австралийский доллар",
+    "AZN": "Азербайджанский манат",
+    "BHD": "Бахрейнский динар",
+    "BRL": "Бразильский реал",
+    "BYN": "Белорусский рубль",
+    "CAD": "Канадский доллар",
+    "CHF": "Швейцарский франк",
+    "CNY": "Китайский юань",
+    "CZK": "Чешская крона",
+    "DKK": "Датская крона",
+    "EGP": "Египетский фунт",
+    "EUR": "Евро",
+    "GBP": "Британский фунт",
+    "GEL": "Грузинский лари",
+    "HKD": "Гонконгский доллар",
+    "HUF": "Венгерский форинт",
+    "IDR": "Индонезийская рупия",
+    "ILS": "Израильский шекель",
+    "INR": "Индийская рупия",
+    "JOD": "Иорданский динар",
+    "JPY": "Японская иена",
+    "KGS": "Киргизский сом",
+    "KRW": "Южнокорейская вона",
+    "KWD": "Кувейтский динар",
+    "KZT": "Казахстанский тенге",
+    "LKR": "Шри-ланкийская рупия",
+    "MVR": "Мальдивская руфия",
+    "MXN": "Мексиканский песо",
+    "MYR": "Малайзийский ринггит",
+    "NOK": "Норвежская крона",
+    "NZD": "Новозеландский доллар",
+    "OMR": "Оманский риал",
+    "PHP": "Филиппинское песо",
+    "PKR": "Пакистанская рупия",
+    "PLN": "Польский злотый",
+    "QAR": "Катарский риал",
+    "RSD": "Сербский динар",
+    "RUB": "Российский рубль",
+    "SAR": "Саудовский риял",
+    "SEK": "Шведская крона",
+    "SGD": "Сингапурский доллар",
+    "THB": "Тайский бат",
+    "TJS": "Таджикский сомони",
+    "TRY": "Турецкая лира",
+    "UAH": "Украинская гривна",
+    "USD": "Доллар США",
+    "UZS": "Узбекский сум",
+    "VND": "Вьетнамский донг",
+    "ZAR": "Южноафриканский рэнд",
+}
+
+# Rank of a match: exact code, code prefix, then name prefix
+_RANK_EXACT = 0
+_RANK_CODE = 1
+_RANK_NAME = 2
+
+
+class CurrencyIndex:
+    """
+    Sorted prefix index over currency codes and their localized names.
+
+    Attributes:
+        codes (frozenset): Every indexed currency code.
+    """
+
+    def __init__(self, currency_codes, names=None):
+        """
+        Args:
+            currency_codes (iterable): Currency codes to index.
+            names (dict, optional): Currency code -> localized name.
+                Defaults to CURRENCY_NAMES.
+        """
+        names = CURRENCY_NAMES if names is None else names
+        self.codes = frozenset(currency_codes)
+
+        entries = []
+        for code in self.codes:
+            entries.append((code.casefold(), _RANK_CODE, code))
+            for word in names.get(code, "").replace("-", " ").split():
+                entries.append((word.casefold(), _RANK_NAME, code))
+        entries.sort()
+
+        self._keys = [key for key, _, _ in entries]
+        self._entries = entries
+
+    def __contains__(self, currency_code):
+        return currency_code in self.codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def search(self, query, limit=10):
+        """
+        Finds the currencies whose code or name starts with the query.
+
+        Args:
+            query (str): The typed text, matched case-insensitively.
+            limit (int): Maximum number of currency codes to return.
+
+        Returns:
+            list: Matching currency codes, best match first.
+        """
+        prefix = query.strip().casefold()
+        if not prefix:
+            return []
+
+        ranks = {}
+        entries = self._entries
+        position = bisect_left(self._keys, prefix)
+        while position < len(entries):
+            key, rank, code = entries[position]
+            if not key.startswith(prefix):
+                break
+            if rank == _RANK_CODE and key == prefix:
+                rank = _RANK_EXACT
+            if rank < ranks.get(code, _RANK_NAME + 1):
+                ranks[code] = rank
+            position += 1
+
+        return sorted(ranks, key=lambda code: (ranks[code], code))[:limit]
@@ -5,6 +5,15 @@ Functions:
     format_api_currency_response: Formats the currency response for API rates.
     format_scrapper_currency_response: Formats the currency response for scrapper rates.
     format_check_currency_response: Formats the response for the /check command.
+    format_check_currencies_response: Formats the /check response for several currencies.
+    format_inline_result: Formats the title and description of an inline query result.
+    format_history_response: Formats the response for the /history command.
+    format_refresh_status: Formats the progress message of a rate refresh.
+    format_convert_response: Formats the response for the /convert command.
+    format_alert_created: Formats the confirmation of a new alert.
+    format_alerts_list: Formats the /alerts list.
+    format_alert_notification: Formats the notification of a triggered alert.
+    format_digest_message: Formats the daily digest.
     format_help_message: Returns a help message for the bot.
     format_error_message: Formats an error message for the bot.
 """
@@ -88,6 +97,233 @@ def format_check_currency_response(currency_code, api_rate, scrapper_rate):
     return f"📊 Официальный курс:\n{api_response}\n\n📊 Курс Обменника:\n{scrapper_response}"
 
 
+def format_check_currencies_response(rates_by_code):
+    """
+    Formats the /check response for several currencies.
+
+    Args:
+        rates_by_code (dict): Currency code -> (api_rate, scrapper_rate), where each
+            value has the format accepted by format_check_currency_response or is None.
+
+    Returns:
+        str: A formatted response string with one block per currency.
+    """
+    if len(rates_by_code) == 1:
+        ((currency_code, (api_rate, scrapper_rate)),) = rates_by_code.items()
+        return format_check_currency_response(currency_code, api_rate, scrapper_rate)
+
+    blocks = []
+    for currency_code, (api_rate, scrapper_rate) in rates_by_code.items():
+        if not api_rate and not scrapper_rate:
+            blocks.append(f"❌ {currency_code}: валюта отсутствует в базе данных.")
+            continue
+        blocks.append(
+            f"🔎 {currency_code}\n"
+            + format_check_currency_response(currency_code, api_rate, scrapper_rate)
+        )
+    return "\n\n".join(blocks)
+
+
+def format_inline_result(currency_code, currency_name, api_rate, scrapper_rate):
+    """
+    Formats the title and description of an inline query result.
+
+    Args:
+        currency_code (str): The currency code of the result.
+        currency_name (str or None): The localized currency name, if known.
+        api_rate (tuple or None): (USD rate, EUR rate) or None.
+        scrapper_rate (tuple or None): (buy AED rate, sell AED rate) or None.
+
+    Returns:
+        tuple: (title, description) strings.
+    """
+    title = f"{currency_code} — {currency_name}" if currency_name else currency_code
+    parts = []
+    if api_rate:
+        parts.append(f"1 USD = {api_rate[0]:.4f} {currency_code}")
+    if scrapper_rate:
+        parts.append(f"покупка {scrapper_rate[0]:.4f} AED")
+    return title, " · ".join(parts) or "Курсы не найдены."
+
+
+def format_history_response(currency_code, period, summary):
+    """
+    Formats the response for the /history command.
+
+    Args:
+        currency_code (str): The currency code being checked.
+        period (str): The requested period as typed by the user (e.g. "30d").
+        summary (dict): Metric name -> (min, max, avg, samples).
+
+    Returns:
+        str: A formatted response string.
+    """
+    labels = (
+        ("usd_to_currency", f"📊 Официальный курс, 1 USD = ... {currency_code}"),
+        ("euro_to_currency", f"📊 Официальный курс, 1 EUR = ... {currency_code}"),
+        ("buy_aed", f"📊 Курс обменника, покупка 1 {currency_code} = ... AED"),
+        ("sell_aed", f"📊 Курс обменника, продажа 1 {currency_code} = ... AED"),
+    )
+    blocks = [
+        f"{label}:\n"
+        f"мин. {summary[metric][0]:.4f} / сред. {summary[metric][2]:.4f} / "
+        f"макс. {summary[metric][1]:.4f}"
+        for metric, label in labels
+        if metric in summary
+    ]
+    return f"📈 История {currency_code} за {period}:\n\n" + "\n\n".join(blocks)
+
+
+def format_refresh_status(stages, finished, age=None):
+    """
+    Formats the progress message of a rate refresh.
+
+    Args:
+        stages (dict): Stage name ("api" or "scrapper") -> whether it succeeded,
+            for every stage that has finished.
+        finished (bool): Whether the refresh has completed.
+        age (float, optional): Seconds since the refresh completed, if the result is reused.
+
+    Returns:
+        str: A formatted status string.
+    """
+    if finished and all(stages.get(stage) for stage in ("api", "scrapper")):
+        if age is not None:
+            return f"✅ Данные уже актуальны (обновлены {age:.0f} сек. назад)."
+        return "✅ Данные успешно обновлены!"
+
+    lines = []
+    for stage, label in (("api", "Официальные курсы"), ("scrapper", "Курсы обменника")):
+        if stage not in stages:
+            status = "⏳" if not finished else "❌"
+        else:
+            status = "✅" if stages[stage] else "❌"
+        lines.append(f"{status} {label}")
+
+    header = (
+        "⚠️ Не все данные удалось обновить:"
+        if finished
+        else "⏳ Обновляю данные, подождите минуточку..."
+    )
+    return header + "\n\n" + "\n".join(lines)
+
+
+def format_convert_response(amount, from_code, to_code, converted, rate):
+    """
+    Formats the response for the /convert command.
+
+    Args:
+        amount (float): The amount in the source currency.
+        from_code (str): The source currency code.
+        to_code (str): The target currency code.
+        converted (float): The amount in the target currency.
+        rate (float): Units of the target currency per 1 unit of the source currency.
+
+    Returns:
+        str: A formatted response string.
+    """
+    return (
+        f"💱 {amount:,.2f} {from_code} = {converted:,.4f} {to_code}\n\n"
+        f"📊 По официальному курсу: 1 {from_code} = {rate:.6f} {to_code}"
+    )
+
+
+# Human-readable rate descriptions used by the alert messages
+ALERT_METRIC_LABELS = {
+    "usd_to_currency": "оф. курс 1 USD = ... {code}",
+    "euro_to_currency": "оф. курс 1 EUR = ... {code}",
+    "buy_aed": "покупка 1 {code} = ... AED",
+    "sell_aed": "продажа 1 {code} = ... AED",
+}
+
+
+def _format_alert(alert):
+    """
+    Formats the condition of an alert.
+
+    Args:
+        alert (tuple): (id, chat_id, currency_code, metric, direction, threshold).
+
+    Returns:
+        str: A one-line description of the alert.
+    """
+    alert_id, _, currency_code, metric, direction, threshold = alert
+    label = ALERT_METRIC_LABELS[metric].format(code=currency_code)
+    sign = "<" if direction == "below" else ">"
+    return f"#{alert_id} {currency_code}: {label} {sign} {threshold:.4f}"
+
+
+def format_alert_created(alert):
+    """
+    Formats the confirmation of a new alert.
+
+    Args:
+        alert (tuple): The stored alert.
+
+    Returns:
+        str: A formatted response string.
+    """
+    return (
+        f"🔔 Уведомление создано:\n{_format_alert(alert)}\n\n"
+        f"Удалить: /unalert {alert[0]}"
+    )
+
+
+def format_alerts_list(alerts):
+    """
+    Formats the /alerts list.
+
+    Args:
+        alerts (list): The alerts of the chat.
+
+    Returns:
+        str: A formatted response string.
+    """
+    if not alerts:
+        return "🔕 У вас нет уведомлений. Пример: /alert USD sell < 3.66"
+    lines = [_format_alert(alert) for alert in alerts]
+    return "🔔 Ваши уведомления:\n" + "\n".join(lines)
+
+
+def format_alert_notification(alert, old_value, new_value):
+    """
+    Formats the notification of a triggered alert.
+
+    Args:
+        alert (tuple): The triggered alert.
+        old_value (float): The rate before the change.
+        new_value (float): The rate after the change.
+
+    Returns:
+        str: A formatted notification string.
+    """
+    return (
+        f"🔔 Сработало уведомление\n{_format_alert(alert)}\n\n"
+        f"Было: {old_value:.4f}\nСтало: {new_value:.4f}"
+    )
+
+
+def format_digest_message(api_rate, usd_rate, eur_rate):
+    """
+    Formats the daily digest.
+
+    Args:
+        api_rate (tuple or None): The AED row of the API rates.
+        usd_rate (tuple or None): The USD row of the scrapper rates.
+        eur_rate (tuple or None): The EUR row of the scrapper rates.
+
+    Returns:
+        str: The digest text with every part that has data.
+    """
+    blocks = ["📬 Ежедневная сводка курсов"]
+    if api_rate:
+        blocks.append(format_api_currency_response(api_rate))
+    if usd_rate and eur_rate:
+        blocks.append(format_scrapper_currency_response(usd_rate, eur_rate))
+    blocks.append("Отписаться: /unsubscribe")
+    return "\n\n".join(blocks)
+
+
 def format_help_message():
     """
     Returns a help message for the bot.
@@ -100,8 +336,14 @@ def format_help_message():
         "Вы можете использовать следующие команды:\n"
         "/check_rates - Проверить оф. курсы валют\n"
         "/check_exchange - Проверить курс обменника Sharaf Exchange\n"
-        "/check - Проверить определенную валюту (/check RUB)\n"
+        "/check - Проверить одну или несколько валют (/check RUB USD THB)\n"
+        "/convert - Конвертировать сумму (/convert 250 RUB THB)\n"
+        "/history - История курса за период (/history RUB 30d)\n"
+        "/alert - Уведомить о курсе (/alert USD sell < 3.66)\n"
+        "/alerts - Мои уведомления, /unalert - удалить уведомление\n"
+        "/subscribe - Ежедневная сводка курсов, /unsubscribe - отписаться\n"
         "/update_rates - Обновить данные в базе\n"
         "/help - Помощь\n\n"
+        "Поиск валюты в любом чате: @имя_бота rub или @имя_бота рубль\n\n"
         "- Для связи @pashigin\n\n"
     )
@@ -1,48 +1,165 @@
 """
 Logger configuration module for Telegram Currency Bot.
 
-This module provides a function for getting a preconfigured logger instance
-that outputs information both to the console and to a file.
+This module provides preconfigured loggers that output information both to the
+console and to a rotating log file. Every logger shares a single queue handler:
+records are put on an in-memory queue by the calling code and written by one
+background thread, so that the event loop never waits for the console or the
+disk. The log file is opened once for the whole process and rotated by size,
+or by time when LOG_ROTATE_WHEN is set. Records are written as text lines, or
+as one JSON object per line when LOG_FORMAT is "json".
+
+Classes:
+    JsonFormatter: Formats records as single-line JSON objects.
 
 Functions:
     get_logger: Returns a configured logger instance.
+    stop_logging: Writes the queued records and stops the writer thread.
 """
 
+import atexit
+import copy
+import json
 import logging
+import queue
+from datetime import UTC, datetime
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from utils.config import Config
+
+# Format of the text log lines
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Handler shared by every logger and the thread writing its records
+_queue_handler = None
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
 
 
-def get_logger(name, log_file="bot.log", level=logging.INFO):
+class _LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a writer thread in the same process.
+    """
+
+    def prepare(self, record):
+        # The message is merged with its arguments while they still hold the
+        # logged values; the records are not pickled, so the traceback is left
+        # for the writer thread to format
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _create_handlers():
+    """
+    Creates the console and file handlers run by the writer thread.
+
+    Returns:
+        list: The handlers.
+    """
+    if Config.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler()]
+    if Config.LOG_FILE:
+        if Config.LOG_ROTATE_WHEN:
+            handlers.append(
+                TimedRotatingFileHandler(
+                    Config.LOG_FILE,
+                    when=Config.LOG_ROTATE_WHEN,
+                    backupCount=Config.LOG_BACKUP_COUNT,
+                    encoding="utf-8",
+                    utc=True,
+                )
+            )
+        else:
+            handlers.append(
+                RotatingFileHandler(
+                    Config.LOG_FILE,
+                    maxBytes=Config.LOG_MAX_BYTES,
+                    backupCount=Config.LOG_BACKUP_COUNT,
+                    encoding="utf-8",
+                )
+            )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _get_queue_handler():
+    """
+    Returns the shared queue handler, starting the writer thread on first use.
+
+    Returns:
+        logging.Handler: The handler that enqueues records for the writer thread.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *_create_handlers())
+        _listener.start()
+        _queue_handler = _LocalQueueHandler(log_queue)
+        # Write the records still queued when the interpreter exits
+        atexit.register(stop_logging)
+    return _queue_handler
+
+
+def get_logger(name, level=None):
     """
     Returns a configured logger instance with output to console and file.
 
     Args:
         name (str): The name of the logger.
-        log_file (str): The file to which logs will be written.
-        level (int): The logging level.
+        level (int or str, optional): The logging level. Defaults to Config.LOG_LEVEL.
 
     Returns:
         logging.Logger: A configured logger instance.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    logger.setLevel(level or Config.LOG_LEVEL)
 
     # Prevent logs from being passed to the root logger to avoid duplication
     logger.propagate = False
 
-    # Add handlers only if they don't already exist
+    # Add the shared handler only if the logger has none yet
     if not logger.handlers:
-        # Handler for console output
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        )
-        logger.addHandler(console_handler)
-
-        # Handler for file output
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        )
-        logger.addHandler(file_handler)
+        logger.addHandler(_get_queue_handler())
 
     return logger
+
+
+def stop_logging():
+    """
+    Writes the queued records and stops the writer thread.
+
+    Loggers keep their handler, but records logged afterwards are not written.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
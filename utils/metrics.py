@@ -0,0 +1,330 @@
+"""
+In-process metrics in the Prometheus text format.
+
+This module provides counters and latency histograms that are aggregated as
+events happen: every label value gets its own preallocated child holding plain
+numbers, and histogram buckets are a fixed list of counts, so recording an
+event is a dictionary lookup and an increment. The values are rendered in the
+Prometheus text exposition format when the metrics endpoint is scraped.
+
+Classes:
+    Counter: Monotonic counter with an optional label.
+    Histogram: Latency histogram with fixed buckets and an optional label.
+    Gauge: Value read from a callback at scrape time.
+    MetricsRegistry: Collection of metrics rendered together.
+
+Functions:
+    start_metrics_server: Serves the registry over HTTP on a local port.
+
+Attributes:
+    DEFAULT_BUCKETS (tuple): Histogram bucket bounds in seconds.
+    metrics (MetricsRegistry): The process-wide registry.
+"""
+
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base class of labelled metrics.
+
+    A metric without a label records into itself; a metric with a label
+    records into one child per label value, created on first use.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, label_name=None):
+        """
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            label_name (str, optional): Name of the single label, if any.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self._children = {}
+
+    def labels(self, value):
+        """
+        Returns the child recording the given label value.
+
+        Hot paths should keep the returned child instead of calling this per event.
+
+        Args:
+            value (str): The label value.
+
+        Returns:
+            The child metric.
+        """
+        child = self._children.get(value)
+        if child is None:
+            child = self._children[value] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _series(self):
+        """
+        Yields (label text, child) pairs, where the label text is ready for rendering.
+        """
+        if self.label_name is None:
+            yield "", self
+            return
+        for value, child in list(self._children.items()):
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            yield f'{self.label_name}="{escaped}"', child
+
+    def render(self):
+        """
+        Renders the metric in the Prometheus text format.
+
+        Returns:
+            list: The lines of the metric.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels, child in self._series():
+            lines.extend(child._render_series(self.name, labels))
+        return lines
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter with an optional label.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, label_name=None):
+        super().__init__(name, documentation, label_name)
+        self.value = 0
+
+    def _new_child(self):
+        return Counter(self.name, self.documentation)
+
+    def inc(self, amount=1):
+        """
+        Increments the counter.
+
+        Args:
+            amount (int or float): The increment.
+        """
+        self.value += amount
+
+    def _render_series(self, name, labels):
+        suffix = f"{{{labels}}}" if labels else ""
+        return [f"{name}{suffix} {_format_value(self.value)}"]
+
+
+class Histogram(_Metric):
+    """
+    Latency histogram with fixed buckets and an optional label.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_name=None, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            label_name (str, optional): Name of the single label, if any.
+            buckets (tuple): Sorted upper bounds of the buckets.
+        """
+        super().__init__(name, documentation, label_name)
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self):
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value):
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value, e.g. a duration in seconds.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        """
+        Returns a decorator recording the duration of every call of a coroutine function.
+
+        Returns:
+            callable: The decorator.
+        """
+
+        def decorator(function):
+            @wraps(function)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started)
+
+            return wrapper
+
+        return decorator
+
+    def _render_series(self, name, labels):
+        prefix = f"{labels}," if labels else ""
+        suffix = f"{{{labels}}}" if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}'
+            )
+        lines.append(f"{name}_sum{suffix} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Value read from a callback at scrape time.
+
+    Totals already kept by other objects (e.g. cache hits) are exposed with
+    kind="counter" instead of being counted twice.
+    """
+
+    def __init__(self, name, documentation, callback, kind="gauge"):
+        """
+        Args:
+            name (str): The metric name.
+            documentation (str): The HELP text.
+            callback (callable): Function returning the current value.
+            kind (str): The Prometheus type, "gauge" or "counter".
+        """
+        super().__init__(name, documentation)
+        self.callback = callback
+        self.kind = kind
+
+    def _render_series(self, name, labels):
+        return [f"{name} {_format_value(self.callback())}"]
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, label_name=None):
+        """
+        Registers a counter, or returns the one already registered under the name.
+
+        Returns:
+            Counter: The counter.
+        """
+        return self._register(Counter(name, documentation, label_name))
+
+    def histogram(self, name, documentation, label_name=None, buckets=DEFAULT_BUCKETS):
+        """
+        Registers a histogram, or returns the one already registered under the name.
+
+        Returns:
+            Histogram: The histogram.
+        """
+        return self._register(Histogram(name, documentation, label_name, buckets))
+
+    def gauge(self, name, documentation, callback, kind="gauge"):
+        """
+        Registers a callback metric, or returns the one already registered under the name.
+
+        Returns:
+            Gauge: The callback metric.
+        """
+        return self._register(Gauge(name, documentation, callback, kind))
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(registry, host, port):
+    """
+    Serves the registry at /metrics over HTTP.
+
+    Args:
+        registry (MetricsRegistry): The metrics to serve.
+        host (str): The interface to listen on.
+        port (int): The port to listen on.
+
+    Returns:
+        web.AppRunner: The running server; call cleanup() to stop it.
+    """
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(
+            text=registry.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+# Process-wide metrics registry
+metrics = MetricsRegistry()
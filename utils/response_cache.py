@@ -0,0 +1,111 @@
+"""
+Cache of rendered bot responses.
+
+This module stores formatted response texts keyed by command and currency code
+for one data version. When a newer data version arrives, the whole cache is
+dropped at once, so a hot command costs a dictionary lookup. Lookups for an
+older version, e.g. from a handler that read the data just before a reload,
+are misses and leave the cache on the newer version.
+
+Classes:
+    ResponseCache: Rendered responses for the current data version.
+
+Attributes:
+    response_cache (ResponseCache): The process-wide response cache.
+"""
+
+from utils.config import Config
+from utils.metrics import metrics
+
+
+class ResponseCache:
+    """
+    Rendered responses for the current data version.
+
+    Attributes:
+        version: The data version the cached responses belong to.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to render.
+    """
+
+    def __init__(self, max_entries):
+        """
+        Args:
+            max_entries (int): Maximum number of cached responses per version.
+        """
+        self._max_entries = max_entries
+        self._responses = {}
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self, version):
+        """
+        Drops every cached response and switches to a new data version.
+
+        Args:
+            version: The new data version.
+        """
+        self._responses = {}
+        self.version = version
+
+    def get(self, command, currency_code, version):
+        """
+        Returns a cached response.
+
+        Args:
+            command (str): The command name.
+            currency_code (str): The currency code(s) of the request, or None.
+            version: The data version the caller is reading. A newer version
+                drops the cached responses; an older one is always a miss.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        if version is not None and version != self.version:
+            if self.version is not None and version < self.version:
+                # A stale reader must not wipe the responses of the newer version
+                self.misses += 1
+                return None
+            self.reset(version)
+        response = self._responses.get((command, currency_code))
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def put(self, command, currency_code, version, response):
+        """
+        Caches a rendered response.
+
+        Responses rendered for another data version, or without a version,
+        are not cached.
+
+        Args:
+            command (str): The command name.
+            currency_code (str): The currency code(s) of the request, or None.
+            version: The data version the response was rendered from.
+            response (str): The rendered response.
+        """
+        if version is None or version != self.version:
+            return
+        if len(self._responses) >= self._max_entries:
+            return
+        self._responses[(command, currency_code)] = response
+
+
+# Process-wide cache of rendered responses
+response_cache = ResponseCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
+metrics.gauge(
+    "response_cache_hits_total",
+    "Rendered responses served from the cache.",
+    lambda: response_cache.hits,
+    kind="counter",
+)
+metrics.gauge(
+    "response_cache_misses_total",
+    "Rendered responses that had to be rendered.",
+    lambda: response_cache.misses,
+    kind="counter",
+)